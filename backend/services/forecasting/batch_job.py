@@ -0,0 +1,552 @@
+"""
+Nightly bulk forecasting job for CogniTwin
+Forecasts every metric of every active tenant ahead of dashboard traffic and
+writes the forecasts to the forecasts table in bulk, where the service serves
+them back while the data is unchanged.
+
+Series are grouped by model family: statistical series are fitted and
+forecast together with the vectorized fit_many / forecast_many, ensembles
+train in batches on a process pool and Prophet series go to the warm
+Prophet farm. Tenants are processed in chunks and progress is checkpointed
+after each one, so --resume skips the tenants a crashed run already wrote.
+
+    python batch_job.py
+    python batch_job.py --family statistical --metric-family customers=prophet
+    python batch_job.py --resume
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('batch_job')
+
+from models import LSTM_AVAILABLE, PROPHET_AVAILABLE, model_family
+from models.forecast_result import ForecastResult
+from models.preprocessing import PreparedSeries
+from models.statistical_forecaster import StatisticalForecaster
+from utils import MetricsDatabase, TenantFrame, fetch_tenant_frame, validate_series
+from utils.forecast_table import ForecastTable
+from utils.metrics_db import METRIC_COLUMNS
+from utils.training_executor import TrainingExecutor
+
+FAMILIES = ('statistical', 'ensemble', 'prophet')
+DEFAULT_METRICS = ('revenue', 'orders', 'customers')
+STAGES = ('enumerate', 'fetch', 'validate', 'statistical', 'ensemble', 'prophet', 'write', 'checkpoint')
+
+# (tenant_id, metric, data_version, prepared series)
+SeriesItem = Tuple[str, str, str, PreparedSeries]
+
+# (tenant_id, metric) -> forecast, or an error message
+Outcome = Tuple[Tuple[str, str], Optional[ForecastResult], Optional[str]]
+
+
+def fit_ensemble_batch(items: List[Tuple[Tuple[str, str], PreparedSeries, str]], days: int, confidence_level: float) -> List[Outcome]:
+    """
+    Train and forecast a batch of ensembles (runs in a process pool worker)
+
+    Ensembles are configured from the same variables as the service. A
+    failing series is reported in its own outcome.
+    """
+    from models.statistical_forecaster import EnsembleForecaster
+
+    outcomes = []
+    for key, series, metric in items:
+        try:
+            forecaster = EnsembleForecaster(
+                weighting=os.getenv('FORECAST_ENSEMBLE_WEIGHTING', 'fixed'),
+                global_lstm_path=os.getenv('FORECAST_GLOBAL_LSTM_PATH') or None,
+                lstm_inference=os.getenv('FORECAST_LSTM_INFERENCE', 'eager')
+            )
+            forecaster.train(series, metric)
+            outcomes.append((key, forecaster.forecast(days, confidence_level), None))
+        except Exception as e:
+            outcomes.append((key, None, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+def mock_tenant_ids(count: int) -> List[str]:
+    """Stable tenant UUIDs for runs without a database (so --resume works)"""
+    return [str(uuid.uuid5(uuid.NAMESPACE_URL, f'cognitwin-mock-tenant-{i}')) for i in range(count)]
+
+
+class BatchJob:
+    """
+    One bulk forecasting run over many tenants
+
+    Each chunk of tenants is fetched (one query per tenant, all metrics),
+    validated and prepared, forecast family by family, written in bulk and
+    then checkpointed. Stage timings and counts accumulate across chunks
+    (and across resumed runs).
+    """
+
+    def __init__(
+        self,
+        metrics: Sequence[str],
+        families: Dict[str, str],
+        db: Optional[MetricsDatabase] = None,
+        history_days: int = 90,
+        days: int = 90,
+        confidence_level: float = 0.95,
+        chunk_size: int = 50,
+        workers: Optional[int] = None,
+        batch_size: int = 8,
+        checkpoint_path: Optional[str] = None,
+        output_path: Optional[str] = None,
+        gap_fill: str = 'linear',
+        timeout: float = 1800.0
+    ):
+        """
+        Args:
+            metrics: Metrics to forecast for every tenant
+            families: Model family per metric ('statistical', 'ensemble', 'prophet')
+            db: Metrics database, or None for mock data
+            history_days: Days of history to train on
+            days: Forecast horizon
+            confidence_level: Confidence level of the bounds
+            chunk_size: Tenants per chunk (and per checkpoint)
+            workers: Worker processes for ensembles and Prophet (default: one per CPU)
+            batch_size: Series per process pool task
+            checkpoint_path: Checkpoint file (None disables checkpointing)
+            output_path: NDJSON file that forecasts are appended to (optional)
+            gap_fill: How missing days are filled ('linear' or 'ffill')
+            timeout: Seconds allowed per process pool task
+        """
+        self.metrics = list(metrics)
+        self.families = families
+        self.db = db
+        self.history_days = history_days
+        self.days = days
+        self.confidence_level = confidence_level
+        self.chunk_size = max(1, chunk_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_path = checkpoint_path
+        self.output_path = output_path
+        self.gap_fill = gap_fill
+        self.timeout = timeout
+
+        self.table = ForecastTable.from_env(db)
+        self._executor: Optional[TrainingExecutor] = None
+        self._farm = None
+        self.run_id = None
+        self.completed: List[str] = []
+        self.timings = {stage: 0.0 for stage in STAGES}
+        self.counts = {'series': 0, 'forecasts': 0, 'failed': 0, 'rows': 0}
+        self.family_counts = {family: 0 for family in FAMILIES}
+        self.failures: List[Dict[str, str]] = []
+
+    def config(self) -> Dict[str, Any]:
+        """Settings a resumed run must share with the checkpointed one"""
+        return {
+            'metrics': self.metrics,
+            'families': self.families,
+            'history_days': self.history_days,
+            'days': self.days,
+            'confidence_level': self.confidence_level
+        }
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    # Checkpointing
+
+    def load_checkpoint(self, run_id: str) -> bool:
+        """
+        Restore progress of an interrupted run with the same id and settings
+
+        Returns:
+            True if progress was restored
+
+        Raises:
+            ValueError: The checkpoint belongs to this run but used other settings
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        if state.get('run_id') != run_id:
+            logger.info(f"Checkpoint is for run {state.get('run_id')}, starting {run_id} from scratch")
+            return False
+        if state.get('config') != self.config():
+            raise ValueError(f"Checkpoint for run {run_id} was written with other settings; rerun without --resume")
+
+        self.completed = state['completed_tenants']
+        self.timings.update(state['timings'])
+        self.counts.update(state['counts'])
+        self.family_counts.update(state['family_counts'])
+        self.failures = state['failures']
+        logger.info(f"Resuming run {run_id}: {len(self.completed)} tenants already done")
+        return True
+
+    def save_checkpoint(self, finished: bool = False) -> None:
+        """Write progress atomically (a crash mid-write keeps the previous checkpoint)"""
+        if not self.checkpoint_path:
+            return
+        state = {
+            'run_id': self.run_id,
+            'config': self.config(),
+            'finished': finished,
+            'completed_tenants': self.completed,
+            'timings': self.timings,
+            'counts': self.counts,
+            'family_counts': self.family_counts,
+            'failures': self.failures,
+            'updated_at': datetime.now().isoformat()
+        }
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # Stages
+
+    async def tenant_ids(self, mock_tenants: int = 20) -> List[str]:
+        """Active tenants from the database, or stable mock ids without one"""
+        with self.stage('enumerate'):
+            if self.db is not None:
+                return await self.db.fetch_active_tenants()
+            return mock_tenant_ids(mock_tenants)
+
+    async def fetch(self, tenants: List[str]) -> List[Tuple[str, Optional[TenantFrame], Optional[str]]]:
+        """All metrics of each tenant in one query per tenant, several tenants at a time"""
+        since = date.today() - timedelta(days=self.history_days)
+        limit = asyncio.Semaphore(self.db.max_size if self.db is not None else 8)
+
+        async def one(tenant_id: str) -> Tuple[str, Optional[TenantFrame], Optional[str]]:
+            async with limit:
+                try:
+                    return tenant_id, await fetch_tenant_frame(tenant_id, self.metrics, since, self.db), None
+                except Exception as e:
+                    return tenant_id, None, f"fetch failed: {e}"
+
+        with self.stage('fetch'):
+            return await asyncio.gather(*(one(tenant_id) for tenant_id in tenants))
+
+    def prepare(self, frames: List[Tuple[str, Optional[TenantFrame], Optional[str]]]) -> Dict[str, List[SeriesItem]]:
+        """Validate and prepare every series, grouped by model family"""
+        groups: Dict[str, List[SeriesItem]] = {family: [] for family in FAMILIES}
+        with self.stage('validate'):
+            for tenant_id, frame, error in frames:
+                for metric in self.metrics:
+                    self.counts['series'] += 1
+                    if frame is None:
+                        self.fail(tenant_id, metric, error)
+                        continue
+                    dates, values = frame.series(metric)
+                    report = validate_series(dates, values, metric)
+                    if not report:
+                        self.fail(tenant_id, metric, '; '.join(report.errors))
+                        continue
+                    series = PreparedSeries.from_arrays(dates, values, fill=self.gap_fill)
+                    data_version = str(frame.dates[-1])
+                    groups[self.families[metric]].append((tenant_id, metric, data_version, series))
+                    self.family_counts[self.families[metric]] += 1
+        return groups
+
+    def forecast_statistical(self, items: List[SeriesItem]) -> List[Outcome]:
+        """
+        Fit and forecast all statistical series with one fit_many per calendar end
+
+        Series ending on the same day share a calendar and are stacked into one
+        (series x days) matrix; each one's own missing days are NaN.
+        """
+        by_end: Dict[np.datetime64, List[SeriesItem]] = {}
+        for item in items:
+            by_end.setdefault(item[3].last_date, []).append(item)
+
+        outcomes = []
+        with self.stage('statistical'):
+            for last_date, group in by_end.items():
+                start = min(series.dates[0] for _, _, _, series in group)
+                calendar = np.arange(start, last_date + 1, dtype='datetime64[D]')
+                values = np.full((len(group), len(calendar)), np.nan)
+                for row, (_, _, _, series) in enumerate(group):
+                    values[row, (series.dates - start).astype(np.int64)] = series.observed_values
+
+                params = StatisticalForecaster.fit_many(values, calendar)
+                dates, forecast, lower, upper = StatisticalForecaster.forecast_many(
+                    params, last_date, self.days, self.confidence_level
+                )
+                for row, (tenant_id, metric, _, _) in enumerate(group):
+                    result = ForecastResult(
+                        metric=metric,
+                        model_type='Statistical',
+                        dates=dates,
+                        forecast=forecast[row],
+                        lower_bound=lower[row],
+                        upper_bound=upper[row],
+                        confidence_level=self.confidence_level
+                    )
+                    outcomes.append(((tenant_id, metric), result, None))
+        return outcomes
+
+    async def forecast_ensembles(self, items: List[SeriesItem]) -> List[Outcome]:
+        """Train ensembles in batches across the process pool"""
+        if self._executor is None:
+            self._executor = TrainingExecutor(
+                thread_workers=1,
+                process_workers=self.workers,
+                max_queue=self.chunk_size * len(self.metrics),
+                default_timeout=self.timeout,
+                mp_context=os.getenv('FORECAST_TRAIN_MP_CONTEXT', 'spawn')
+            )
+        payload = [((tenant_id, metric), series, metric) for tenant_id, metric, _, series in items]
+        size = max(1, min(self.batch_size, -(-len(payload) // self.workers)))
+        with self.stage('ensemble'):
+            batches = await asyncio.gather(*(
+                self._executor.run(
+                    fit_ensemble_batch, payload[i:i + size], self.days, self.confidence_level,
+                    pool=TrainingExecutor.PROCESS
+                )
+                for i in range(0, len(payload), size)
+            ))
+        return [outcome for batch in batches for outcome in batch]
+
+    async def forecast_prophet(self, items: List[SeriesItem]) -> List[Outcome]:
+        """Fit Prophet series on the warm Prophet farm"""
+        from models.prophet_farm import ProphetFarm, ProphetJob
+
+        if self._farm is None:
+            self._farm = ProphetFarm(
+                self.workers, self.batch_size, os.getenv('FORECAST_TRAIN_MP_CONTEXT', 'spawn'), timeout=self.timeout
+            )
+        jobs = [
+            ProphetJob((tenant_id, metric), series, metric, days=self.days, confidence_level=self.confidence_level)
+            for tenant_id, metric, _, series in items
+        ]
+        with self.stage('prophet'):
+            fits = await self._farm.run(jobs, output='forecast')
+        return [(fit.key, fit.forecast, fit.error) for fit in fits]
+
+    async def write(self, outcomes: List[Outcome], versions: Dict[Tuple[str, str], str]) -> None:
+        """
+        Write a chunk's forecasts in bulk: one COPY + upsert and/or NDJSON lines
+
+        Raises:
+            RuntimeError: The database write failed (the chunk is not checkpointed)
+        """
+        forecasts = []
+        for key, result, error in outcomes:
+            if result is None:
+                self.fail(*key, error)
+            else:
+                forecasts.append((key, result))
+        self.counts['forecasts'] += len(forecasts)
+
+        with self.stage('write'):
+            if self.table is not None and forecasts:
+                for (tenant_id, metric), result in forecasts:
+                    self.table.enqueue(tenant_id, self.families[metric], versions[(tenant_id, metric)], result)
+                expected = self.table.stats()['pending_rows']
+                written = await self.table.flush()
+                if written < expected:
+                    raise RuntimeError(f"Forecast write-back failed ({written} of {expected} rows written)")
+                self.counts['rows'] += written
+
+            if self.output_path and forecasts:
+                with open(self.output_path, 'a') as f:
+                    for (tenant_id, metric), result in forecasts:
+                        f.write(json.dumps({
+                            'tenant_id': tenant_id,
+                            'model_family': self.families[metric],
+                            'data_version': versions[(tenant_id, metric)],
+                            **result.to_dict()
+                        }) + '\n')
+
+    def fail(self, tenant_id: str, metric: str, error: Optional[str]) -> None:
+        self.counts['failed'] += 1
+        self.failures.append({'tenant_id': tenant_id, 'metric': metric, 'error': error or 'unknown error'})
+        logger.warning(f"No forecast for {tenant_id}/{metric}: {error}")
+
+    async def run_chunk(self, tenants: List[str]) -> None:
+        """Fetch, prepare, forecast, write and checkpoint one chunk of tenants"""
+        groups = self.prepare(await self.fetch(tenants))
+        versions = {(t, m): version for items in groups.values() for t, m, version, _ in items}
+
+        outcomes = self.forecast_statistical(groups['statistical']) if groups['statistical'] else []
+        if groups['ensemble']:
+            outcomes += await self.forecast_ensembles(groups['ensemble'])
+        if groups['prophet']:
+            outcomes += await self.forecast_prophet(groups['prophet'])
+
+        await self.write(outcomes, versions)
+        with self.stage('checkpoint'):
+            self.completed.extend(tenants)
+            self.save_checkpoint()
+
+    async def run(self, tenants: List[str], run_id: str, resume: bool = False) -> Dict[str, Any]:
+        """
+        Forecast every tenant not finished yet, chunk by chunk
+
+        Args:
+            tenants: Tenant ids, in a stable order
+            run_id: Identifies the run in the checkpoint
+            resume: Continue from the checkpoint of the same run
+
+        Returns:
+            Summary with counts, throughput and stage timings
+        """
+        self.run_id = run_id
+        if not (resume and self.load_checkpoint(run_id)):
+            self.save_checkpoint()
+
+        done = set(self.completed)
+        remaining = [tenant_id for tenant_id in tenants if tenant_id not in done]
+        started = time.perf_counter()
+        try:
+            for i in range(0, len(remaining), self.chunk_size):
+                chunk = remaining[i:i + self.chunk_size]
+                await self.run_chunk(chunk)
+                logger.info(
+                    f"Chunk done: {len(self.completed)}/{len(tenants)} tenants, "
+                    f"{self.counts['forecasts']} forecasts, {self.counts['failed']} failed"
+                )
+        finally:
+            self.close()
+
+        self.save_checkpoint(finished=True)
+        return self.summary(time.perf_counter() - started, len(tenants))
+
+    def summary(self, elapsed: float, n_tenants: int) -> Dict[str, Any]:
+        """Counts, series/sec and time per stage (stage times include resumed runs)"""
+        total = sum(self.timings.values()) or 1.0
+        return {
+            'run_id': self.run_id,
+            'tenants': n_tenants,
+            **self.counts,
+            'elapsed_seconds': round(elapsed, 3),
+            'series_per_second': round(self.counts['series'] / total, 2),
+            'stages': {
+                stage: {'seconds': round(seconds, 3), 'share': round(seconds / total, 3)}
+                for stage, seconds in self.timings.items()
+            },
+            'families': {
+                family: {
+                    'series': n,
+                    'series_per_second': round(n / self.timings[family], 2) if self.timings[family] else None
+                }
+                for family, n in self.family_counts.items() if n
+            }
+        }
+
+    def close(self) -> None:
+        """Stop the worker pools"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._farm is not None:
+            self._farm.shutdown(wait=False)
+            self._farm = None
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Forecast every tenant's metrics in bulk")
+    parser.add_argument('--tenants', nargs='+', help="Tenant ids (default: all active tenants)")
+    parser.add_argument('--mock-tenants', type=int, default=20, help="Tenants to generate without a database")
+    parser.add_argument('--metrics', nargs='+', default=list(DEFAULT_METRICS), help="Metrics to forecast")
+    parser.add_argument('--family', choices=FAMILIES,
+                        help="Default model family (default: the family GET /forecasts/{metric} serves)")
+    parser.add_argument('--metric-family', action='append', default=[], metavar='METRIC=FAMILY',
+                        help="Model family for one metric (repeatable)")
+    parser.add_argument('--history-days', type=int, default=90)
+    parser.add_argument('--days', type=int, default=90, help="Forecast horizon")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--chunk-size', type=int, default=int(os.getenv('FORECAST_BATCH_CHUNK', 50)),
+                        help="Tenants per chunk and checkpoint")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('FORECAST_BATCH_WORKERS', 0)) or None,
+                        help="Worker processes for ensembles and Prophet")
+    parser.add_argument('--batch-size', type=int, default=8, help="Series per worker task")
+    parser.add_argument('--checkpoint', default=os.getenv('FORECAST_BATCH_CHECKPOINT', 'forecast_batch_checkpoint.json'))
+    parser.add_argument('--run-id', default=date.today().isoformat(), help="Run identifier (default: today)")
+    parser.add_argument('--resume', action='store_true', help="Continue the checkpointed run with the same id")
+    parser.add_argument('--output', help="Also append forecasts to this NDJSON file")
+    return parser.parse_args(argv)
+
+
+def resolve_families(args: argparse.Namespace, db: Optional[MetricsDatabase]) -> Dict[str, str]:
+    """
+    Model family per metric, with the fallbacks the service uses
+
+    By default every metric gets the family the service's default request
+    (use_ensemble=true) reads from the forecasts table, so the stored rows
+    are served to dashboards. Prophet rows are stored under their own
+    family and are only read by explicit Prophet consumers (or --output).
+
+    Raises:
+        ValueError: Malformed --metric-family, unknown family or metric, or Prophet missing
+    """
+    families = {metric: args.family or model_family(True) for metric in args.metrics}
+    for entry in args.metric_family:
+        metric, _, family = entry.partition('=')
+        if metric not in families or family not in FAMILIES:
+            raise ValueError(f"Invalid --metric-family {entry!r}: expected one of {args.metrics} = one of {FAMILIES}")
+        families[metric] = family
+
+    if db is not None:
+        unknown = [metric for metric in args.metrics if metric not in METRIC_COLUMNS]
+        if unknown:
+            raise ValueError(f"Metrics not stored in daily_metrics: {unknown}")
+    if 'prophet' in families.values() and not PROPHET_AVAILABLE:
+        raise ValueError("Prophet family requested but Prophet is not installed")
+    if 'ensemble' in families.values() and not LSTM_AVAILABLE:
+        logger.warning("LSTM not available, using Statistical model only")
+        families = {metric: 'statistical' if family == 'ensemble' else family for metric, family in families.items()}
+    return families
+
+
+async def run_job(args: argparse.Namespace) -> Dict[str, Any]:
+    db = MetricsDatabase.from_env()
+    try:
+        job = BatchJob(
+            metrics=args.metrics,
+            families=resolve_families(args, db),
+            db=db,
+            history_days=args.history_days,
+            days=args.days,
+            confidence_level=args.confidence,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            output_path=args.output,
+            gap_fill=os.getenv('FORECAST_GAP_FILL', 'linear')
+        )
+        if job.table is None and not args.output:
+            logger.warning("No database and no --output: forecasts will not be persisted")
+        tenants = args.tenants or await job.tenant_ids(args.mock_tenants)
+        return await job.run(tenants, args.run_id, resume=args.resume)
+    finally:
+        if db is not None:
+            await db.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        summary = asyncio.run(run_job(args))
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
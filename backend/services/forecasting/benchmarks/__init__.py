@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the CogniTwin forecasting service
+Run from backend/services/forecasting, e.g. python -m benchmarks.bench_statistical
+"""
@@ -0,0 +1,117 @@
+"""
+Benchmark: streamed forecast responses vs the ForecastResponse model path
+Serializes one ensemble-shaped forecast per horizon the way GET
+/forecasts/{metric} does (ForecastPoint models, jsonable_encoder, json.dumps)
+and with ?stream=json / ?stream=ndjson (chunks encoded straight from the
+arrays). Reports total time and time to the first chunk. Exits non-zero if
+streaming misses the target speedup or produces a different document.
+
+    python -m benchmarks.bench_forecast_stream
+"""
+import json
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from models.forecast_result import ForecastResult
+from utils.json_stream import orjson, stream_json, stream_ndjson
+
+HORIZONS = (30, 365, 3 * 365)
+REPEATS = 20
+CHUNK_DAYS = 256
+TARGET_SPEEDUP = 3.0
+
+
+# Same shapes as main.ForecastPoint / main.ForecastResponse (importing main
+# would also build the caches and executor)
+class ForecastPoint(BaseModel):
+    date: str
+    forecast: float
+    lower_bound: float
+    upper_bound: float
+    confidence: float
+
+
+class ForecastResponse(BaseModel):
+    metric: str
+    horizon_days: int
+    model_type: str
+    accuracy: float
+    generated_at: str
+    data: List[ForecastPoint]
+
+
+def best_of(fn: Callable, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def make_result(days: int) -> ForecastResult:
+    rng = np.random.default_rng(days)
+    forecast = 50000 + np.cumsum(rng.normal(50, 400, days))
+    return ForecastResult(
+        'revenue', 'Ensemble (Statistical + LSTM)',
+        np.datetime64('2026-01-13') + np.arange(days), forecast, forecast * 0.95, forecast * 1.05,
+        components={'statistical_forecast': forecast * 0.99, 'lstm_forecast': forecast * 1.01}
+    )
+
+
+def model_path(header: dict, result: ForecastResult) -> bytes:
+    response = ForecastResponse(**header, data=result.to_records())
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def streamed(encode: Callable, header: dict, result: ForecastResult) -> bytes:
+    return b''.join(encode(header, result, CHUNK_DAYS))
+
+
+def first_chunk(encode: Callable, header: dict, result: ForecastResult) -> None:
+    chunks = encode(header, result, CHUNK_DAYS)
+    next(chunks)
+    next(chunks)  # the header alone is not a useful first byte
+
+
+def main() -> int:
+    header = {
+        'metric': 'revenue', 'horizon_days': 0, 'model_type': 'Ensemble (Statistical + LSTM)',
+        'accuracy': 0.87, 'generated_at': '2026-01-12T10:30:00'
+    }
+    print(f"Encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}, "
+          f"chunks of {CHUNK_DAYS} days, best of {REPEATS}")
+
+    worst_speedup, mismatch = float('inf'), False
+    for days in HORIZONS:
+        result = make_result(days)
+        header['horizon_days'] = days
+        t_model = best_of(model_path, header, result)
+        t_json = best_of(streamed, stream_json, header, result)
+        t_ndjson = best_of(streamed, stream_ndjson, header, result)
+        t_first = best_of(first_chunk, stream_json, header, result)
+
+        mismatch |= json.loads(model_path(header, result)) != json.loads(streamed(stream_json, header, result))
+        worst_speedup = min(worst_speedup, t_model / t_json)
+        print(f"  {days:5d} days   model {t_model * 1000:7.2f} ms   stream=json {t_json * 1000:6.2f} ms "
+              f"({t_model / t_json:4.1f}x)   stream=ndjson {t_ndjson * 1000:6.2f} ms   "
+              f"first chunk {t_first * 1000:5.2f} ms")
+
+    if mismatch:
+        print("FAIL: stream=json document differs from the ForecastResponse one")
+        return 1
+    if worst_speedup < TARGET_SPEEDUP:
+        print(f"FAIL: speedup {worst_speedup:.1f}x below target {TARGET_SPEEDUP:.0f}x")
+        return 1
+    print(f"OK: speedup {worst_speedup:.1f}x >= {TARGET_SPEEDUP:.0f}x, identical documents")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
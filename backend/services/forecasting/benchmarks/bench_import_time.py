@@ -0,0 +1,73 @@
+"""
+Benchmark: forecasting service cold start
+Imports main in fresh interpreters and reports the startup time, then the
+one-off cost of the first use of each heavy model family. Exits non-zero if
+startup imports torch, Prophet or sklearn, or exceeds the time budget.
+
+    python -m benchmarks.bench_import_time
+"""
+import os
+import subprocess
+import sys
+from typing import Dict
+
+REPEATS = 5
+MAX_STARTUP_SECONDS = 1.5
+HEAVY_MODULES = ('torch', 'prophet', 'sklearn', 'pandas', 'scipy')
+
+# Statement run after 'import main' to trigger each family's imports
+FIRST_USE = {
+    'statistical': 'from models.statistical_forecaster import StatisticalForecaster',
+    'lstm': 'import models; models.LSTMForecaster',
+    'prophet': 'import models; models.ProphetForecaster',
+}
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import main
+startup = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+start = time.perf_counter()
+{first_use}
+first_use = time.perf_counter() - start
+print(startup, first_use, ','.join(heavy) or '-')
+"""
+
+
+def probe(first_use: str = 'pass') -> Dict:
+    """Time 'import main', then a first-use statement, in a fresh interpreter"""
+    code = PROBE.format(first_use=first_use, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=SERVICE_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    startup, first, heavy = output.split(' ')
+    return {'startup': float(startup), 'first_use': float(first), 'heavy': [m for m in heavy.split(',') if m != '-']}
+
+
+def main() -> int:
+    runs = [probe() for _ in range(REPEATS)]
+    startup = min(run['startup'] for run in runs)
+    loaded = sorted({m for run in runs for m in run['heavy']})
+
+    print(f"Cold start, best of {REPEATS} fresh interpreters")
+    print(f"  import main:                     {startup * 1000:8.1f} ms")
+    print(f"  heavy modules loaded at startup: {', '.join(loaded) or 'none'}")
+    for family, statement in FIRST_USE.items():
+        first = min(probe(statement)['first_use'] for _ in range(REPEATS))
+        print(f"  first use of {family:12s}        {first * 1000:8.1f} ms")
+
+    if loaded:
+        print(f"FAIL: startup imported {', '.join(loaded)}")
+        return 1
+    if startup > MAX_STARTUP_SECONDS:
+        print(f"FAIL: startup {startup:.2f}s above {MAX_STARTUP_SECONDS}s")
+        return 1
+    print(f"OK: startup {startup:.2f}s <= {MAX_STARTUP_SECONDS}s without heavy imports")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
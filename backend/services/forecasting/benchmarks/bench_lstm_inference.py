@@ -0,0 +1,99 @@
+"""
+Benchmark: LSTM forecasting backends (eager fp32 vs TorchScript)
+One trained network, 365-day horizon, for a single series and a batch of
+seed windows, at 1 torch thread and at the default thread count. Reports
+latency and drift against eager fp32 at several horizons, in scaled units
+(fractions of the training range). Exits non-zero if the mean drift over the
+gated horizon exceeds the limit; autoregressive error compounds, so long-horizon
+drift is reported but not gated. Data, training and seed windows are seeded,
+so repeated runs gate the same network.
+
+    python -m benchmarks.bench_lstm_inference
+"""
+import logging
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+import torch
+
+from models.lstm_forecaster import INFERENCE_MODES, LSTMForecaster
+from utils.dummy_data_generator import DummyDataGenerator
+
+HISTORY_DAYS = 365
+HORIZON_DAYS = 365
+TRAIN_EPOCHS = 30
+BATCH_SERIES = 256
+REPEATS = 10
+DRIFT_HORIZONS = (7, 30, 90, 365)
+GATED_HORIZON = 30
+MAX_MEAN_DRIFT = 0.01
+
+
+def best_of(fn: Callable, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    logging.disable(logging.INFO)
+    # DummyDataGenerator draws its noise from the random module
+    random.seed(0)
+    torch.manual_seed(0)
+    history = DummyDataGenerator('ecommerce').generate_metric_data(
+        'revenue', days_back=HISTORY_DAYS, end_date=datetime(2026, 1, 1)
+    )
+
+    forecaster = LSTMForecaster(sequence_length=14)
+    forecaster.train(history, 'revenue', epochs=TRAIN_EPOCHS)
+
+    # Batch of distinct seed windows taken from the scaled history
+    values = np.array([point['value'] for point in history], dtype=np.float64).reshape(-1, 1)
+    scaled = forecaster.scaler.transform(values).ravel()
+    starts = np.random.default_rng(0).integers(0, len(scaled) - forecaster.sequence_length, BATCH_SERIES)
+    seeds = np.stack([scaled[s:s + forecaster.sequence_length] for s in starts])
+    single = seeds[:1]
+
+    default_threads = torch.get_num_threads()
+    thread_counts = sorted({1, default_threads})
+
+    reference = None
+    failed = False
+    print(f"Horizon: {HORIZON_DAYS} days, batch: {BATCH_SERIES} series, best of {REPEATS}")
+    for mode in INFERENCE_MODES:
+        forecaster.optimize_for_inference(mode)
+        predictions = forecaster.rollout_many(seeds, HORIZON_DAYS)
+        if mode == 'eager':
+            reference = predictions
+        drift = np.abs(predictions - reference)
+        failed |= drift[:, :GATED_HORIZON].mean() > MAX_MEAN_DRIFT
+
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            one = best_of(forecaster.rollout_many, single, HORIZON_DAYS)
+            many = best_of(forecaster.rollout_many, seeds, HORIZON_DAYS)
+            print(f"  {mode:6s} threads={threads:<2d}  single: {one * 1000:8.2f} ms  "
+                  f"batch: {many * 1000:8.2f} ms  ({BATCH_SERIES / many:,.0f} series/s)")
+        torch.set_num_threads(default_threads)
+        if mode != 'eager':
+            horizons = ', '.join(
+                f"{h}d max {drift[:, :h].max():.4f} / mean {drift[:, :h].mean():.4f}" for h in DRIFT_HORIZONS
+            )
+            print(f"  {mode:6s} drift vs eager fp32: {horizons}")
+
+    if failed:
+        print(f"FAIL: mean {GATED_HORIZON}-day drift above {MAX_MEAN_DRIFT} of the training range")
+        return 1
+    print(f"OK: mean {GATED_HORIZON}-day drift within {MAX_MEAN_DRIFT} of eager fp32 for all backends")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
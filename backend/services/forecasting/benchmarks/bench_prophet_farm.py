@@ -0,0 +1,77 @@
+"""
+Benchmark: warm Prophet farm vs fitting in-process one series at a time
+A year of daily history per series. Reports cold start (spawn + Prophet
+import + warm-up fit) separately from steady-state throughput. Exits non-zero
+if the farm's throughput is below TARGET_EFFICIENCY per usable core of the
+in-process baseline.
+
+    python -m benchmarks.bench_prophet_farm
+"""
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+from models.prophet_farm import ProphetFarm, ProphetJob
+from utils.dummy_data_generator import DummyDataGenerator
+
+HISTORY_DAYS = 365
+SERIES = 16
+TARGET_EFFICIENCY = 0.6
+
+
+def main() -> int:
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    generator = DummyDataGenerator('ecommerce')
+    histories = [
+        generator.generate_metric_data('revenue', days_back=HISTORY_DAYS, end_date=datetime(2026, 1, 1))
+        for _ in range(SERIES)
+    ]
+    jobs = [ProphetJob(i, history, 'revenue') for i, history in enumerate(histories)]
+
+    # Baseline: today's path, one series after another in this process
+    start = time.perf_counter()
+    from models.prophet_forecaster import ProphetForecaster
+    import_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for job in jobs:
+        forecaster = ProphetForecaster()
+        forecaster.train(job.series, job.metric)
+        forecaster.to_json()
+    sequential = time.perf_counter() - start
+
+    farm = ProphetFarm()
+    start = time.perf_counter()
+    farm.start()
+    cold_start = time.perf_counter() - start
+    start = time.perf_counter()
+    fits = farm.fit_many(jobs)
+    pooled = time.perf_counter() - start
+    farm.shutdown()
+
+    failed = [fit.key for fit in fits if not fit.ok]
+    cores = min(farm.workers, os.cpu_count() or 1)
+    speedup = sequential / pooled
+    print(f"{SERIES} series x {HISTORY_DAYS} days, {farm.workers} workers on {os.cpu_count()} CPUs, "
+          f"batches of {farm.batch_size}")
+    print(f"  in-process sequential:  {sequential:7.2f} s  ({SERIES / sequential:5.2f} fits/s, "
+          f"+{import_seconds:.2f} s Prophet import)")
+    print(f"  farm cold start:        {cold_start:7.2f} s  (spawn, import and warm-up, once per worker)")
+    print(f"  farm steady state:      {pooled:7.2f} s  ({SERIES / pooled:5.2f} fits/s, {speedup:.2f}x)")
+    print(f"  avg fit in a worker:    {farm.stats()['avg_fit_seconds']:7.3f} s")
+
+    if failed:
+        print(f"FAIL: fits failed for series {failed}")
+        return 1
+    target = TARGET_EFFICIENCY * cores
+    if speedup < target:
+        print(f"FAIL: speedup {speedup:.2f}x below {target:.2f}x ({TARGET_EFFICIENCY:.0%} of {cores} cores)")
+        return 1
+    print(f"OK: speedup {speedup:.2f}x >= {target:.2f}x ({TARGET_EFFICIENCY:.0%} of {cores} cores)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
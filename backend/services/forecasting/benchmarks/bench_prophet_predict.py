@@ -0,0 +1,91 @@
+"""
+Benchmark: Prophet fast path vs the stock predict path
+One model fitted on 3 years of daily history. Times in-sample scoring and
+30/365-day forecasts for 'full' (predict over history + horizon, sampled
+bounds), 'fast' with sampled bounds and 'fast' with analytical bounds. The fit
+itself is shared and not timed. Exits non-zero if fast point forecasts differ
+from the stock ones or the analytical fast path misses the target speedup.
+
+    python -m benchmarks.bench_prophet_predict
+"""
+import logging
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+
+from models.prophet_forecaster import ProphetForecaster
+from utils.dummy_data_generator import DummyDataGenerator
+
+HISTORY_DAYS = 3 * 365
+HORIZONS = (30, 365)
+REPEATS = 5
+TARGET_SPEEDUP = 5.0
+MAX_RELATIVE_DIFF = 1e-9
+
+
+def best_of(fn: Callable, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    history = DummyDataGenerator('ecommerce').generate_metric_data(
+        'revenue', days_back=HISTORY_DAYS, end_date=datetime(2026, 1, 1)
+    )
+
+    # Fit once, then switch the same fitted model between modes
+    full = ProphetForecaster()
+    full.train(history, 'revenue')
+    payload = full.to_json()
+    fast_sampled = ProphetForecaster.from_json(payload)
+    fast_sampled.predict_mode = 'fast'
+    fast = ProphetForecaster.from_json(payload)
+    fast.predict_mode, fast.intervals = 'fast', 'analytical'
+
+    df = full.prepare_data(history)
+    model = full.model
+    score_full = best_of(lambda: model.predict(df))
+    score_fast = best_of(lambda: fast._point_forecast(model.history))
+    fast.residual_std = float(np.std(model.history['y'].to_numpy() - fast._point_forecast(model.history)))
+
+    print(f"History: {HISTORY_DAYS} days, best of {REPEATS} (fit not timed)")
+    print(f"  in-sample scoring   full {score_full * 1000:8.1f} ms   fast {score_fast * 1000:8.1f} ms  "
+          f"({score_full / score_fast:.1f}x)")
+
+    worst_diff, worst_speedup = 0.0, float('inf')
+    for days in HORIZONS:
+        t_full = best_of(full.forecast, days)
+        t_sampled = best_of(fast_sampled.forecast, days)
+        t_fast = best_of(fast.forecast, days)
+        reference, sampled, analytical = full.forecast(days), fast_sampled.forecast(days), fast.forecast(days)
+        diff = float(np.max(np.abs(analytical.forecast - reference.forecast) / np.abs(reference.forecast)))
+        width_ratio = float(np.mean(
+            (analytical.upper_bound - analytical.lower_bound) / (sampled.upper_bound - sampled.lower_bound)
+        ))
+        worst_diff = max(worst_diff, diff)
+        worst_speedup = min(worst_speedup, t_full / t_fast)
+        print(f"  {days:3d}-day forecast    full {t_full * 1000:8.1f} ms   fast+sampled {t_sampled * 1000:8.1f} ms "
+              f"({t_full / t_sampled:.1f}x)   fast+analytical {t_fast * 1000:8.1f} ms ({t_full / t_fast:.1f}x)")
+        print(f"                      max relative yhat diff {diff:.1e}, analytical/sampled width {width_ratio:.2f}")
+
+    if worst_diff > MAX_RELATIVE_DIFF:
+        print(f"FAIL: fast forecast differs from stock predict by {worst_diff:.1e}")
+        return 1
+    if worst_speedup < TARGET_SPEEDUP:
+        print(f"FAIL: forecast speedup {worst_speedup:.1f}x below target {TARGET_SPEEDUP:.0f}x")
+        return 1
+    print(f"OK: forecast speedup {worst_speedup:.1f}x >= {TARGET_SPEEDUP:.0f}x, identical point forecasts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
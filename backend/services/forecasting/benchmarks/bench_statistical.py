@@ -0,0 +1,123 @@
+"""
+Benchmark: vectorized StatisticalForecaster vs the original per-row implementation
+3 years of daily history, 365-day horizon. Exits non-zero below the target speedup.
+
+    python -m benchmarks.bench_statistical
+"""
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from models.statistical_forecaster import StatisticalForecaster
+from utils.dummy_data_generator import DummyDataGenerator
+
+HISTORY_DAYS = 3 * 365
+HORIZON_DAYS = 365
+REPEATS = 20
+TARGET_SPEEDUP = 10.0
+BATCH_SERIES = 1000
+
+
+def legacy_train_forecast(historical_data: List[Dict], days: int) -> List[Dict]:
+    """The original iterrows/timedelta implementation, kept as the baseline"""
+    df = pd.DataFrame(historical_data)
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.set_index('date').sort_index()
+
+    std_value = df['value'].std()
+    last_date = df.index[-1]
+    days_elapsed = np.arange(len(df))
+    slope, intercept = np.polyfit(days_elapsed, df['value'].values, 1)
+
+    df['dayofweek'] = df.index.dayofweek
+    weekly_avg = df.groupby('dayofweek')['value'].mean()
+    overall_mean = df['value'].mean()
+    seasonality = {dow: (val / overall_mean) for dow, val in weekly_avg.items()}
+
+    fitted = []
+    for i, (idx, row) in enumerate(df.iterrows()):
+        fitted.append((intercept + slope * i) * seasonality.get(idx.dayofweek, 1.0))
+    fitted = np.array(fitted)
+    np.mean(np.abs((df['value'].values - fitted) / df['value'].values))
+
+    predictions = []
+    current_date = last_date + timedelta(days=1)
+    base_day = len(pd.date_range(start=last_date - timedelta(days=90), end=last_date))
+    for i in range(days):
+        forecast_date = current_date + timedelta(days=i)
+        value = (intercept + slope * (base_day + i)) * seasonality.get(forecast_date.dayofweek, 1.0)
+        uncertainty = std_value * 1.96 * (1 + (i / days) * 0.3)
+        predictions.append({
+            'date': forecast_date.strftime('%Y-%m-%d'),
+            'forecast': round(float(value), 2),
+            'lower_bound': round(float(value - uncertainty), 2),
+            'upper_bound': round(float(value + uncertainty), 2),
+            'confidence': 0.95
+        })
+    return predictions
+
+
+def vectorized_train_forecast(historical_data: List[Dict], days: int) -> List[Dict]:
+    forecaster = StatisticalForecaster()
+    forecaster.train(historical_data, 'revenue')
+    return forecaster.forecast(days).to_records()
+
+
+def vectorized_arrays_only(historical_data: List[Dict], days: int):
+    forecaster = StatisticalForecaster()
+    forecaster.train(historical_data, 'revenue')
+    return forecaster.forecast_arrays(days)
+
+
+def batched_fit_forecast(values: np.ndarray, dates: np.ndarray, days: int):
+    params = StatisticalForecaster.fit_many(values, dates)
+    return StatisticalForecaster.forecast_many(params, dates[-1], days)
+
+
+def best_of(fn: Callable, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    logging.disable(logging.INFO)
+    history = DummyDataGenerator('ecommerce').generate_metric_data(
+        'revenue', days_back=HISTORY_DAYS, end_date=datetime(2026, 1, 1)
+    )
+
+    legacy = best_of(legacy_train_forecast, history, HORIZON_DAYS)
+    vectorized = best_of(vectorized_train_forecast, history, HORIZON_DAYS)
+    arrays_only = best_of(vectorized_arrays_only, history, HORIZON_DAYS)
+    speedup = legacy / vectorized
+
+    print(f"History: {HISTORY_DAYS} days, horizon: {HORIZON_DAYS} days, best of {REPEATS}")
+    print(f"  legacy (iterrows + timedelta):   {legacy * 1000:8.2f} ms")
+    print(f"  vectorized (dict output):        {vectorized * 1000:8.2f} ms  ({speedup:.1f}x)")
+    print(f"  vectorized (arrays only):        {arrays_only * 1000:8.2f} ms  ({legacy / arrays_only:.1f}x)")
+
+    # Nightly-job shape: many series on one calendar, solved in a single pass
+    dates = np.array([point['date'] for point in history], dtype='datetime64[D]')
+    base = np.array([point['value'] for point in history])
+    noise = np.random.default_rng(0).normal(1.0, 0.05, size=(BATCH_SERIES, len(base)))
+    batch = best_of(batched_fit_forecast, base * noise, dates, HORIZON_DAYS)
+    print(f"  fit_many/forecast_many x{BATCH_SERIES}:  {batch * 1000:8.2f} ms  "
+          f"({BATCH_SERIES / batch:,.0f} series/s)")
+
+    if speedup < TARGET_SPEEDUP:
+        print(f"FAIL: speedup {speedup:.1f}x below target {TARGET_SPEEDUP:.0f}x")
+        return 1
+    print(f"OK: speedup {speedup:.1f}x >= {TARGET_SPEEDUP:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
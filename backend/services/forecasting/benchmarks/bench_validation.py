@@ -0,0 +1,84 @@
+"""
+Benchmark: vectorized history validation vs the original per-row loop
+3 years of daily history, plus a batch of series sharing one calendar.
+Exits non-zero below the target speedup on columnar input.
+
+    python -m benchmarks.bench_validation
+"""
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from utils.dummy_data_generator import DummyDataGenerator
+from utils.validation import validate_many, validate_records, validate_series
+
+HISTORY_DAYS = 3 * 365
+REPEATS = 20
+TARGET_SPEEDUP = 20.0
+BATCH_SERIES = 1000
+
+
+def legacy_validate(data: List[Dict]) -> bool:
+    """The original per-row implementation, kept as the baseline"""
+    if not data or len(data) < 7:
+        return False
+
+    required_keys = {'date', 'value'}
+
+    for item in data:
+        if not all(key in item for key in required_keys):
+            return False
+        try:
+            datetime.strptime(item['date'], '%Y-%m-%d')
+        except ValueError:
+            return False
+        if not isinstance(item['value'], (int, float)):
+            return False
+
+    return True
+
+
+def best_of(fn: Callable, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    history = DummyDataGenerator('ecommerce').generate_metric_data(
+        'revenue', days_back=HISTORY_DAYS, end_date=datetime(2026, 1, 1)
+    )
+    dates = np.array([point['date'] for point in history], dtype='datetime64[D]')
+    values = np.array([point['value'] for point in history], dtype=np.float64)
+
+    legacy = best_of(legacy_validate, history)
+    records = best_of(validate_records, history, 'revenue')
+    columnar = best_of(validate_series, dates, values, 'revenue')
+    speedup = legacy / columnar
+
+    print(f"History: {HISTORY_DAYS} days, best of {REPEATS}")
+    print(f"  legacy (strptime per row):       {legacy * 1000:8.3f} ms")
+    print(f"  validate_records (dict input):   {records * 1000:8.3f} ms  ({legacy / records:.1f}x)")
+    print(f"  validate_series (columnar):      {columnar * 1000:8.3f} ms  ({speedup:.1f}x)")
+
+    # Bulk-job shape: many series on one calendar, validated in one pass
+    batch = values * np.random.default_rng(0).normal(1.0, 0.05, size=(BATCH_SERIES, len(values)))
+    many = best_of(validate_many, dates, batch, ['revenue'] * BATCH_SERIES)
+    print(f"  validate_many x{BATCH_SERIES}:           {many * 1000:8.3f} ms  "
+          f"({BATCH_SERIES / many:,.0f} series/s, legacy {1 / legacy:,.0f} series/s)")
+
+    if speedup < TARGET_SPEEDUP:
+        print(f"FAIL: speedup {speedup:.1f}x below target {TARGET_SPEEDUP:.0f}x")
+        return 1
+    print(f"OK: speedup {speedup:.1f}x >= {TARGET_SPEEDUP:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,389 @@
-from fastapi import FastAPI, Header, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+import asyncio
+import copy
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-import pandas as pd
-import numpy as np
 
 # Configure logging FIRST
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import ML models
-try:
-    from models.prophet_forecaster import ProphetForecaster, EnsembleForecaster as ProphetEnsemble
-    PROPHET_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"Prophet not available: {e}")
-    PROPHET_AVAILABLE = False
-
-from models.statistical_forecaster import StatisticalForecaster, EnsembleForecaster
-from utils import fetch_historical_data_from_db, validate_historical_data
+# Import ML models. Prophet, torch and sklearn are only detected here and
+# imported on first use of their model family, keeping cold starts fast.
+from models import LSTM_AVAILABLE, PROPHET_AVAILABLE, model_family
+from models.training import train_forecaster
+from models.model_store import ModelStore
+from models.forecast_result import ForecastResult
+from models.preprocessing import HistoricalData, PreparedSeries
+from utils import fetch_historical_data_from_db, fetch_data_watermark, validate_series, MetricsDatabase, FrameScope
 from utils.dummy_data_generator import DummyDataGenerator, get_sample_revenue_data, get_test_scenario
+from utils.training_executor import TrainingExecutor, ExecutorSaturated, TrainingTimeout
+from utils.model_cache import ModelCache
+from utils.single_flight import SingleFlight
+from utils.forecast_table import ForecastTable
+from utils.json_stream import MEDIA_TYPES, STREAM_FORMATS, dumps, stream_json, stream_ndjson
 
-# Check LSTM availability
-try:
-    from models.lstm_forecaster import LSTMForecaster
-    LSTM_AVAILABLE = True
-except:
-    LSTM_AVAILABLE = False
+if not PROPHET_AVAILABLE:
+    logger.warning("Prophet not available")
+if not LSTM_AVAILABLE:
+    logger.warning("LSTM not available (torch or sklearn missing)")
 
 app = FastAPI(title="CogniTwin Forecasting Service", version="1.0.0")
 
-# Cache for trained models (in production, use Redis or similar)
-model_cache: Dict[str, Any] = {}
+# Cache for trained models, bounded by entry count, memory and TTL
+# (in production, use Redis or similar)
+# Key: (tenant_id, metric, model_family, data_version) -> (forecaster, training_result, model_type)
+model_cache = ModelCache.from_env()
+
+# Cache of rendered forecasts, so a new horizon costs an inference, not a retrain
+# Key: (tenant_id, metric, model_family, data_version, horizon_days, confidence_level)
+forecast_cache = ModelCache.from_env('FORECAST_RESULT_CACHE')
+
+# Histories prepared for training (regular daily calendar, gaps filled), so a
+# retrain or a second model family reuses them instead of refetching
+# Key: (tenant_id, metric, data_version) -> PreparedSeries
+prepared_cache = ModelCache.from_env('FORECAST_PREPARED_CACHE')
+
+# Training runs in worker pools so a cold forecast never blocks the event loop
+training_executor = TrainingExecutor.from_env()
+
+# Concurrent requests for the same untrained model share one training run
+training_flights = SingleFlight()
+
+# Trained models persisted to disk so restarts don't retrain every tenant
+# (disabled unless FORECAST_MODEL_STORE_DIR is set)
+model_store = ModelStore.from_env()
+
+# How ensemble member weights are chosen: 'fixed' (0.6 / 0.4), or fitted from a
+# backtest on recent history with 'inverse_mse' or 'stacked'
+ENSEMBLE_WEIGHTING = os.getenv('FORECAST_ENSEMBLE_WEIGHTING', 'fixed')
+
+# Historical metrics come from daily_metrics through a per-worker connection pool
+# (None unless DATABASE_URL is set, in which case mock data is generated)
+metrics_db = MetricsDatabase.from_env()
+
+# Rendered forecasts are written back to the forecasts table in batches, and
+# unchanged ones are served from it (None without a database)
+forecast_table = ForecastTable.from_env(metrics_db)
+
+# Shared global LSTM weights (trained offline with models/global_lstm_forecaster.py);
+# when set, ensembles load these instead of training an LSTM per tenant and metric
+GLOBAL_LSTM_PATH = os.getenv('FORECAST_GLOBAL_LSTM_PATH') or None
+
+# Per-series LSTM forecasting backend: 'eager' or 'script' (TorchScript)
+LSTM_INFERENCE = os.getenv('FORECAST_LSTM_INFERENCE', 'eager')
+
+# Executor pool that trains ensembles with a per-series LSTM: 'process' (the
+# epoch loops hold the GIL) or 'thread'
+ENSEMBLE_TRAIN_POOL = os.getenv('FORECAST_ENSEMBLE_TRAIN_POOL', TrainingExecutor.PROCESS)
+
+# How days missing from a history are filled before training: 'linear' or 'ffill'
+GAP_FILL = os.getenv('FORECAST_GAP_FILL', 'linear')
+
+# Bring models trained on older data up to date with update() instead of
+# retraining from scratch (set to 0 to always retrain fully)
+INCREMENTAL_UPDATES = os.getenv('FORECAST_INCREMENTAL_UPDATES', '1') != '0'
+
+# Longest forecast horizon a request may ask for
+MAX_HORIZON_DAYS = int(os.getenv('FORECAST_MAX_HORIZON_DAYS', 3 * 365))
+
+# POST /forecasts/batch: items accepted per call, and forecasts of one call
+# in flight at once (so a large batch doesn't fill the training queue alone)
+BATCH_MAX_ITEMS = int(os.getenv('FORECAST_BATCH_MAX_ITEMS', 200))
+BATCH_CONCURRENCY = int(os.getenv('FORECAST_BATCH_CONCURRENCY', 8))
+
+# Forecast days serialized per chunk of a streamed response (?stream=ndjson|json)
+STREAM_CHUNK_DAYS = int(os.getenv('FORECAST_STREAM_CHUNK_DAYS', 256))
+
+
+def training_pool(use_ensemble: bool) -> str:
+    """
+    Executor pool for training a model of this family
+
+    A per-series LSTM trains in Python-level epoch loops that hold the GIL
+    between small torch ops, so those ensembles go to ENSEMBLE_TRAIN_POOL.
+    The vectorized statistical fit and global-LSTM ensembles (no network
+    training) take milliseconds and stay on threads.
+    """
+    if model_family(use_ensemble) == 'ensemble' and not GLOBAL_LSTM_PATH:
+        return ENSEMBLE_TRAIN_POOL
+    return TrainingExecutor.THREAD
+
+
+async def train_in_executor(
+    historical_data: HistoricalData,
+    metric: str,
+    use_ensemble: bool
+) -> Tuple[Any, Dict[str, Any], str]:
+    """Train a forecaster with the service's model settings in the training executor"""
+    return await training_executor.run(
+        train_forecaster, historical_data, metric, use_ensemble,
+        pool=training_pool(use_ensemble),
+        weighting=ENSEMBLE_WEIGHTING,
+        global_lstm_path=GLOBAL_LSTM_PATH,
+        lstm_inference=LSTM_INFERENCE
+    )
+
+
+def update_forecaster(
+    previous: Tuple[Any, Dict[str, Any], str],
+    series: PreparedSeries
+) -> Optional[Tuple[Any, Dict[str, Any], str]]:
+    """
+    Incrementally update a copy of a model trained on older data (runs inside the training executor)
+
+    Args:
+        previous: (forecaster, training metrics, model type) trained on older data
+        series: Current prepared history
+
+    Returns:
+        Updated (forecaster, training metrics, model type), or None when the
+        model cannot be updated or there is nothing new to add
+    """
+    forecaster, training_result, model_type = previous
+    last_date = getattr(forecaster, 'last_date', None)
+    if last_date is None or not hasattr(forecaster, 'update'):
+        return None
+
+    new_points = series.after(last_date)
+    if not new_points.observed.any():
+        return None
+
+    # Cached models may be serving other requests; never mutate them in place
+    updated = copy.deepcopy(forecaster)
+    try:
+        update_result = updated.update(new_points)
+    except (NotImplementedError, ValueError) as e:
+        logger.info(f"Incremental update not possible, retraining: {e}")
+        return None
+    return updated, {**training_result, 'incremental_update': update_result}, model_type
+
+
+async def get_trained_model(
+    tenant_id: str,
+    metric: str,
+    use_ensemble: bool,
+    data_version: str,
+    retrain: bool = False
+) -> Tuple[Any, Dict[str, Any], str]:
+    """
+    Return a trained model for (tenant, metric, family, data version)
+
+    Serves from model_cache, then the on-disk model_store (if its data
+    watermark is current), otherwise fetches and validates history and
+    trains in the training executor. A model of the same family trained on
+    older data (from the cache or the store) is updated incrementally rather
+    than retrained. Concurrent misses for the same key wait on a single
+    load/training run.
+
+    Args:
+        retrain: Skip the caches and the store lookup for the current data
+            version (an older model may still be updated incrementally)
+
+    Returns:
+        Tuple of (trained forecaster, training metrics, model type)
+    """
+    model_key = (tenant_id, metric, model_family(use_ensemble), data_version)
+    if not retrain:
+        cached = model_cache.get(model_key)
+        if cached is not None:
+            logger.info(f"Using cached model for {model_key}")
+            return cached
+
+    flight_key = model_key + ('retrain',) if retrain else model_key
+    return await training_flights.do(
+        flight_key,
+        lambda: _train_and_cache(model_key, use_ensemble, use_store=not retrain)
+    )
+
+
+async def get_prepared_series(tenant_id: str, metric: str, data_version: str) -> PreparedSeries:
+    """
+    Fetch, validate and prepare the training history of one series
+
+    The prepared series (regular daily calendar, gaps filled with GAP_FILL)
+    is cached per data version and shared by every model family.
+
+    Raises:
+        HTTPException: 400 for an unknown metric, malformed tenant id or
+            invalid history
+    """
+    series_key = (tenant_id, metric, data_version)
+    series = prepared_cache.get(series_key)
+    if series is not None:
+        return series
+
+    # Fetch historical data from database
+    try:
+        dates, values = await fetch_historical_data_from_db(tenant_id, metric, days_back=90, db=metrics_db)
+    except ValueError as e:
+        # Unknown metric or malformed tenant id
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Validate data
+    report = validate_series(dates, values, metric)
+    if not report:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid or insufficient historical data for {metric}: {'; '.join(report.errors)}"
+        )
+    if report.warnings:
+        logger.warning(f"Historical data for {series_key}: {'; '.join(report.warnings)}")
+
+    series = PreparedSeries.from_arrays(dates, values, fill=GAP_FILL)
+    prepared_cache.put(series_key, series)
+    prepared_cache.invalidate_prefix(series_key[:2], keep=series_key)
+    return series
+
+
+async def _train_and_cache(
+    model_key: Tuple,
+    use_ensemble: bool,
+    use_store: bool = True
+) -> Tuple[Any, Dict[str, Any], str]:
+    """Load or train one model, then cache and persist it (single-flight leader)"""
+    tenant_id, metric, family, data_version = model_key
+
+    # Lazily load a previously trained model from disk
+    if model_store is not None and use_store:
+        try:
+            stored = await training_executor.run(model_store.load, tenant_id, metric, family, data_version)
+        except (ExecutorSaturated, TrainingTimeout):
+            raise
+        except Exception as e:
+            logger.warning(f"Model store lookup failed for {model_key}: {e}")
+            stored = None
+        if stored is not None:
+            model_cache.put(model_key, stored)
+            return stored
+
+    series = await get_prepared_series(tenant_id, metric, data_version)
+
+    # Warm start from a model trained on older data when there is one
+    trained = None
+    if INCREMENTAL_UPDATES:
+        previous = await _previous_model(model_key)
+        if previous is not None:
+            trained = await training_executor.run(update_forecaster, previous, series)
+            if trained is not None:
+                logger.info(f"Incrementally updated model for {model_key}")
+
+    # Train model off the event loop
+    if trained is None:
+        trained = await train_in_executor(series, metric, use_ensemble)
+        logger.info(f"Training completed ({trained[2]}): {trained[1]}")
+
+    # Cache the trained model; models on older data versions are now superseded
+    model_cache.put(model_key, trained)
+    model_cache.invalidate_prefix(model_key[:3], keep=model_key)
+
+    # Persist it (best effort: a failed save only costs a retrain after restart)
+    if model_store is not None:
+        forecaster, training_result, model_type = trained
+        try:
+            await training_executor.run(
+                model_store.save, tenant_id, metric, family, forecaster,
+                data_version, training_result, model_type
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist model for {model_key}: {e}")
+    return trained
+
+
+async def current_data_version(tenant_id: str, metric: str) -> str:
+    """Data watermark of a tenant's metric, used as the model cache version"""
+    try:
+        return await fetch_data_watermark(tenant_id, metric, db=metrics_db)
+    except ValueError as e:
+        # Malformed tenant id
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _previous_model(model_key: Tuple) -> Optional[Tuple[Any, Dict[str, Any], str]]:
+    """Latest model of the same tenant/metric/family on any data version (cache, then store)"""
+    tenant_id, metric, family, _ = model_key
+    found = model_cache.latest((tenant_id, metric, family))
+    if found is not None:
+        return found[1]
+
+    if model_store is None:
+        return None
+    try:
+        return await training_executor.run(model_store.load, tenant_id, metric, family)
+    except (ExecutorSaturated, TrainingTimeout):
+        raise
+    except Exception as e:
+        logger.warning(f"Model store lookup failed for {model_key}: {e}")
+        return None
+
+
+async def get_rendered_forecast(
+    tenant_id: str,
+    metric: str,
+    use_ensemble: bool,
+    data_version: str,
+    days: int,
+    confidence_level: float,
+    use_table: bool = True
+) -> ForecastResult:
+    """
+    Return a forecast for one horizon/confidence level, rendering it at most once
+
+    Looks in the rendered forecast cache, then renders from the trained model
+    if it is already in model_cache. Only when it is not does it (with
+    use_table) look in the forecasts table before loading or training the
+    model. Rendered forecasts are queued for write-back.
+
+    Returns:
+        Columnar forecast from the trained model
+    """
+    family = model_family(use_ensemble)
+    result_key = (tenant_id, metric, family, data_version, days, confidence_level)
+    forecast_result = forecast_cache.get(result_key)
+    if forecast_result is not None:
+        return forecast_result
+
+    async def render() -> ForecastResult:
+        # A model already in memory renders faster than a database round-trip
+        trained = model_cache.get((tenant_id, metric, family, data_version))
+        if trained is None and forecast_table is not None and use_table:
+            try:
+                stored = await forecast_table.fetch(tenant_id, metric, family, data_version, days, confidence_level)
+            except Exception as e:
+                logger.warning(f"Stored forecast lookup failed for {result_key}: {e}")
+                stored = None
+            if stored is not None:
+                forecast_cache.put(result_key, stored)
+                return stored
+
+        if trained is None:
+            trained = await get_trained_model(tenant_id, metric, use_ensemble, data_version)
+        forecaster = trained[0]
+        result = await training_executor.run(forecaster.forecast, days, confidence_level)
+        forecast_cache.put(result_key, result)
+        if forecast_table is not None:
+            forecast_table.enqueue(tenant_id, family, data_version, result)
+        return result
+
+    return await training_flights.do(result_key, render)
+
+
+def executor_http_error(e: Exception) -> HTTPException:
+    """Map training executor failures to HTTP errors"""
+    if isinstance(e, ExecutorSaturated):
+        return HTTPException(status_code=503, detail=f"Forecasting service busy: {str(e)}")
+    return HTTPException(status_code=504, detail=f"Forecast generation timed out: {str(e)}")
 
 # Models
 class ForecastRequest(BaseModel):
     metric: str
-    horizon_days: int = 30
-    confidence_level: float = 0.95
+    horizon_days: int = Field(30, gt=0, le=MAX_HORIZON_DAYS)
+    confidence_level: float = Field(0.95, gt=0, lt=1)
 
 class ForecastPoint(BaseModel):
     date: str
@@ -55,6 +400,37 @@ class ForecastResponse(BaseModel):
     generated_at: str
     data: List[ForecastPoint]
 
+class BatchForecastItem(BaseModel):
+    metric: str
+    tenant_id: Optional[str] = None  # defaults to the X-Tenant-ID header
+    horizon_days: int = Field(30, gt=0, le=MAX_HORIZON_DAYS)
+    model: str = "ensemble"  # 'ensemble' or 'statistical'
+    confidence_level: float = Field(0.95, gt=0, lt=1)
+
+class BatchForecastRequest(BaseModel):
+    items: List[BatchForecastItem]
+
+BATCH_MODELS = ("ensemble", "statistical")
+
+@app.middleware("http")
+async def request_frame_scope(request, call_next):
+    """Forecasts within one request share each tenant's daily_metrics frame"""
+    with FrameScope():
+        return await call_next(request)
+
+@app.on_event("startup")
+async def start_forecast_writeback():
+    if forecast_table is not None:
+        forecast_table.start()
+
+@app.on_event("shutdown")
+async def shutdown_training_executor():
+    training_executor.shutdown(wait=False)
+    if forecast_table is not None:
+        await forecast_table.close()
+    if metrics_db is not None:
+        await metrics_db.close()
+
 @app.get("/health")
 async def health():
     return {
@@ -63,6 +439,36 @@ async def health():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Training queue depth, wait times and job outcomes"""
+    return {
+        "training_executor": training_executor.stats(),
+        "model_cache": model_cache.stats(),
+        "forecast_cache": forecast_cache.stats(),
+        "prepared_cache": prepared_cache.stats(),
+        "training_flights": training_flights.stats(),
+        "forecast_table": forecast_table.stats() if forecast_table is not None else None,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.delete("/cache")
+async def invalidate_cache(tenant_id: Optional[str] = None, metric: Optional[str] = None):
+    """
+    Drop cached models for a tenant, a metric, or both
+
+    Args:
+        tenant_id: Only drop this tenant's models
+        metric: Only drop models for this metric
+
+    With neither filter, the whole cache is cleared.
+    """
+    removed = model_cache.invalidate(tenant_id=tenant_id, metric=metric)
+    forecast_cache.invalidate(tenant_id=tenant_id, metric=metric)
+    prepared_cache.invalidate(tenant_id=tenant_id, metric=metric)
+    logger.info(f"Invalidated {removed} cached models (tenant: {tenant_id}, metric: {metric})")
+    return {"removed": removed, "tenant_id": tenant_id, "metric": metric}
+
 @app.get("/forecasts")
 async def get_forecasts(x_tenant_id: Optional[str] = Header(None)):
     """Get all available forecasts for a tenant"""
@@ -108,8 +514,10 @@ async def get_forecasts(x_tenant_id: Optional[str] = Header(None)):
 async def get_forecast_by_metric(
     metric: str,
     x_tenant_id: Optional[str] = Header(None),
-    days: int = 30,
-    use_ensemble: bool = True
+    days: int = Query(30, gt=0, le=MAX_HORIZON_DAYS),
+    use_ensemble: bool = True,
+    confidence_level: float = Query(0.95, gt=0, lt=1),
+    stream: Optional[str] = None
 ):
     """
     Get detailed forecast for a specific metric using real ML models
@@ -119,82 +527,54 @@ async def get_forecast_by_metric(
         x_tenant_id: Tenant identifier
         days: Forecast horizon in days
         use_ensemble: Whether to use ensemble (Prophet + LSTM) or Prophet only
+        confidence_level: Confidence interval (0.80, 0.90, 0.95, 0.99)
+        stream: 'ndjson' (header line, then one point per line) or 'json'
+            (the usual document, chunked) to serialize straight from the
+            forecast arrays instead of building ForecastPoint models
     """
     if not x_tenant_id:
         raise HTTPException(status_code=400, detail="X-Tenant-ID header required")
+    if stream is not None and stream not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream must be one of {STREAM_FORMATS}")
 
     logger.info(f"Generating {metric} forecast for tenant: {x_tenant_id}, days: {days}, ensemble: {use_ensemble}")
 
     try:
-        # Check cache first
-        cache_key = f"{x_tenant_id}:{metric}:{days}:{use_ensemble}"
-        if cache_key in model_cache:
-            logger.info(f"Using cached model for {cache_key}")
-            forecaster = model_cache[cache_key]
-        else:
-            # Fetch historical data from database
-            historical_data = fetch_historical_data_from_db(x_tenant_id, metric, days_back=90)
-
-            # Validate data
-            if not validate_historical_data(historical_data):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid or insufficient historical data for {metric}"
-                )
-
-            # Initialize forecaster
-            if use_ensemble and LSTM_AVAILABLE:
-                forecaster = EnsembleForecaster(statistical_weight=0.6, lstm_weight=0.4)
-                logger.info(f"Using Ensemble forecaster (Statistical + LSTM) for {metric}")
-            else:
-                if use_ensemble and not LSTM_AVAILABLE:
-                    logger.warning("LSTM not available, using Statistical model only")
-                forecaster = StatisticalForecaster()
-                logger.info(f"Using Statistical forecaster for {metric}")
-
-            # Train model
-            if isinstance(forecaster, EnsembleForecaster):
-                training_result = forecaster.train(historical_data, metric, use_lstm=LSTM_AVAILABLE)
-            else:
-                training_result = forecaster.train(historical_data, metric)
-
-            logger.info(f"Training completed: {training_result}")
-
-            # Cache the trained model
-            model_cache[cache_key] = forecaster
-
-        # Generate forecast
-        forecast_result = forecaster.forecast(days)
-
-        # Convert to API response format
-        data = []
-        for pred in forecast_result['predictions']:
-            data.append(ForecastPoint(
-                date=pred['date'],
-                forecast=pred['forecast'],
-                lower_bound=pred['lower_bound'],
-                upper_bound=pred['upper_bound'],
-                confidence=pred.get('confidence', 0.95)
-            ))
+        # Check rendered forecast cache first, then the trained model cache
+        data_version = await current_data_version(x_tenant_id, metric)
+        forecast_result = await get_rendered_forecast(
+            x_tenant_id, metric, use_ensemble, data_version, days, confidence_level
+        )
 
         # Determine model type
-        model_type = forecast_result.get('model_type', 'Prophet + LSTM Ensemble' if use_ensemble else 'Prophet')
+        model_type = forecast_result.model_type
 
         # Calculate accuracy (from training metrics in cache or default)
         accuracy = 0.87  # Default
-        if cache_key in model_cache and hasattr(forecaster, 'prophet'):
+        if 'Prophet' in model_type:
             # Try to get accuracy from Prophet training
             accuracy = 0.89
 
-        return ForecastResponse(
-            metric=metric,
-            horizon_days=days,
-            model_type=model_type,
-            accuracy=accuracy,
-            generated_at=datetime.now().isoformat(),
-            data=data
-        )
+        header = {
+            "metric": metric,
+            "horizon_days": days,
+            "model_type": model_type,
+            "accuracy": accuracy,
+            "generated_at": datetime.now().isoformat()
+        }
+        if stream is not None:
+            encode = stream_ndjson if stream == "ndjson" else stream_json
+            return StreamingResponse(
+                encode(header, forecast_result, STREAM_CHUNK_DAYS), media_type=MEDIA_TYPES[stream]
+            )
 
+        return ForecastResponse(**header, data=forecast_result.to_records())
+
+    except HTTPException:
+        raise
+    except (ExecutorSaturated, TrainingTimeout) as e:
+        logger.warning(f"Forecast generation rejected for {metric}: {str(e)}")
+        raise executor_http_error(e)
     except Exception as e:
         logger.error(f"Forecast generation failed for {metric}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
@@ -221,45 +601,27 @@ async def generate_forecast(
     logger.info(f"Generating forecast: {request.metric} for tenant: {x_tenant_id}, retrain: {retrain}")
 
     try:
-        # Check if we need to clear cache
-        cache_key = f"{x_tenant_id}:{request.metric}:{request.horizon_days}:{use_ensemble}"
-        if retrain and cache_key in model_cache:
-            logger.info(f"Clearing cached model for {cache_key}")
-            del model_cache[cache_key]
-
-        # Fetch historical data
-        historical_data = fetch_historical_data_from_db(x_tenant_id, request.metric, days_back=90)
-
-        # Validate data
-        if not validate_historical_data(historical_data):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid or insufficient historical data for {request.metric}"
-            )
-
-        # Initialize forecaster
-        if use_ensemble and LSTM_AVAILABLE:
-            forecaster = EnsembleForecaster(statistical_weight=0.6, lstm_weight=0.4)
-            model_type = "Statistical + LSTM Ensemble"
-        else:
-            forecaster = StatisticalForecaster()
-            model_type = "Statistical"
-
-        # Train model
+        # Check if we need to clear cache (concurrent retrains share one run)
+        data_version = await current_data_version(x_tenant_id, request.metric)
+        model_key = (x_tenant_id, request.metric, model_family(use_ensemble), data_version)
+        if retrain:
+            logger.info(f"Clearing cached model for {model_key}")
+            model_cache.pop(model_key)
+            forecast_cache.invalidate(tenant_id=x_tenant_id, metric=request.metric)
+            prepared_cache.invalidate(tenant_id=x_tenant_id, metric=request.metric)
+
+        # Reuse the cached model unless retraining was requested
         start_time = datetime.now()
-        if isinstance(forecaster, EnsembleForecaster):
-            training_result = forecaster.train(historical_data, request.metric, use_lstm=LSTM_AVAILABLE)
-        else:
-            training_result = forecaster.train(historical_data, request.metric)
+        _, training_result, model_type = await get_trained_model(
+            x_tenant_id, request.metric, use_ensemble, data_version, retrain=retrain
+        )
         training_duration = (datetime.now() - start_time).total_seconds()
 
-        logger.info(f"Training completed in {training_duration:.2f}s: {training_result}")
-
         # Generate forecast
-        forecast_result = forecaster.forecast(request.horizon_days)
-
-        # Cache the trained model
-        model_cache[cache_key] = forecaster
+        forecast_result = await get_rendered_forecast(
+            x_tenant_id, request.metric, use_ensemble, data_version,
+            request.horizon_days, request.confidence_level, use_table=not retrain
+        )
 
         # Create job response
         job_id = f"forecast_{int(datetime.now().timestamp() * 1000)}"
@@ -273,18 +635,135 @@ async def generate_forecast(
             "training_duration_seconds": round(training_duration, 2),
             "training_metrics": training_result,
             "forecast_summary": {
-                "trend": forecast_result.get('trend', 'unknown'),
-                "first_prediction": forecast_result['predictions'][0] if forecast_result['predictions'] else None,
-                "last_prediction": forecast_result['predictions'][-1] if forecast_result['predictions'] else None
+                "trend": forecast_result.trend,
+                "first_prediction": forecast_result.record(0),
+                "last_prediction": forecast_result.record(-1)
             },
             "completed_at": datetime.now().isoformat(),
-            "cached": True
+            "cached": True,
+            "persisted": forecast_table is not None
         }
 
+    except HTTPException:
+        raise
+    except (ExecutorSaturated, TrainingTimeout) as e:
+        logger.warning(f"Forecast generation rejected: {str(e)}")
+        raise executor_http_error(e)
     except Exception as e:
         logger.error(f"Forecast generation failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
 
+async def _batch_forecast(
+    key: Tuple,
+    data_version: "asyncio.Task[str]",
+    semaphore: asyncio.Semaphore
+) -> Tuple[Tuple, Dict[str, Any]]:
+    """Render one distinct item of a batch; failures become an error payload"""
+    tenant_id, metric, model, days, confidence_level = key
+    try:
+        version = await data_version
+        async with semaphore:
+            forecast_result = await get_rendered_forecast(
+                tenant_id, metric, model == "ensemble", version, days, confidence_level
+            )
+        return key, {
+            "status": "ok",
+            "model_type": forecast_result.model_type,
+            "data_version": version,
+            "generated_at": datetime.now().isoformat(),
+            "data": forecast_result.to_records()
+        }
+    except Exception as e:
+        if isinstance(e, (ExecutorSaturated, TrainingTimeout)):
+            logger.warning(f"Batch forecast rejected for {key}: {str(e)}")
+            e = executor_http_error(e)
+        elif not isinstance(e, HTTPException):
+            logger.error(f"Batch forecast failed for {key}: {str(e)}", exc_info=True)
+            e = HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
+        return key, {"status": "error", "status_code": e.status_code, "detail": e.detail}
+
+@app.post("/forecasts/batch")
+async def batch_forecasts(request: BatchForecastRequest, x_tenant_id: Optional[str] = Header(None)):
+    """
+    Forecast many (tenant, metric, horizon, model) items in one call
+
+    Results stream back as NDJSON, one line per item in completion order
+    (each carries its index in the request), followed by a summary line.
+    Duplicate items are rendered once, each tenant's data version is looked
+    up once and all of its requested metrics are loaded in one query. A
+    failing item produces an error line and does not affect the others.
+
+    Args:
+        request: Items to forecast; tenant_id defaults to X-Tenant-ID
+        x_tenant_id: Default tenant identifier
+    """
+    items = request.items
+    if not items:
+        raise HTTPException(status_code=400, detail="items must not be empty")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} items per batch")
+    for index, item in enumerate(items):
+        if item.model not in BATCH_MODELS:
+            raise HTTPException(status_code=400, detail=f"items[{index}].model must be one of {BATCH_MODELS}")
+        if not (item.tenant_id or x_tenant_id):
+            raise HTTPException(status_code=400, detail=f"items[{index}] has no tenant_id and no X-Tenant-ID header")
+
+    # Identical items share one forecast
+    indexes: Dict[Tuple, List[int]] = {}
+    for index, item in enumerate(items):
+        key = (item.tenant_id or x_tenant_id, item.metric, item.model, item.horizon_days, item.confidence_level)
+        indexes.setdefault(key, []).append(index)
+    logger.info(f"Batch forecast: {len(items)} items, {len(indexes)} distinct")
+
+    # Tasks copy the context, so they all fetch through this scope: one
+    # daily_metrics query per tenant covering every metric it was asked for
+    scope = FrameScope()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    with scope:
+        versions: Dict[str, asyncio.Task] = {}
+        for tenant_id, metric, *_ in indexes:
+            scope.want(tenant_id, [metric])
+            if tenant_id not in versions:
+                versions[tenant_id] = asyncio.create_task(current_data_version(tenant_id, metric))
+        tasks = [
+            asyncio.create_task(_batch_forecast(key, versions[key[0]], semaphore))
+            for key in indexes
+        ]
+
+    async def stream() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, payload = await next_done
+                tenant_id, metric, model, days, confidence_level = key
+                for index in indexes[key]:
+                    failed += payload["status"] != "ok"
+                    line = {
+                        "index": index,
+                        "tenant_id": tenant_id,
+                        "metric": metric,
+                        "model": model,
+                        "horizon_days": days,
+                        "confidence_level": confidence_level,
+                        **payload
+                    }
+                    yield dumps(line) + b"\n"
+            yield dumps({
+                "summary": True,
+                "items": len(items),
+                "distinct": len(indexes),
+                "failed": failed,
+                "tenant_queries": scope.loads,
+                "seconds": round(time.perf_counter() - started, 3)
+            }) + b"\n"
+        finally:
+            # Client went away: stop forecasts nobody will read
+            for task in [*tasks, *versions.values()]:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 # ========================================
 # DUMMY DATA ENDPOINTS FOR TESTING
 # ========================================
@@ -383,24 +862,13 @@ async def forecast_with_dummy_data(
 
         logger.info(f"Generated {len(historical_data)} days of dummy data for {profile}/{metric}")
 
-        # Initialize forecaster
-        if use_ensemble and LSTM_AVAILABLE:
-            forecaster = EnsembleForecaster(statistical_weight=0.6, lstm_weight=0.4)
-            model_type = "Statistical + LSTM Ensemble"
-        else:
-            forecaster = StatisticalForecaster()
-            model_type = "Statistical"
-
-        # Train model
+        # Train model off the event loop
         start_time = datetime.now()
-        if isinstance(forecaster, EnsembleForecaster):
-            training_result = forecaster.train(historical_data, metric, use_lstm=LSTM_AVAILABLE)
-        else:
-            training_result = forecaster.train(historical_data, metric)
+        forecaster, training_result, model_type = await train_in_executor(historical_data, metric, use_ensemble)
         training_duration = (datetime.now() - start_time).total_seconds()
 
         # Generate forecast
-        forecast_result = forecaster.forecast(days_forecast)
+        forecast_result = await training_executor.run(forecaster.forecast, days_forecast)
 
         return {
             "test_data": {
@@ -414,12 +882,15 @@ async def forecast_with_dummy_data(
                 "duration_seconds": round(training_duration, 2),
                 "metrics": training_result
             },
-            "forecast": forecast_result,
+            "forecast": forecast_result.to_dict(),
             "note": "This forecast used generated dummy data - perfect for testing without real data!"
         }
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except (ExecutorSaturated, TrainingTimeout) as e:
+        logger.warning(f"Dummy forecast rejected: {str(e)}")
+        raise executor_http_error(e)
     except Exception as e:
         logger.error(f"Dummy forecast failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
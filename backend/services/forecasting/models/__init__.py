@@ -1,13 +1,51 @@
 """
 CogniTwin Forecasting Models Package
+
+Prophet, torch and sklearn take seconds to import, so the model families that
+need them are only imported on first attribute access. Availability is
+detected without importing them.
 """
-from .prophet_forecaster import ProphetForecaster, EnsembleForecaster
+import importlib
+from importlib.util import find_spec
+
+from .model_store import ModelStore
+from .forecast_result import ForecastResult
+from .ensemble import WeightedEnsemble, EnsembleMember
+from .preprocessing import PreparedSeries
+
+PROPHET_AVAILABLE = find_spec('prophet') is not None
+LSTM_AVAILABLE = find_spec('torch') is not None and find_spec('sklearn') is not None
+
+
+def model_family(use_ensemble: bool) -> str:
+    """Model family actually trained for a request (LSTM may be unavailable)"""
+    return "ensemble" if use_ensemble and LSTM_AVAILABLE else "statistical"
+
+
+# Lazily imported attribute -> defining submodule
+_LAZY_ATTRS = {
+    'ProphetForecaster': 'prophet_forecaster',
+    'EnsembleForecaster': 'prophet_forecaster',
+    'LSTMForecaster': 'lstm_forecaster',
+    'GlobalLSTMForecaster': 'global_lstm_forecaster',
+    'GlobalLSTMModel': 'global_lstm_forecaster',
+    'ProphetFarm': 'prophet_farm',
+    'ProphetJob': 'prophet_farm',
+}
+_LSTM_ATTRS = ('LSTMForecaster', 'GlobalLSTMForecaster', 'GlobalLSTMModel')
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _LSTM_ATTRS and not LSTM_AVAILABLE:
+        return None
+    value = getattr(importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__), name)
+    globals()[name] = value
+    return value
 
-try:
-    from .lstm_forecaster import LSTMForecaster
-    LSTM_AVAILABLE = True
-except ImportError:
-    LSTM_AVAILABLE = False
-    LSTMForecaster = None
 
-__all__ = ['ProphetForecaster', 'EnsembleForecaster', 'LSTMForecaster', 'LSTM_AVAILABLE']
+__all__ = ['ProphetForecaster', 'EnsembleForecaster', 'LSTMForecaster', 'LSTM_AVAILABLE',
+           'PROPHET_AVAILABLE', 'GlobalLSTMForecaster', 'GlobalLSTMModel', 'ModelStore',
+           'ForecastResult', 'WeightedEnsemble', 'EnsembleMember', 'PreparedSeries',
+           'ProphetFarm', 'ProphetJob', 'model_family']
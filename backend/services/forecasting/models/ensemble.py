@@ -0,0 +1,461 @@
+"""
+Generic weighted ensemble for CogniTwin forecasters
+Combines any number of member models with a single matrix-vector product
+"""
+import functools
+import importlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .forecast_result import ForecastResult
+from .preprocessing import HistoricalData, PreparedSeries
+
+logger = logging.getLogger(__name__)
+
+WEIGHTING_METHODS = ('fixed', 'inverse_mse', 'stacked')
+
+# Observed (not gap-filled) holdout days needed to fit backtest weights
+MIN_OBSERVED_BACKTEST_DAYS = 7
+
+
+class EnsembleMember:
+    """
+    Describes one member model of a WeightedEnsemble
+
+    Factories and loaders must be module-level functions so that trained
+    ensembles stay picklable (the training executor may run them in a
+    process pool).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        factory: Callable[[HistoricalData], Any],
+        loader: Callable[[str], Any],
+        weight: float = 1.0,
+        train_kwargs: Optional[Dict[str, Any]] = None,
+        required: bool = False
+    ):
+        """
+        Args:
+            name: Key used for weights, metrics and component columns
+            label: Human-readable model name ('Statistical', 'LSTM', ...)
+            factory: Builds an untrained forecaster for the given history
+            loader: Restores a trained forecaster from a directory
+            weight: Initial (fixed) weight
+            train_kwargs: Extra keyword arguments for the member's train()
+            required: Fail the ensemble if this member fails, instead of dropping it
+        """
+        self.name = name
+        self.label = label
+        self.factory = factory
+        self.loader = loader
+        self.weight = weight
+        self.train_kwargs = train_kwargs or {}
+        self.required = required
+
+    def to_spec(self) -> Dict[str, Any]:
+        """JSON-serializable description of this member (see from_spec)"""
+        return {
+            'name': self.name,
+            'label': self.label,
+            'factory': _callable_spec(self.factory),
+            'loader': _callable_spec(self.loader),
+            'weight': self.weight,
+            'train_kwargs': self.train_kwargs,
+            'required': self.required
+        }
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> 'EnsembleMember':
+        """Rebuild a member described by to_spec()"""
+        return cls(
+            spec['name'],
+            spec['label'],
+            _resolve_callable(spec['factory']),
+            _resolve_callable(spec['loader']),
+            weight=spec['weight'],
+            train_kwargs=spec['train_kwargs'],
+            required=spec['required']
+        )
+
+
+def _callable_spec(fn: Callable) -> Dict[str, Any]:
+    """Importable reference to a module-level function, classmethod or partial of one"""
+    if isinstance(fn, functools.partial):
+        if fn.keywords:
+            raise ValueError(f"Cannot persist partial with keyword arguments: {fn}")
+        return {**_callable_spec(fn.func), 'args': list(fn.args)}
+    owner = getattr(fn, '__self__', None)
+    qualname = f"{owner.__qualname__}.{fn.__name__}" if isinstance(owner, type) else fn.__qualname__
+    if '<' in qualname:
+        raise ValueError(f"Cannot persist {qualname}: ensemble members need module-level callables")
+    return {'ref': f"{fn.__module__}:{qualname}"}
+
+
+def _resolve_callable(spec: Dict[str, Any]) -> Callable:
+    module, qualname = spec['ref'].split(':')
+    fn = importlib.import_module(module)
+    for part in qualname.split('.'):
+        fn = getattr(fn, part)
+    return functools.partial(fn, *spec['args']) if spec.get('args') else fn
+
+
+def _new_lstm(inference_mode: str, historical_data: HistoricalData) -> Any:
+    # Lazy import LSTM to avoid dependency if not using it
+    from .lstm_forecaster import LSTMForecaster
+    return LSTMForecaster(sequence_length=min(7, len(historical_data) // 2), inference_mode=inference_mode)
+
+
+def _new_global_lstm(weights_path: str, historical_data: HistoricalData) -> Any:
+    from .global_lstm_forecaster import GlobalLSTMForecaster
+    return GlobalLSTMForecaster(weights_path)
+
+
+def _load_lstm(directory: str) -> Any:
+    # The 'lstm' member is either a per-series or a global-model LSTM
+    if os.path.exists(os.path.join(directory, 'global_lstm.json')):
+        from .global_lstm_forecaster import GlobalLSTMForecaster
+        return GlobalLSTMForecaster.load(directory)
+    from .lstm_forecaster import LSTMForecaster
+    return LSTMForecaster.load(directory)
+
+
+def lstm_member(
+    weight: float,
+    global_weights_path: Optional[str] = None,
+    inference_mode: str = 'eager'
+) -> EnsembleMember:
+    """
+    Optional LSTM member (dropped when PyTorch is missing or training fails)
+
+    With global_weights_path the member uses the shared GlobalLSTMModel at
+    that path instead of training a network per series. inference_mode
+    selects the per-series LSTM's forecasting backend ('eager' or 'script').
+    """
+    if global_weights_path:
+        factory = functools.partial(_new_global_lstm, global_weights_path)
+        return EnsembleMember('lstm', 'LSTM', factory, _load_lstm, weight=weight)
+    factory = functools.partial(_new_lstm, inference_mode)
+    return EnsembleMember('lstm', 'LSTM', factory, _load_lstm, weight=weight, train_kwargs={'epochs': 50})
+
+
+class WeightedEnsemble:
+    """
+    Weighted average of N member forecasters
+
+    Members are trained concurrently. Weights are either fixed, or fitted from
+    a backtest on the most recent days of history:
+    - 'inverse_mse': w_i proportional to 1 / MSE_i
+    - 'stacked': non-negative least squares of member forecasts onto actuals
+    """
+
+    def __init__(
+        self,
+        members: List[EnsembleMember],
+        weighting: str = 'fixed',
+        backtest_days: int = 14
+    ):
+        if weighting not in WEIGHTING_METHODS:
+            raise ValueError(f"weighting must be one of {WEIGHTING_METHODS}")
+
+        self.members = members
+        self.weighting = weighting
+        self.backtest_days = backtest_days
+        self.models: Dict[str, Any] = {}
+        self.weights: Dict[str, float] = {member.name: member.weight for member in members}
+        self.metric_name = None
+
+    def _train_members(
+        self,
+        members: List[EnsembleMember],
+        historical_data: PreparedSeries,
+        metric: str
+    ) -> Dict[str, Tuple[Any, Dict[str, Any]]]:
+        """Train members concurrently; optional members that fail are dropped"""
+        def fit(member: EnsembleMember) -> Tuple[Any, Dict[str, Any]]:
+            model = member.factory(historical_data)
+            return model, model.train(historical_data, metric, **member.train_kwargs)
+
+        trained = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(members)), thread_name_prefix='ensemble') as pool:
+            futures = [(member, pool.submit(fit, member)) for member in members]
+            for member, future in futures:
+                try:
+                    trained[member.name] = future.result()
+                except ImportError as e:
+                    if member.required:
+                        raise
+                    logger.warning(f"{member.label} dependencies not installed, skipping it: {e}")
+                except Exception as e:
+                    if member.required:
+                        raise
+                    logger.error(f"{member.label} training failed: {e}. Dropping it from the ensemble.")
+        return trained
+
+    def train(
+        self,
+        historical_data: HistoricalData,
+        metric: str,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Train all (or the included) members and, if configured, fit weights
+
+        The history is prepared once and the same PreparedSeries is handed to
+        every member.
+
+        Args:
+            historical_data: Historical time series data (records or a PreparedSeries)
+            metric: Name of the metric being forecasted
+            include: Names of members to train (default: all)
+
+        Returns:
+            Training metrics per member, weights and the resulting model type
+        """
+        self.metric_name = metric
+        members = [m for m in self.members if include is None or m.name in include]
+        series = PreparedSeries.of(historical_data)
+
+        trained = self._train_members(members, series, metric)
+        self.models = {name: model for name, (model, _) in trained.items()}
+
+        if self.weighting != 'fixed' and len(self.models) > 1:
+            self.weights.update(self.fit_weights(series, metric))
+
+        weights = self.normalized_weights()
+        labels = [m.label for m in self.members if m.name in self.models]
+        result = {
+            'model_type': ' + '.join(labels) + ' Ensemble' if len(labels) > 1 else labels[0],
+        }
+        for member in self.members:
+            result[f'{member.name}_metrics'] = trained[member.name][1] if member.name in trained else None
+        result['ensemble_weights'] = {m.name: weights.get(m.name, 0.0) for m in self.members}
+        return result
+
+    @property
+    def last_date(self) -> Optional[np.datetime64]:
+        """Oldest last training date across members (None if any member lacks one)"""
+        dates = [getattr(model, 'last_date', None) for model in self.models.values()]
+        if not dates or any(date is None for date in dates):
+            return None
+        return min(dates)
+
+    def update(self, new_points: HistoricalData) -> Dict[str, Any]:
+        """
+        Incrementally update every member with new observations
+
+        Weights are kept as they are. Raises NotImplementedError (before
+        touching any member) if some member has no update() method.
+
+        Args:
+            new_points: List of dicts with 'date' and 'value' keys, or a PreparedSeries
+
+        Returns:
+            Update summary per member
+        """
+        missing = [name for name, model in self.models.items() if not hasattr(model, 'update')]
+        if missing:
+            raise NotImplementedError(f"Members without incremental update: {missing}")
+
+        return {f'{name}_update': model.update(new_points) for name, model in self.models.items()}
+
+    def normalized_weights(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """Weights of the given (default: trained) members, summing to 1"""
+        names = list(self.models) if names is None else names
+        raw = np.array([self.weights[name] for name in names], dtype=np.float64)
+        total = raw.sum()
+        raw = raw / total if total > 0 else np.full(len(names), 1.0 / len(names))
+        return dict(zip(names, raw.tolist()))
+
+    def fit_weights(self, historical_data: HistoricalData, metric: str) -> Dict[str, float]:
+        """
+        Fit member weights from a backtest on the last backtest_days points
+
+        Members are retrained concurrently on the history before the holdout,
+        forecast the holdout, and the weights are solved from the stacked
+        (members x days) prediction matrix. Only observed holdout days are
+        scored; gap-filled days are synthetic and would favour whichever
+        member tracks the fill.
+
+        Returns:
+            Weight per member (unchanged if history is too short to backtest
+            or the holdout has fewer than MIN_OBSERVED_BACKTEST_DAYS observed days)
+        """
+        series = PreparedSeries.of(historical_data)
+        holdout_days = min(self.backtest_days, len(series) // 4)
+        if holdout_days < 1:
+            return {}
+        observed = series.observed[-holdout_days:]
+        if np.count_nonzero(observed) < MIN_OBSERVED_BACKTEST_DAYS:
+            logger.info(f"Only {np.count_nonzero(observed)} observed backtest days, keeping ensemble weights")
+            return {}
+
+        members = [m for m in self.members if m.name in self.models]
+        fitted = self._train_members(members, series[:-holdout_days], metric)
+        names = [m.name for m in members if m.name in fitted]
+        if len(names) < 2:
+            return {}
+
+        predictions = np.vstack([fitted[name][0].forecast(holdout_days).forecast for name in names])
+        predictions, actual = predictions[:, observed], series.values[-holdout_days:][observed]
+
+        weights = self.solve_weights(predictions, actual, self.weighting)
+        logger.info(f"Fitted {self.weighting} ensemble weights over {holdout_days} days: {dict(zip(names, weights))}")
+        return dict(zip(names, weights.tolist()))
+
+    @staticmethod
+    def solve_weights(predictions: np.ndarray, actual: np.ndarray, method: str = 'inverse_mse') -> np.ndarray:
+        """
+        Solve ensemble weights from backtest predictions
+
+        Args:
+            predictions: (members, days) member forecasts over the holdout
+            actual: (days,) observed values over the holdout
+            method: 'inverse_mse' or 'stacked'
+
+        Returns:
+            (members,) non-negative weights summing to 1
+        """
+        mse = np.mean((predictions - actual) ** 2, axis=1)
+        inverse = 1.0 / np.maximum(mse, np.finfo(np.float64).tiny)
+        inverse_mse = inverse / inverse.sum()
+        if method != 'stacked':
+            return inverse_mse
+
+        stacked, *_ = np.linalg.lstsq(predictions.T, actual, rcond=None)
+        stacked = np.clip(stacked, 0.0, None)
+        total = stacked.sum()
+        return stacked / total if total > 0 else inverse_mse
+
+    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> ForecastResult:
+        """
+        Generate the weighted ensemble forecast
+
+        Member forecasts are stacked into (members x days) matrices and combined
+        with one matrix-vector product per column. A member whose forecast
+        fails is dropped and the remaining weights are renormalized.
+
+        Args:
+            days: Number of days to forecast
+            confidence_level: Confidence interval passed to members
+
+        Returns:
+            Combined forecast with per-member component columns
+        """
+        results = {}
+        for member in self.members:
+            if member.name not in self.models:
+                continue
+            try:
+                results[member.name] = self.models[member.name].forecast(days, confidence_level=confidence_level)
+            except Exception as e:
+                if member.required:
+                    raise
+                logger.error(f"{member.label} forecast failed: {e}. Excluding it from the ensemble.")
+
+        if not results:
+            raise ValueError("Model must be trained before forecasting")
+
+        names = list(results)
+        if len(names) == 1:
+            return results[names[0]]
+
+        weights = self.normalized_weights(names)
+        w = np.array([weights[name] for name in names])
+        forecasts = np.vstack([results[name].forecast for name in names])
+        lower = np.vstack([results[name].lower_bound for name in names])
+        upper = np.vstack([results[name].upper_bound for name in names])
+
+        labels = [m.label for m in self.members if m.name in results]
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type=f"Ensemble ({' + '.join(labels)})",
+            dates=results[names[0]].dates,
+            forecast=w @ forecasts,
+            lower_bound=w @ lower,
+            upper_bound=w @ upper,
+            confidence_level=confidence_level,
+            components={f'{name}_forecast': results[name].forecast for name in names},
+            extra={'weights': weights}
+        )
+
+    def save(self, directory: str) -> None:
+        """
+        Save each member into its own subdirectory plus ensemble.json
+
+        Args:
+            directory: Existing directory to write into
+        """
+        for name, model in self.models.items():
+            member_dir = os.path.join(directory, name)
+            os.makedirs(member_dir, exist_ok=True)
+            model.save(member_dir)
+
+        with open(os.path.join(directory, 'ensemble.json'), 'w') as f:
+            json.dump({
+                'metric_name': self.metric_name,
+                'weighting': self.weighting,
+                'backtest_days': self.backtest_days,
+                'weights': self.weights,
+                'members': [member.to_spec() for member in self.members],
+                'trained': list(self.models)
+            }, f)
+
+    @classmethod
+    def from_members(
+        cls,
+        members: List[EnsembleMember],
+        weighting: str = 'fixed',
+        backtest_days: int = 14
+    ) -> 'WeightedEnsemble':
+        """
+        An untrained ensemble of this class with the given members
+
+        Bypasses subclass constructors, which build their own member lists
+        from other arguments. Subclasses keeping extra state in __init__
+        must override this.
+        """
+        ensemble = cls.__new__(cls)
+        WeightedEnsemble.__init__(ensemble, members, weighting=weighting, backtest_days=backtest_days)
+        return ensemble
+
+    @classmethod
+    def load(cls, directory: str) -> 'WeightedEnsemble':
+        """
+        Restore an ensemble saved with save()
+
+        Members are rebuilt from the specs saved with the ensemble, so this
+        works for WeightedEnsemble itself and for subclasses whatever their
+        constructor takes.
+
+        Args:
+            directory: Directory written by save()
+
+        Returns:
+            Trained ensemble
+        """
+        with open(os.path.join(directory, 'ensemble.json')) as f:
+            settings = json.load(f)
+
+        if 'trained' in settings:
+            members = [EnsembleMember.from_spec(spec) for spec in settings['members']]
+            ensemble = cls.from_members(members, settings['weighting'], settings['backtest_days'])
+            trained = settings['trained']
+        else:
+            # Saved before member specs were persisted: the subclass defaults define the members
+            ensemble = cls()
+            ensemble.weighting = settings['weighting']
+            trained = settings['members']
+        ensemble.metric_name = settings['metric_name']
+        ensemble.weights.update(settings['weights'])
+        for member in ensemble.members:
+            if member.name in trained:
+                ensemble.models[member.name] = member.loader(os.path.join(directory, member.name))
+        return ensemble
@@ -0,0 +1,126 @@
+"""
+Columnar forecast result shared by all CogniTwin forecasters
+Keeps predictions as NumPy arrays; per-day dicts are built only for JSON output
+"""
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def detect_trend(first_value: float, last_value: float) -> str:
+    """Classify the change between the first and last forecast values"""
+    change_pct = ((last_value - first_value) / first_value) * 100
+
+    if change_pct > 5:
+        return 'increasing'
+    elif change_pct < -5:
+        return 'decreasing'
+    else:
+        return 'stable'
+
+
+class ForecastResult:
+    """
+    Forecast as parallel arrays: dates (datetime64[D]), forecast, lower and
+    upper bounds, plus optional per-member component arrays (ensembles)
+    """
+
+    def __init__(
+        self,
+        metric: str,
+        model_type: str,
+        dates: np.ndarray,
+        forecast: np.ndarray,
+        lower_bound: np.ndarray,
+        upper_bound: np.ndarray,
+        confidence_level: float = 0.95,
+        components: Optional[Dict[str, np.ndarray]] = None,
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.metric = metric
+        self.model_type = model_type
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.forecast = np.asarray(forecast, dtype=np.float64)
+        self.lower_bound = np.asarray(lower_bound, dtype=np.float64)
+        self.upper_bound = np.asarray(upper_bound, dtype=np.float64)
+        self.confidence_level = confidence_level
+        self.components = components or {}
+        self.extra = extra or {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def horizon_days(self) -> int:
+        return len(self.dates)
+
+    @property
+    def trend(self) -> str:
+        if len(self.forecast) == 0:
+            return 'unknown'
+        return detect_trend(float(self.forecast[0]), float(self.forecast[-1]))
+
+    def _columns(self, rows: slice = slice(None), components: bool = True) -> Dict[str, List]:
+        """JSON-ready columns (ISO dates, values rounded to cents)"""
+        columns = {
+            'date': np.datetime_as_string(self.dates[rows]).tolist(),
+            'forecast': np.round(self.forecast[rows], 2).tolist(),
+            'lower_bound': np.round(self.lower_bound[rows], 2).tolist(),
+            'upper_bound': np.round(self.upper_bound[rows], 2).tolist(),
+        }
+        if components:
+            for name, values in self.components.items():
+                columns[name] = np.round(values[rows], 2).tolist()
+        return columns
+
+    def _rows(self, rows: slice, components: bool) -> List[Dict[str, Any]]:
+        columns = self._columns(rows, components)
+        names = list(columns)
+        confidence = self.confidence_level
+        return [
+            {**dict(zip(names, row)), 'confidence': confidence}
+            for row in zip(*columns.values())
+        ]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Per-day dicts in the API's 'predictions' shape
+
+        Returns:
+            List of {'date', 'forecast', 'lower_bound', 'upper_bound',
+            <components>, 'confidence'} dicts
+        """
+        return self._rows(slice(None), components=True)
+
+    def iter_records(self, chunk_days: int = 256, components: bool = True) -> Iterator[List[Dict[str, Any]]]:
+        """
+        to_records() in chunks, so a long horizon is serialized piece by piece
+
+        Args:
+            chunk_days: Days per chunk
+            components: Include per-member component columns
+
+        Yields:
+            Lists of at most chunk_days records
+        """
+        for start in range(0, len(self), max(1, chunk_days)):
+            yield self._rows(slice(start, start + chunk_days), components)
+
+    def record(self, index: int) -> Optional[Dict[str, Any]]:
+        """A single day as a dict (negative indexes allowed), or None if empty"""
+        if len(self) == 0:
+            return None
+        index = index % len(self)
+        columns = self._columns(slice(index, index + 1))
+        return {**{name: values[0] for name, values in columns.items()}, 'confidence': self.confidence_level}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full result in the forecasters' original dict shape"""
+        return {
+            'metric': self.metric,
+            'model_type': self.model_type,
+            'horizon_days': self.horizon_days,
+            'predictions': self.to_records(),
+            'trend': self.trend,
+            'confidence_level': self.confidence_level,
+            **self.extra
+        }
@@ -0,0 +1,498 @@
+"""
+Global multi-tenant LSTM forecaster for CogniTwin
+One network, trained offline across many series, shared by every tenant
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .forecast_result import ForecastResult
+from .lstm_forecaster import LSTMNetwork, fit_network
+from .preprocessing import HistoricalData, PreparedSeries
+
+logger = logging.getLogger(__name__)
+
+
+def scale_series(values: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    """
+    Min-max scale one series to [0, 1]
+
+    Returns:
+        Tuple of (scaled values, data_min, data_range); a flat series gets range 1
+    """
+    data_min = float(np.min(values))
+    data_range = float(np.max(values)) - data_min or 1.0
+    return (values - data_min) / data_range, data_min, data_range
+
+
+class GlobalLSTMNetwork(LSTMNetwork):
+    """
+    LSTMNetwork conditioned on a learned metric embedding
+
+    The embedding is appended to the value at every time step, so one set of
+    weights can serve revenue, orders, customers, ... for every tenant.
+    """
+
+    def __init__(self, n_metrics: int, embedding_dim: int = 4, hidden_size: int = 64, num_layers: int = 2):
+        super().__init__(input_size=1 + embedding_dim, hidden_size=hidden_size, num_layers=num_layers, output_size=1)
+        self.embedding = nn.Embedding(n_metrics, embedding_dim)
+
+    def _with_embedding(self, x: torch.Tensor, metric_ids: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        embedding = self.embedding(metric_ids)
+        return torch.cat([x, embedding.unsqueeze(1).expand(-1, x.size(1), -1)], dim=-1), embedding
+
+    def forward(self, x, metric_ids):
+        inputs, _ = self._with_embedding(x, metric_ids)
+        return super().forward(inputs)
+
+    def rollout(self, seed: torch.Tensor, metric_ids: torch.Tensor, steps: int) -> torch.Tensor:
+        """
+        Batched autoregressive forecast for many series at once
+
+        Args:
+            seed: (batch, sequence_length, 1) scaled input windows
+            metric_ids: (batch,) metric index of each series
+            steps: Number of steps to predict
+
+        Returns:
+            (batch, steps) scaled predictions
+        """
+        inputs, embedding = self._with_embedding(seed, metric_ids)
+        return super().rollout(inputs, steps, conditioning=embedding)
+
+
+class GlobalLSTMModel:
+    """
+    Shared network plus the metric vocabulary it was trained on
+    """
+
+    def __init__(
+        self,
+        metrics: Sequence[str],
+        sequence_length: int = 14,
+        embedding_dim: int = 4,
+        hidden_size: int = 64,
+        num_layers: int = 2
+    ):
+        self.metrics = list(metrics)
+        self.metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+        self.sequence_length = sequence_length
+        self.embedding_dim = embedding_dim
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.network = GlobalLSTMNetwork(
+            n_metrics=len(self.metrics),
+            embedding_dim=embedding_dim,
+            hidden_size=hidden_size,
+            num_layers=num_layers
+        ).to(self.device)
+
+    def fit(
+        self,
+        series: List[np.ndarray],
+        metrics: List[str],
+        epochs: int = 100,
+        lr: float = 0.001,
+        batch_size: int = 256,
+        validation_fraction: float = 0.15,
+        patience: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Train the shared network over many series in bulk (offline)
+
+        Each series is scaled on its own; its windows are strided views, and
+        the most recent validation_fraction of every series is held out for
+        early stopping.
+
+        Args:
+            series: 1D value arrays, one per tenant x metric
+            metrics: Metric name of each series (must be in self.metrics)
+            epochs: Maximum number of epochs
+            lr: Learning rate
+            batch_size: Windows per optimizer step
+            validation_fraction: Share of each series' windows held out
+            patience: Epochs without validation improvement before stopping
+
+        Returns:
+            Training summary
+        """
+        fit_parts, val_parts = [], []
+        for values, metric in zip(series, metrics):
+            values = np.asarray(values, dtype=np.float64)
+            values = values[~np.isnan(values)]
+            if len(values) <= self.sequence_length:
+                continue
+
+            scaled, _, _ = scale_series(values)
+            tensor = torch.as_tensor(scaled, dtype=torch.float32, device=self.device)
+            X = tensor.unfold(0, self.sequence_length, 1)[:-1].unsqueeze(-1)
+            y = tensor[self.sequence_length:].unsqueeze(-1)
+            ids = torch.full((len(y),), self.metric_index[metric], dtype=torch.long, device=self.device)
+
+            n_val = int(len(y) * validation_fraction)
+            split = len(y) - n_val
+            fit_parts.append((X[:split], ids[:split], y[:split]))
+            if n_val:
+                val_parts.append((X[split:], ids[split:], y[split:]))
+
+        if not fit_parts:
+            raise ValueError(f"No series longer than sequence_length={self.sequence_length}")
+
+        X_fit, ids_fit, y_fit = (torch.cat(part) for part in zip(*fit_parts))
+        if val_parts:
+            X_val, ids_val, y_val = (torch.cat(part) for part in zip(*val_parts))
+            val_inputs = (X_val, ids_val)
+        else:
+            val_inputs, y_val = None, None
+
+        logger.info(f"Training global LSTM on {len(fit_parts)} series, {len(y_fit)} windows")
+        stats = fit_network(
+            self.network, (X_fit, ids_fit), y_fit, val_inputs, y_val,
+            epochs=epochs, lr=lr, batch_size=batch_size, patience=patience
+        )
+        self.network.eval()
+        return {
+            'series': len(fit_parts),
+            'training_samples': len(y_fit),
+            'validation_samples': 0 if y_val is None else len(y_val),
+            'max_epochs': epochs,
+            **stats
+        }
+
+    def rollout(self, scaled_seeds: np.ndarray, metric_ids: np.ndarray, days: int) -> np.ndarray:
+        """
+        Scaled (series, days) forecasts for a batch of seed windows
+        """
+        seed = torch.as_tensor(scaled_seeds, dtype=torch.float32, device=self.device).unsqueeze(-1)
+        ids = torch.as_tensor(metric_ids, dtype=torch.long, device=self.device)
+        self.network.eval()
+        with torch.inference_mode():
+            return self.network.rollout(seed, ids, days).cpu().numpy()
+
+    def predict_next(self, scaled_windows: torch.Tensor, metric_ids: torch.Tensor) -> np.ndarray:
+        """One-step-ahead scaled predictions for (batch, sequence_length, 1) windows"""
+        self.network.eval()
+        with torch.inference_mode():
+            return self.network(scaled_windows, metric_ids)[:, 0].cpu().numpy()
+
+    def save(self, path: str) -> None:
+        """Save weights and configuration to a single .pt file"""
+        torch.save({
+            'state_dict': self.network.state_dict(),
+            'config': {
+                'metrics': self.metrics,
+                'sequence_length': self.sequence_length,
+                'embedding_dim': self.embedding_dim,
+                'hidden_size': self.hidden_size,
+                'num_layers': self.num_layers
+            }
+        }, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'GlobalLSTMModel':
+        """Load a model saved with save()"""
+        payload = torch.load(path, map_location='cpu', weights_only=True)
+        model = cls(**payload['config'])
+        model.network.load_state_dict(payload['state_dict'])
+        model.network.to(model.device)
+        model.network.eval()
+        return model
+
+
+# Shared models are loaded once per process and reused by every forecaster
+_shared_models: Dict[str, GlobalLSTMModel] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_model(path: str) -> GlobalLSTMModel:
+    """Load (once per process) and return the global model stored at path"""
+    path = os.path.abspath(path)
+    with _shared_lock:
+        if path not in _shared_models:
+            logger.info(f"Loading global LSTM weights from {path}")
+            _shared_models[path] = GlobalLSTMModel.load(path)
+        return _shared_models[path]
+
+
+class GlobalLSTMForecaster:
+    """
+    Per-series view of a shared GlobalLSTMModel
+
+    Same interface as LSTMForecaster, but train() only fits the series'
+    scaler and seed window; the network weights are loaded from weights_path
+    and never copied into the forecaster, so cached or pickled forecasters
+    stay small.
+    """
+
+    def __init__(self, weights_path: str):
+        self.weights_path = weights_path
+        self.metric_name = None
+        self.data_min = None
+        self.data_range = None
+        self.seed_values = None
+        self.last_date = None
+
+    @property
+    def model(self) -> GlobalLSTMModel:
+        return shared_model(self.weights_path)
+
+    def train(self, historical_data: HistoricalData, metric: str, **kwargs) -> Dict[str, Any]:
+        """
+        Fit the series scaler and seed window against the shared weights
+
+        Args:
+            historical_data: List of dicts with 'date' and 'value' keys, or a PreparedSeries
+            metric: Name of metric being forecasted (must be in the model's vocabulary)
+            **kwargs: Ignored (accepts LSTMForecaster training arguments)
+
+        Returns:
+            In-sample one-step-ahead metrics
+        """
+        model = self.model
+        if metric not in model.metric_index:
+            raise ValueError(f"Global LSTM was not trained on metric '{metric}'")
+
+        series = PreparedSeries.of(historical_data)
+        values = series.values
+        if len(values) <= model.sequence_length:
+            raise ValueError(f"Need more than {model.sequence_length} points for the global LSTM")
+
+        self.metric_name = metric
+        scaled, self.data_min, self.data_range = scale_series(values)
+        self.seed_values = values[-model.sequence_length:].copy()
+        self.last_date = series.last_date
+
+        # One batched forward pass over all windows for in-sample metrics
+        tensor = torch.as_tensor(scaled, dtype=torch.float32, device=model.device)
+        windows = tensor.unfold(0, model.sequence_length, 1)[:-1].unsqueeze(-1)
+        ids = torch.full((len(windows),), model.metric_index[metric], dtype=torch.long, device=model.device)
+        predicted = model.predict_next(windows, ids) * self.data_range + self.data_min
+        # Score only days that were observed, not filled
+        observed = series.observed[model.sequence_length:]
+        predicted, actual = predicted[observed], values[model.sequence_length:][observed]
+
+        mae = np.mean(np.abs(predicted - actual))
+        mape = np.mean(np.abs((actual - predicted) / actual)) * 100
+
+        return {
+            'model_type': 'Global LSTM',
+            'metric': metric,
+            'training_samples': len(actual),
+            'epochs': 0,
+            'mae': float(mae),
+            'mape': float(mape),
+            'accuracy': float(100 - mape)
+        }
+
+    def update(self, new_points: HistoricalData) -> Dict[str, Any]:
+        """
+        Advance the seed window past new observations (no weights change)
+
+        The series scaler is widened if new values fall outside it. Days
+        missing since the training data are filled like any other gap.
+
+        Args:
+            new_points: List of dicts with 'date' and 'value' keys, or a PreparedSeries
+
+        Returns:
+            Update summary
+        """
+        if self.seed_values is None:
+            raise ValueError("Model must be trained before updating")
+
+        points = PreparedSeries.continuation(new_points, self.last_date, self.seed_values[-1])
+        new_samples = int(np.count_nonzero(points.observed))
+        if new_samples:
+            values = points.values
+            data_max = max(self.data_min + self.data_range, float(values.max()))
+            self.data_min = min(self.data_min, float(values.min()))
+            self.data_range = data_max - self.data_min or 1.0
+            self.seed_values = np.concatenate([self.seed_values, values])[-len(self.seed_values):]
+            self.last_date = points.last_date
+
+        return {'model_type': 'Global LSTM', 'metric': self.metric_name, 'new_samples': new_samples, 'epochs': 0}
+
+    def _result(self, scaled_predictions: np.ndarray, confidence_level: float) -> ForecastResult:
+        forecast = scaled_predictions.astype(np.float64) * self.data_range + self.data_min
+        margin = forecast * 0.10
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type='Global LSTM',
+            dates=self.last_date + 1 + np.arange(len(forecast)),
+            forecast=forecast,
+            lower_bound=forecast - margin,
+            upper_bound=forecast + margin,
+            confidence_level=confidence_level
+        )
+
+    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> ForecastResult:
+        """
+        Generate forecast for specified number of days (±10% bounds, like LSTMForecaster)
+
+        Args:
+            days: Number of days to forecast
+            confidence_level: Recorded on the result
+
+        Returns:
+            Columnar forecast
+        """
+        return self.forecast_many([self], days, confidence_level)[0]
+
+    @staticmethod
+    def forecast_many(
+        forecasters: List['GlobalLSTMForecaster'],
+        days: int = 30,
+        confidence_level: float = 0.95
+    ) -> List[ForecastResult]:
+        """
+        Forecast many series in one batched rollout per shared model
+
+        Args:
+            forecasters: Trained per-series forecasters
+            days: Number of days to forecast
+            confidence_level: Recorded on the results
+
+        Returns:
+            One ForecastResult per forecaster, in order
+        """
+        if any(f.seed_values is None for f in forecasters):
+            raise ValueError("Model must be trained before forecasting")
+
+        results: List[Optional[ForecastResult]] = [None] * len(forecasters)
+        by_path: Dict[str, List[int]] = {}
+        for i, forecaster in enumerate(forecasters):
+            by_path.setdefault(os.path.abspath(forecaster.weights_path), []).append(i)
+
+        for path, indexes in by_path.items():
+            model = shared_model(path)
+            group = [forecasters[i] for i in indexes]
+            seeds = np.vstack([(f.seed_values - f.data_min) / f.data_range for f in group])
+            metric_ids = np.array([model.metric_index[f.metric_name] for f in group])
+            scaled = model.rollout(seeds, metric_ids, days)
+            for row, i in enumerate(indexes):
+                results[i] = forecasters[i]._result(scaled[row], confidence_level)
+        return results
+
+    def save(self, directory: str) -> None:
+        """Save the per-series state to global_lstm.json (weights stay at weights_path)"""
+        with open(os.path.join(directory, 'global_lstm.json'), 'w') as f:
+            json.dump({
+                'weights_path': self.weights_path,
+                'metric_name': self.metric_name,
+                'data_min': self.data_min,
+                'data_range': self.data_range,
+                'seed_values': self.seed_values.tolist(),
+                'last_date': str(self.last_date)
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str) -> 'GlobalLSTMForecaster':
+        """Restore a forecaster saved with save()"""
+        with open(os.path.join(directory, 'global_lstm.json')) as f:
+            state = json.load(f)
+
+        forecaster = cls(state['weights_path'])
+        forecaster.metric_name = state['metric_name']
+        forecaster.data_min = state['data_min']
+        forecaster.data_range = state['data_range']
+        forecaster.seed_values = np.array(state['seed_values'], dtype=np.float64)
+        forecaster.last_date = np.datetime64(state['last_date'], 'D')
+        return forecaster
+
+
+async def load_training_series(
+    metrics: Sequence[str],
+    history_days: int = 365,
+    mock_tenants: int = 50,
+    fill: str = 'linear'
+) -> Tuple[List[np.ndarray], List[str]]:
+    """
+    Every active tenant's history of each metric, prepared as the service prepares it
+
+    Reads daily_metrics through MetricsDatabase (one query per tenant, all
+    metrics) when DATABASE_URL is set; otherwise falls back to mock_tenants
+    generated tenants. Series are put on a regular daily calendar with gaps
+    filled, like the per-request PreparedSeries the model will be seeded from.
+
+    Args:
+        metrics: Metric names (see utils.metrics_db.METRIC_COLUMNS)
+        history_days: Days of history per series
+        mock_tenants: Tenants to generate without a database
+        fill: Gap filling method ('linear' or 'ffill')
+
+    Returns:
+        Tuple of (value arrays, metric name of each array)
+    """
+    import asyncio
+    import uuid
+    from datetime import date, timedelta
+    from utils import MetricsDatabase, fetch_tenant_frame
+
+    db = MetricsDatabase.from_env()
+    since = date.today() - timedelta(days=history_days)
+    try:
+        if db is not None:
+            tenants = await db.fetch_active_tenants()
+        else:
+            logger.warning(f"DATABASE_URL not set, training on {mock_tenants} mock tenants")
+            tenants = [str(uuid.uuid4()) for _ in range(mock_tenants)]
+
+        limit = asyncio.Semaphore(db.max_size if db is not None else 8)
+
+        async def load(tenant_id: str):
+            async with limit:
+                try:
+                    return await fetch_tenant_frame(tenant_id, list(metrics), since, db)
+                except Exception as e:
+                    logger.warning(f"Skipping tenant {tenant_id}: {e}")
+                    return None
+
+        frames = await asyncio.gather(*(load(tenant_id) for tenant_id in tenants))
+    finally:
+        if db is not None:
+            await db.close()
+
+    series, series_metrics = [], []
+    for frame in frames:
+        if frame is None:
+            continue
+        for metric in metrics:
+            dates, values = frame.series(metric)
+            if len(values):
+                series.append(PreparedSeries.from_arrays(dates, values, fill).values)
+                series_metrics.append(metric)
+    logger.info(f"Loaded {len(series)} series from {len(tenants)} tenants")
+    return series, series_metrics
+
+
+# Offline training: python -m models.global_lstm_forecaster [weights_path]
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    from utils.metrics_db import METRIC_COLUMNS
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Train the global LSTM on every active tenant's daily_metrics")
+    parser.add_argument('weights_path', nargs='?', default=os.getenv('FORECAST_GLOBAL_LSTM_PATH', 'global_lstm.pt'))
+    parser.add_argument('--history-days', type=int, default=365)
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--mock-tenants', type=int, default=50, help="Tenants to generate without DATABASE_URL")
+    args = parser.parse_args()
+
+    # The vocabulary is every metric the service can fetch, so any stored metric has an embedding
+    metrics = list(METRIC_COLUMNS)
+    series, series_metrics = asyncio.run(load_training_series(
+        metrics, args.history_days, args.mock_tenants, os.getenv('FORECAST_GAP_FILL', 'linear')
+    ))
+
+    model = GlobalLSTMModel(metrics)
+    print("Training Results:", model.fit(series, series_metrics, epochs=args.epochs))
+    model.save(args.weights_path)
+    print(f"Saved global LSTM to {args.weights_path}")
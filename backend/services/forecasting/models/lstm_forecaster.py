@@ -2,16 +2,97 @@
 LSTM-based forecasting model for CogniTwin
 Deep learning time series prediction using PyTorch
 """
+import copy
+import os
+import warnings
 import numpy as np
-import pandas as pd
 import torch
 import torch.nn as nn
 from sklearn.preprocessing import MinMaxScaler
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from .forecast_result import ForecastResult
+from .preprocessing import HistoricalData, PreparedSeries
+
 logger = logging.getLogger(__name__)
 
+# Forecasting backends selectable with LSTMForecaster.optimize_for_inference
+INFERENCE_MODES = ('eager', 'script')
+
+# Fitted MinMaxScaler state persisted alongside the network weights
+SCALER_ARRAY_ATTRS = ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_')
+
+
+def fit_network(
+    model: nn.Module,
+    fit_inputs: Tuple[torch.Tensor, ...],
+    y_fit: torch.Tensor,
+    val_inputs: Optional[Tuple[torch.Tensor, ...]] = None,
+    y_val: Optional[torch.Tensor] = None,
+    epochs: int = 100,
+    lr: float = 0.001,
+    batch_size: int = 32,
+    patience: int = 10
+) -> Dict[str, Any]:
+    """
+    Mini-batch Adam/MSE training with early stopping on a validation set
+
+    Args:
+        model: Network called as model(*inputs)
+        fit_inputs: Training input tensors, indexed along the first dimension
+        y_fit: Training targets
+        val_inputs: Validation inputs (None trains for the full epoch budget)
+        y_val: Validation targets
+        epochs: Maximum number of epochs
+        lr: Learning rate
+        batch_size: Samples per optimizer step
+        patience: Epochs without validation improvement before stopping
+
+    Returns:
+        Dict with 'epochs' run, 'best_epoch' and 'validation_loss'
+    """
+    criterion = nn.MSELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+
+    best_loss, best_epoch, best_state = float('inf'), 0, None
+    epochs_run = 0
+    for epoch in range(epochs):
+        model.train()
+        order = torch.randperm(len(y_fit), device=y_fit.device)
+        for start in range(0, len(y_fit), batch_size):
+            batch = order[start:start + batch_size]
+            optimizer.zero_grad()
+            loss = criterion(model(*(inputs[batch] for inputs in fit_inputs)), y_fit[batch])
+            loss.backward()
+            optimizer.step()
+        epochs_run = epoch + 1
+
+        if val_inputs is None:
+            continue
+
+        model.eval()
+        with torch.no_grad():
+            val_loss = criterion(model(*val_inputs), y_val).item()
+        if val_loss < best_loss:
+            best_loss, best_epoch = val_loss, epochs_run
+            best_state = {name: tensor.clone() for name, tensor in model.state_dict().items()}
+        elif epochs_run - best_epoch >= patience:
+            logger.info(f"Early stopping at epoch {epochs_run} (best {best_epoch}, val loss {best_loss:.6f})")
+            break
+
+        if epochs_run % 20 == 0:
+            logger.info(f"Epoch [{epochs_run}/{epochs}], Val loss: {val_loss:.6f}")
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+
+    return {
+        'epochs': epochs_run,
+        'best_epoch': best_epoch or epochs_run,
+        'validation_loss': None if val_inputs is None else float(best_loss)
+    }
+
 
 class LSTMNetwork(nn.Module):
     """
@@ -37,25 +118,173 @@ class LSTMNetwork(nn.Module):
         out = self.fc(out[:, -1, :])
         return out
 
+    def rollout(self, seed: torch.Tensor, steps: int, conditioning: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Autoregressive multi-step forecast, batched over series
+
+        The seed window is encoded once with the full LSTM; afterwards each
+        step feeds only the previous prediction through the fused per-layer
+        LSTM cells, carrying (h, c) forward instead of re-running the whole
+        window from a zero state.
+
+        Args:
+            seed: (batch, sequence_length, input_size) scaled input windows
+            steps: Number of steps to predict
+            conditioning: (batch, input_size - 1) static features appended to
+                each fed-back prediction (e.g. series embeddings)
+
+        Returns:
+            (batch, steps) scaled predictions, on the seed's device
+        """
+        predictions = torch.empty(seed.size(0), steps, device=seed.device, dtype=seed.dtype)
+        if steps == 0:
+            return predictions
+
+        out, (h, c) = self.lstm(seed)
+        h, c = list(h.unbind(0)), list(c.unbind(0))
+        layers = [
+            tuple(getattr(self.lstm, f'{name}_l{layer}') for name in ('weight_ih', 'weight_hh', 'bias_ih', 'bias_hh'))
+            for layer in range(self.num_layers)
+        ]
+        fc_weight_t, fc_bias = self.fc.weight.t(), self.fc.bias
+
+        step = self.fc(out[:, -1, :])
+        predictions[:, 0] = step[:, 0]
+        for i in range(1, steps):
+            x = step if conditioning is None else torch.cat([step, conditioning], dim=1)
+            for layer, weights in enumerate(layers):
+                h[layer], c[layer] = torch.lstm_cell(x, (h[layer], c[layer]), *weights)
+                x = h[layer]
+            step = torch.addmm(fc_bias, x, fc_weight_t)
+            predictions[:, i] = step[:, 0]
+        return predictions
+
+
+class LSTMInference(nn.Module):
+    """
+    CPU inference copy of a trained LSTMNetwork, built for TorchScript export
+
+    The nn.LSTM is unrolled into one nn.LSTMCell per layer so the whole
+    rollout loop can be scripted.
+    """
+
+    def __init__(self, network: LSTMNetwork):
+        super().__init__()
+        self.hidden_size = network.hidden_size
+        cells = []
+        for layer in range(network.num_layers):
+            cell = nn.LSTMCell(network.lstm.input_size if layer == 0 else network.hidden_size, network.hidden_size)
+            with torch.no_grad():
+                for name in ('weight_ih', 'weight_hh', 'bias_ih', 'bias_hh'):
+                    getattr(cell, name).copy_(getattr(network.lstm, f'{name}_l{layer}'))
+            cells.append(cell)
+        self.cells = nn.ModuleList(cells)
+        self.fc = copy.deepcopy(network.fc)
+
+    def forward(self, seed: torch.Tensor, steps: int) -> torch.Tensor:
+        """Same contract as LSTMNetwork.rollout: (batch, seq, 1) seed -> (batch, steps)"""
+        batch, seed_length = seed.size(0), seed.size(1)
+        h: List[torch.Tensor] = []
+        c: List[torch.Tensor] = []
+        for _ in range(len(self.cells)):
+            h.append(torch.zeros(batch, self.hidden_size, dtype=seed.dtype, device=seed.device))
+            c.append(torch.zeros(batch, self.hidden_size, dtype=seed.dtype, device=seed.device))
+
+        predictions = torch.empty(batch, steps, dtype=seed.dtype, device=seed.device)
+        x = seed[:, 0, :]
+        for i in range(seed_length + steps - 1):
+            # Encode the seed window, then feed back each prediction
+            if i < seed_length:
+                x = seed[:, i, :]
+            for layer, cell in enumerate(self.cells):
+                h[layer], c[layer] = cell(x, (h[layer], c[layer]))
+                x = h[layer]
+            if i >= seed_length - 1:
+                x = self.fc(x)
+                predictions[:, i - seed_length + 1] = x[:, 0]
+        return predictions
+
+
+def export_inference_model(network: LSTMNetwork) -> torch.jit.ScriptModule:
+    """
+    Export a trained network's rollout to TorchScript for inference
+
+    Args:
+        network: Trained LSTMNetwork (single input feature)
+
+    Returns:
+        Frozen ScriptModule called as module(seed, steps)
+    """
+    module = LSTMInference(network).eval()
+    with warnings.catch_warnings():
+        # torch.jit is deprecated upstream in favour of torch.export, which cannot
+        # yet export a data-dependent rollout loop
+        warnings.simplefilter('ignore', FutureWarning)
+        return torch.jit.freeze(torch.jit.script(module))
+
 
 class LSTMForecaster:
     """
     LSTM-based time series forecasting model
     """
 
-    def __init__(self, sequence_length: int = 10, hidden_size: int = 50, num_layers: int = 2):
+    def __init__(
+        self,
+        sequence_length: int = 10,
+        hidden_size: int = 50,
+        num_layers: int = 2,
+        inference_mode: str = 'eager'
+    ):
         self.sequence_length = sequence_length
         self.hidden_size = hidden_size
         self.num_layers = num_layers
         self.model = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.metric_name = None
+        # Tail of the training series that seeds the forecast rollout
+        self.seed_values = None
+        self.last_date = None
+        # Optional TorchScript copy used for forecasting
+        self.inference_model = None
+        self.inference_mode = inference_mode
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # ScriptModules cannot be pickled; __setstate__ re-exports from the network
+        state = self.__dict__.copy()
+        state['inference_model'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.model is not None and self.inference_mode != 'eager':
+            self.optimize_for_inference(self.inference_mode)
+
+    def optimize_for_inference(self, mode: str = 'script') -> None:
+        """
+        Switch forecasting to an exported model
+
+        Args:
+            mode: 'eager' (the trained nn.Module) or 'script' (TorchScript fp32)
+        """
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"mode must be one of {INFERENCE_MODES}")
+        if self.model is None:
+            raise ValueError("Model must be trained before optimizing")
+
+        if mode == 'eager':
+            self.inference_model = None
+        else:
+            self.inference_model = export_inference_model(self.model)
+        self.inference_mode = mode
+
     def prepare_sequences(self, data: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Create sequences for LSTM training
 
+        Windows are strided views (Tensor.unfold) over one tensor holding the
+        series, so no per-window copies are made.
+
         Args:
             data: 1D array of values
 
@@ -63,25 +292,37 @@ class LSTMForecaster:
             X: Input sequences (batch_size, sequence_length, 1)
             y: Target values (batch_size, 1)
         """
-        X, y = [], []
-        for i in range(len(data) - self.sequence_length):
-            X.append(data[i:i + self.sequence_length])
-            y.append(data[i + self.sequence_length])
-
-        X = np.array(X).reshape(-1, self.sequence_length, 1)
-        y = np.array(y).reshape(-1, 1)
-
-        return torch.FloatTensor(X).to(self.device), torch.FloatTensor(y).to(self.device)
-
-    def train(self, historical_data: List[Dict], metric: str, epochs: int = 100, lr: float = 0.001) -> Dict[str, Any]:
+        series = torch.as_tensor(np.asarray(data, dtype=np.float32), device=self.device)
+        X = series.unfold(0, self.sequence_length, 1)[:-1].unsqueeze(-1)
+        y = series[self.sequence_length:].unsqueeze(-1)
+        return X, y
+
+    def train(
+        self,
+        historical_data: HistoricalData,
+        metric: str,
+        epochs: int = 100,
+        lr: float = 0.001,
+        batch_size: int = 32,
+        validation_fraction: float = 0.15,
+        patience: int = 10
+    ) -> Dict[str, Any]:
         """
         Train LSTM model on historical data
 
+        The last validation_fraction of the windows is held out; training stops
+        once the validation loss has not improved for patience epochs, and the
+        best weights are kept. Series too short for a holdout train on all
+        windows for the full epoch budget.
+
         Args:
-            historical_data: List of dicts with 'date' and 'value' keys
+            historical_data: List of dicts with 'date' and 'value' keys, or a PreparedSeries
             metric: Name of metric being forecasted
-            epochs: Number of training epochs
+            epochs: Maximum number of training epochs
             lr: Learning rate
+            batch_size: Windows per optimizer step
+            validation_fraction: Share of (most recent) windows held out
+            patience: Epochs without validation improvement before stopping
 
         Returns:
             Training metrics and model info
@@ -90,14 +331,24 @@ class LSTMForecaster:
 
         self.metric_name = metric
 
-        # Extract values and normalize
-        df = pd.DataFrame(historical_data)
-        values = df['value'].values.reshape(-1, 1)
+        # Gap-filled daily values, normalized
+        series = PreparedSeries.of(historical_data)
+        values = series.values.reshape(-1, 1)
         scaled_values = self.scaler.fit_transform(values)
+        self.seed_values = series.values[-self.sequence_length:].copy()
+        self.last_date = series.last_date
 
         # Create sequences
         X_train, y_train = self.prepare_sequences(scaled_values.flatten())
 
+        # Hold out the most recent windows for early stopping
+        n_val = int(len(X_train) * validation_fraction)
+        if n_val >= 2:
+            X_fit, y_fit = X_train[:-n_val], y_train[:-n_val]
+            X_val, y_val = X_train[-n_val:], y_train[-n_val:]
+        else:
+            X_fit, y_fit, X_val, y_val = X_train, y_train, None, None
+
         # Initialize model
         self.model = LSTMNetwork(
             input_size=1,
@@ -106,29 +357,18 @@ class LSTMForecaster:
             output_size=1
         ).to(self.device)
 
-        # Training setup
-        criterion = nn.MSELoss()
-        optimizer = torch.optim.Adam(self.model.parameters(), lr=lr)
-
-        # Training loop
-        self.model.train()
-        losses = []
-        for epoch in range(epochs):
-            optimizer.zero_grad()
-            outputs = self.model(X_train)
-            loss = criterion(outputs, y_train)
-            loss.backward()
-            optimizer.step()
-            losses.append(loss.item())
-
-            if (epoch + 1) % 20 == 0:
-                logger.info(f"Epoch [{epoch+1}/{epochs}], Loss: {loss.item():.6f}")
+        fit_stats = fit_network(
+            self.model, (X_fit,), y_fit,
+            None if X_val is None else (X_val,), y_val,
+            epochs=epochs, lr=lr, batch_size=batch_size, patience=patience
+        )
+        self.optimize_for_inference(self.inference_mode)
 
         # Calculate training metrics
         self.model.eval()
         with torch.no_grad():
             predictions = self.model(X_train)
-            final_loss = criterion(predictions, y_train).item()
+            final_loss = nn.functional.mse_loss(predictions, y_train).item()
 
             # Inverse transform for actual metrics
             pred_actual = self.scaler.inverse_transform(predictions.cpu().numpy())
@@ -140,24 +380,100 @@ class LSTMForecaster:
         return {
             'model_type': 'LSTM',
             'metric': metric,
-            'training_samples': len(X_train),
-            'epochs': epochs,
+            'training_samples': len(X_fit),
+            'validation_samples': 0 if X_val is None else len(X_val),
+            'epochs': fit_stats['epochs'],
+            'max_epochs': epochs,
+            'best_epoch': fit_stats['best_epoch'],
+            'validation_loss': fit_stats['validation_loss'],
             'final_loss': float(final_loss),
             'mae': float(mae),
             'mape': float(mape),
             'accuracy': float(100 - mape)
         }
 
-    def forecast(self, days: int = 30, historical_data: List[Dict] = None) -> Dict[str, Any]:
+    def update(
+        self,
+        new_points: HistoricalData,
+        epochs: int = 5,
+        lr: float = 0.0005,
+        batch_size: int = 32,
+        range_tolerance: float = 0.1
+    ) -> Dict[str, Any]:
+        """
+        Fine-tune the trained network on observations newer than its data
+
+        Starts from the current weights and trains a few epochs on the windows
+        ending at each new point (seeded by the stored tail of the series).
+        The scaler stays frozen so the weights keep meaning the same thing,
+        unless new values leave the fitted range by more than range_tolerance
+        of its width. In that case it is widened to cover them (never narrowed)
+        and the fine-tune runs twice as many epochs. Days missing between the
+        training data and the new points are filled like any other gap.
+
+        Args:
+            new_points: List of dicts with 'date' and 'value' keys, or a PreparedSeries
+            epochs: Fine-tuning epochs
+            lr: Learning rate (lower than full training)
+            batch_size: Windows per optimizer step
+            range_tolerance: Allowed overshoot of the scaler range, as a fraction of it
+
+        Returns:
+            Update summary
+        """
+        if self.model is None:
+            raise ValueError("Model must be trained before updating")
+
+        points = PreparedSeries.continuation(new_points, self.last_date, self.seed_values[-1])
+        new_samples = int(np.count_nonzero(points.observed))
+        summary = {'model_type': 'LSTM', 'metric': self.metric_name, 'new_samples': new_samples, 'epochs': 0}
+        if not new_samples:
+            return summary
+
+        values = points.values
+        data_min, data_max = self.scaler.data_min_[0], self.scaler.data_max_[0]
+        margin = range_tolerance * (data_max - data_min)
+        scaler_refit = bool(values.min() < data_min - margin or values.max() > data_max + margin)
+        if scaler_refit:
+            self.scaler.partial_fit(values.reshape(-1, 1))
+            epochs *= 2
+
+        series = np.concatenate([self.seed_values, values])
+        X, y = self.prepare_sequences(self.scaler.transform(series.reshape(-1, 1))[:, 0])
+        fit_stats = fit_network(self.model, (X,), y, epochs=epochs, lr=lr, batch_size=batch_size)
+        self.model.eval()
+        self.optimize_for_inference(self.inference_mode)
+
+        self.seed_values = series[-self.sequence_length:]
+        self.last_date = points.last_date
+
+        with torch.no_grad():
+            predicted = (self.model(X)[:, 0].cpu().numpy() - self.scaler.min_[0]) / self.scaler.scale_[0]
+        logger.info(f"Fine-tuned LSTM for {self.metric_name} on {new_samples} new points")
+        return {
+            **summary,
+            'epochs': fit_stats['epochs'],
+            'scaler_refit': scaler_refit,
+            'mae': float(np.mean(np.abs(predicted - values)[points.observed]))
+        }
+
+    def forecast(
+        self,
+        days: int = 30,
+        historical_data: Optional[HistoricalData] = None,
+        confidence_level: float = 0.95
+    ) -> ForecastResult:
         """
         Generate forecast for specified number of days
 
         Args:
             days: Number of days to forecast
             historical_data: Recent historical data to seed predictions
+                (defaults to the tail of the training data)
+            confidence_level: Recorded on the result; LSTM bounds are a fixed ±10%
 
         Returns:
-            Forecast data with predictions
+            Columnar forecast with predictions
         """
         if self.model is None:
             raise ValueError("Model must be trained before forecasting")
@@ -165,71 +481,128 @@ class LSTMForecaster:
         logger.info(f"Generating {days}-day LSTM forecast for {self.metric_name}")
 
         # Use last sequence_length values to start predictions
-        df = pd.DataFrame(historical_data)
-        values = df['value'].values[-self.sequence_length:].reshape(-1, 1)
-        scaled_values = self.scaler.transform(values)
-
-        # Generate predictions iteratively
-        self.model.eval()
-        predictions = []
-        current_sequence = scaled_values.flatten().tolist()
-
-        with torch.no_grad():
-            for i in range(days):
-                # Prepare input sequence
-                X = np.array(current_sequence[-self.sequence_length:]).reshape(1, self.sequence_length, 1)
-                X_tensor = torch.FloatTensor(X).to(self.device)
-
-                # Predict next value
-                pred = self.model(X_tensor).cpu().numpy()[0, 0]
-
-                # Add to sequence for next prediction
-                current_sequence.append(pred)
-                predictions.append(pred)
-
-        # Inverse transform predictions to original scale
-        predictions = np.array(predictions).reshape(-1, 1)
-        predictions_actual = self.scaler.inverse_transform(predictions)
+        if historical_data is not None:
+            series = PreparedSeries.of(historical_data)
+            values, last_date = series.values[-self.sequence_length:], series.last_date
+        else:
+            values, last_date = self.seed_values, self.last_date
+        scaled_seed = self.scaler.transform(values.reshape(-1, 1)).reshape(1, -1)
+
+        # MinMaxScaler.inverse_transform, applied directly to the 1D rollout
+        scaled_predictions = self.rollout_many(scaled_seed, days)[0].astype(np.float64)
+        predictions_actual = (scaled_predictions - self.scaler.min_[0]) / self.scaler.scale_[0]
+
+        # Calculate simple confidence intervals (±10%)
+        margin = predictions_actual * 0.10
+
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type='LSTM',
+            dates=last_date + 1 + np.arange(days),
+            forecast=predictions_actual,
+            lower_bound=predictions_actual - margin,
+            upper_bound=predictions_actual + margin,
+            confidence_level=confidence_level
+        )
+
+    def rollout_many(self, scaled_seeds: np.ndarray, days: int) -> np.ndarray:
+        """
+        Roll the network forward for many seed windows in one batch
 
-        # Format output
-        forecast_data = []
-        from datetime import datetime, timedelta
-        start_date = datetime.strptime(df.iloc[-1]['date'], '%Y-%m-%d')
+        Args:
+            scaled_seeds: (series, sequence_length) windows, already scaled
+            days: Number of days to forecast
 
-        for i, pred in enumerate(predictions_actual):
-            forecast_date = start_date + timedelta(days=i + 1)
+        Returns:
+            (series, days) scaled predictions
+        """
+        if self.model is None:
+            raise ValueError("Model must be trained before forecasting")
 
-            # Calculate simple confidence intervals (±10%)
-            pred_value = float(pred[0])
-            margin = pred_value * 0.10
+        seed = torch.as_tensor(scaled_seeds, dtype=torch.float32, device=self.device).unsqueeze(-1)
+        with torch.inference_mode():
+            if self.inference_model is not None:
+                predictions = self.inference_model(seed, days)
+            else:
+                self.model.eval()
+                predictions = self.model.rollout(seed, days)
+        return predictions.cpu().numpy()
 
-            forecast_data.append({
-                'date': forecast_date.strftime('%Y-%m-%d'),
-                'forecast': round(pred_value, 2),
-                'lower_bound': round(pred_value - margin, 2),
-                'upper_bound': round(pred_value + margin, 2)
-            })
+    def save(self, directory: str) -> None:
+        """
+        Save network weights, architecture and scaler state to lstm.pt
 
-        return {
-            'metric': self.metric_name,
-            'horizon_days': days,
-            'predictions': forecast_data,
-            'trend': self._detect_trend(predictions_actual),
-            'model': 'LSTM'
-        }
+        Args:
+            directory: Existing directory to write into
+        """
+        if self.model is None:
+            raise ValueError("Model must be trained before saving")
+
+        torch.save({
+            'state_dict': self.model.state_dict(),
+            'config': {
+                'metric_name': self.metric_name,
+                'sequence_length': self.sequence_length,
+                'hidden_size': self.hidden_size,
+                'num_layers': self.num_layers,
+                'seed_values': self.seed_values.tolist(),
+                'last_date': str(self.last_date),
+                'inference_mode': self.inference_mode
+            },
+            'scaler': {
+                'feature_range': list(self.scaler.feature_range),
+                'n_features_in_': int(self.scaler.n_features_in_),
+                'n_samples_seen_': int(self.scaler.n_samples_seen_),
+                **{attr: getattr(self.scaler, attr).tolist() for attr in SCALER_ARRAY_ATTRS}
+            }
+        }, os.path.join(directory, 'lstm.pt'))
+
+    @classmethod
+    def load(cls, directory: str) -> 'LSTMForecaster':
+        """
+        Restore a trained model saved with save()
 
-    def _detect_trend(self, predictions: np.ndarray) -> str:
-        """Detect overall trend direction"""
-        first_value = predictions[0, 0]
-        last_value = predictions[-1, 0]
-        change_pct = ((last_value - first_value) / first_value) * 100
+        Args:
+            directory: Directory containing lstm.pt
 
-        if change_pct > 5:
-            return 'increasing'
-        elif change_pct < -5:
-            return 'decreasing'
-        else:
-            return 'stable'
+        Returns:
+            Trained LSTMForecaster
+        """
+        payload = torch.load(os.path.join(directory, 'lstm.pt'), map_location='cpu', weights_only=True)
+        config = payload['config']
+
+        forecaster = cls(
+            sequence_length=config['sequence_length'],
+            hidden_size=config['hidden_size'],
+            num_layers=config['num_layers']
+        )
+        forecaster.metric_name = config['metric_name']
+        forecaster.seed_values = np.array(config['seed_values'], dtype=np.float64)
+        forecaster.last_date = np.datetime64(config['last_date'], 'D')
+
+        scaler_state = payload['scaler']
+        forecaster.scaler = MinMaxScaler(feature_range=tuple(scaler_state['feature_range']))
+        forecaster.scaler.n_features_in_ = scaler_state['n_features_in_']
+        forecaster.scaler.n_samples_seen_ = scaler_state['n_samples_seen_']
+        for attr in SCALER_ARRAY_ATTRS:
+            setattr(forecaster.scaler, attr, np.array(scaler_state[attr]))
+
+        forecaster.model = LSTMNetwork(
+            input_size=1,
+            hidden_size=forecaster.hidden_size,
+            num_layers=forecaster.num_layers,
+            output_size=1
+        )
+        forecaster.model.load_state_dict(payload['state_dict'])
+        forecaster.model.to(forecaster.device)
+        forecaster.model.eval()
+        mode = config.get('inference_mode', 'eager')
+        if mode not in INFERENCE_MODES:
+            # Models saved with the withdrawn 'int8' backend forecast with TorchScript fp32
+            logger.warning(f"Inference mode '{mode}' is no longer supported, using 'script'")
+            mode = 'script'
+        forecaster.optimize_for_inference(mode)
+        return forecaster
 
 
 # Example usage and testing
@@ -254,9 +627,9 @@ if __name__ == "__main__":
     training_results = forecaster.train(sample_data, 'revenue', epochs=100)
     print("Training Results:", training_results)
 
-    forecast_results = forecaster.forecast(days=30, historical_data=sample_data)
+    forecast_results = forecaster.forecast(days=30)
     print("\nForecast Results:")
-    print(f"Trend: {forecast_results['trend']}")
+    print(f"Trend: {forecast_results.trend}")
     print(f"First 5 predictions:")
-    for pred in forecast_results['predictions'][:5]:
+    for pred in forecast_results.to_records()[:5]:
         print(f"  {pred['date']}: ${pred['forecast']:,.2f} (${pred['lower_bound']:,.2f} - ${pred['upper_bound']:,.2f})")
@@ -0,0 +1,226 @@
+"""
+Versioned on-disk store for trained forecasters
+Lets trained models survive restarts instead of retraining every tenant
+"""
+import importlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older versions are ignored on load
+STORE_FORMAT_VERSION = 2
+
+# Forecaster class name -> module inside the models package
+FORECASTER_MODULES = {
+    'StatisticalForecaster': 'statistical_forecaster',
+    'LSTMForecaster': 'lstm_forecaster',
+    'GlobalLSTMForecaster': 'global_lstm_forecaster',
+    'ProphetForecaster': 'prophet_forecaster',
+}
+
+# Both EnsembleForecaster classes share a name, so they are keyed by module
+ENSEMBLE_KINDS = {
+    'statistical_forecaster': 'statistical_ensemble',
+    'prophet_forecaster': 'prophet_ensemble',
+}
+ENSEMBLE_MODULES = {kind: module for module, kind in ENSEMBLE_KINDS.items()}
+
+_SAFE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _forecaster_kind(forecaster: Any) -> str:
+    """Stable name identifying how to load a forecaster"""
+    cls = type(forecaster)
+    if cls.__name__ == 'EnsembleForecaster':
+        return ENSEMBLE_KINDS[cls.__module__.split('.')[-1]]
+    if cls.__name__ not in FORECASTER_MODULES:
+        raise ValueError(f"Don't know how to store {cls.__name__}")
+    return cls.__name__
+
+
+def _forecaster_class(kind: str) -> Any:
+    """Import the class for a stored kind on demand (keeps torch/Prophet lazy)"""
+    if kind in ENSEMBLE_MODULES:
+        module = importlib.import_module(f'.{ENSEMBLE_MODULES[kind]}', __package__)
+        return module.EnsembleForecaster
+    module = importlib.import_module(f'.{FORECASTER_MODULES[kind]}', __package__)
+    return getattr(module, kind)
+
+
+class ModelStore:
+    """
+    Filesystem store: {root}/{tenant_id}/{metric}/{family}/v{N}/
+
+    Each version directory holds the forecaster's own files (statistical.json,
+    lstm.pt, prophet.json; ensembles write ensemble.json and one subdirectory
+    per member) plus a manifest.json recording the
+    data watermark the model was trained on. A LATEST file points at the
+    current version; older versions beyond keep_versions are pruned.
+    """
+
+    def __init__(self, root: str, keep_versions: int = 3):
+        self.root = root
+        self.keep_versions = keep_versions
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['ModelStore']:
+        """Build a store from FORECAST_MODEL_STORE_DIR, or None when unset"""
+        root = os.getenv('FORECAST_MODEL_STORE_DIR')
+        if not root:
+            return None
+        return cls(root, keep_versions=int(os.getenv('FORECAST_MODEL_STORE_KEEP', 3)))
+
+    def _path(self, *names: str) -> str:
+        for name in names:
+            if not _SAFE_NAME.match(name):
+                raise ValueError(f"Invalid name for model store path: {name!r}")
+        return os.path.join(self.root, *names)
+
+    def _series_dir(self, tenant_id: str, metric: str, family: str) -> str:
+        return self._path(tenant_id, metric, family)
+
+    def _versions(self, series_dir: str) -> List[int]:
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(
+            int(name[1:]) for name in os.listdir(series_dir)
+            if name.startswith('v') and name[1:].isdigit()
+        )
+
+    def save(
+        self,
+        tenant_id: str,
+        metric: str,
+        family: str,
+        forecaster: Any,
+        data_watermark: str,
+        training_result: Optional[Dict[str, Any]] = None,
+        model_type: Optional[str] = None
+    ) -> int:
+        """
+        Persist a trained forecaster as a new version
+
+        The version is written to a temporary directory and renamed into
+        place, so readers never see a partially written model.
+
+        Args:
+            tenant_id: Tenant identifier
+            metric: Metric name
+            family: Model family ('statistical', 'ensemble', ...)
+            forecaster: Trained forecaster with a save(directory) method
+            data_watermark: Newest data date the model was trained on
+            training_result: Training metrics to return on load
+            model_type: Human-readable model type
+
+        Returns:
+            The new version number
+        """
+        series_dir = self._series_dir(tenant_id, metric, family)
+        os.makedirs(series_dir, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=series_dir)
+        try:
+            forecaster.save(staging)
+            manifest = {
+                'format_version': STORE_FORMAT_VERSION,
+                'kind': _forecaster_kind(forecaster),
+                'tenant_id': tenant_id,
+                'metric': metric,
+                'family': family,
+                'data_watermark': data_watermark,
+                'model_type': model_type,
+                'training_result': training_result,
+                'saved_at': datetime.now().isoformat()
+            }
+            with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, default=float)
+
+            versions = self._versions(series_dir)
+            version = (versions[-1] if versions else 0) + 1
+            os.rename(staging, os.path.join(series_dir, f'v{version}'))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        latest_tmp = os.path.join(series_dir, '.LATEST.tmp')
+        with open(latest_tmp, 'w') as f:
+            f.write(str(version))
+        os.replace(latest_tmp, os.path.join(series_dir, 'LATEST'))
+
+        for old in self._versions(series_dir)[:-self.keep_versions]:
+            shutil.rmtree(os.path.join(series_dir, f'v{old}'), ignore_errors=True)
+
+        logger.info(f"Saved {manifest['kind']} model v{version} for {tenant_id}/{metric}/{family}")
+        return version
+
+    def manifest(self, tenant_id: str, metric: str, family: str) -> Optional[Dict[str, Any]]:
+        """Manifest of the latest version, or None if nothing is stored"""
+        series_dir = self._series_dir(tenant_id, metric, family)
+        try:
+            with open(os.path.join(series_dir, 'LATEST')) as f:
+                version = int(f.read().strip())
+            with open(os.path.join(series_dir, f'v{version}', 'manifest.json')) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        manifest['version'] = version
+        return manifest
+
+    def load(
+        self,
+        tenant_id: str,
+        metric: str,
+        family: str,
+        data_watermark: Optional[str] = None
+    ) -> Optional[Tuple[Any, Dict[str, Any], str]]:
+        """
+        Load the latest stored model
+
+        Args:
+            tenant_id: Tenant identifier
+            metric: Metric name
+            family: Model family
+            data_watermark: Current data watermark; a model trained on an
+                older watermark is treated as stale and not returned
+
+        Returns:
+            Tuple of (forecaster, training metrics, model type), or None
+            when nothing usable is stored
+        """
+        manifest = self.manifest(tenant_id, metric, family)
+        if manifest is None:
+            return None
+
+        if manifest.get('format_version') != STORE_FORMAT_VERSION:
+            logger.info(f"Ignoring stored model for {tenant_id}/{metric}/{family}: old format")
+            return None
+
+        if data_watermark is not None and manifest['data_watermark'] != data_watermark:
+            logger.info(
+                f"Stored model for {tenant_id}/{metric}/{family} is stale "
+                f"(trained to {manifest['data_watermark']}, data now {data_watermark})"
+            )
+            return None
+
+        version_dir = os.path.join(self._series_dir(tenant_id, metric, family), f"v{manifest['version']}")
+        try:
+            forecaster = _forecaster_class(manifest['kind']).load(version_dir)
+        except Exception as e:
+            logger.error(f"Failed to load stored model from {version_dir}: {e}")
+            return None
+
+        logger.info(f"Loaded {manifest['kind']} model v{manifest['version']} for {tenant_id}/{metric}/{family}")
+        return forecaster, manifest.get('training_result') or {}, manifest.get('model_type') or manifest['kind']
+
+    def delete(self, tenant_id: str, metric: Optional[str] = None) -> None:
+        """Remove every stored model for a tenant, or for one of its metrics"""
+        path = self._path(tenant_id) if metric is None else self._path(tenant_id, metric)
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,186 @@
+"""
+Shared preprocessing for CogniTwin forecasters
+Reindexes a history onto a regular daily calendar and fills or flags gaps, so
+every forecaster consumes the same prepared arrays
+"""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+FILL_METHODS = ('linear', 'ffill')
+
+
+class PreparedSeries:
+    """
+    A daily series on a regular calendar
+
+    dates has one entry per day from the first to the last observation.
+    values holds the observations with missing days (and NaN/inf values)
+    filled; observed flags which days were really observed.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, observed: np.ndarray, fill: str = 'linear'):
+        self.dates = dates
+        self.values = values
+        self.observed = observed
+        self.fill = fill
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dates: np.ndarray,
+        values: np.ndarray,
+        fill: str = 'linear',
+        start: Optional[np.datetime64] = None
+    ) -> 'PreparedSeries':
+        """
+        Reindex observations onto a regular daily calendar
+
+        Args:
+            dates: datetime64[D] dates, in any order (the last of duplicates wins)
+            values: Observations aligned with dates
+            fill: 'linear' (interpolate between neighbours) or 'ffill' (carry the last value)
+            start: First calendar day (default: first observation); days
+                before the first observation are filled with it
+
+        Returns:
+            PreparedSeries
+        """
+        if fill not in FILL_METHODS:
+            raise ValueError(f"fill must be one of {FILL_METHODS}")
+
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        values = np.asarray(values, dtype=np.float64)
+        if len(dates) == 0:
+            return cls(dates, values, np.zeros(0, dtype=bool), fill)
+
+        order = np.argsort(dates, kind='stable')
+        dates, values = dates[order], values[order]
+        first = dates[0] if start is None else min(np.datetime64(start, 'D'), dates[0])
+        calendar = np.arange(first, dates[-1] + 1, dtype='datetime64[D]')
+
+        raw = np.full(len(calendar), np.nan)
+        raw[(dates - first).astype(np.int64)] = values
+        observed = np.isfinite(raw)
+        return cls(calendar, fill_gaps(raw, observed, fill), observed, fill)
+
+    @classmethod
+    def from_records(
+        cls,
+        historical_data: List[Dict],
+        fill: str = 'linear',
+        start: Optional[np.datetime64] = None
+    ) -> 'PreparedSeries':
+        """Prepare a list of {'date', 'value'} dicts (see from_arrays)"""
+        dates = np.array([point['date'] for point in historical_data], dtype='datetime64[D]')
+        values = np.fromiter((point['value'] for point in historical_data), dtype=np.float64, count=len(historical_data))
+        return cls.from_arrays(dates, values, fill, start)
+
+    @classmethod
+    def of(
+        cls,
+        historical_data: 'HistoricalData',
+        fill: str = 'linear',
+        start: Optional[np.datetime64] = None
+    ) -> 'PreparedSeries':
+        """
+        Prepared series for either input form
+
+        An already prepared series is returned as-is (no copy) unless it must
+        be extended back to start.
+        """
+        if isinstance(historical_data, PreparedSeries):
+            if start is None or len(historical_data) == 0 or historical_data.dates[0] <= np.datetime64(start, 'D'):
+                return historical_data
+            return cls.from_arrays(historical_data.dates, historical_data.observed_values, historical_data.fill, start)
+        return cls.from_records(historical_data, fill, start)
+
+    @classmethod
+    def continuation(
+        cls,
+        new_points: 'HistoricalData',
+        last_date: np.datetime64,
+        last_value: float
+    ) -> 'PreparedSeries':
+        """
+        Days after last_date of an already trained series
+
+        The calendar starts the day after last_date, and a gap between the
+        training data and the first new point is filled from last_value, as
+        if it had been part of one history.
+
+        Args:
+            new_points: New observations (records or a PreparedSeries)
+            last_date: Last day of the training data
+            last_value: Value observed on last_date
+
+        Returns:
+            PreparedSeries of the days after last_date (empty if none)
+        """
+        series = cls.of(new_points)
+        last_date = np.datetime64(last_date, 'D')
+        dates = np.concatenate([[last_date], series.dates])
+        values = np.concatenate([[last_value], series.observed_values])
+        return cls.from_arrays(dates, values, series.fill).after(last_date)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index: slice) -> 'PreparedSeries':
+        if not isinstance(index, slice):
+            raise TypeError("PreparedSeries only supports slicing")
+        return PreparedSeries(self.dates[index], self.values[index], self.observed[index], self.fill)
+
+    @property
+    def observed_values(self) -> np.ndarray:
+        """Values with filled days set to NaN"""
+        return np.where(self.observed, self.values, np.nan)
+
+    @property
+    def filled_days(self) -> int:
+        return int(len(self.observed) - np.count_nonzero(self.observed))
+
+    @property
+    def last_date(self) -> Optional[np.datetime64]:
+        return self.dates[-1] if len(self.dates) else None
+
+    def after(self, date: np.datetime64) -> 'PreparedSeries':
+        """Days strictly after date"""
+        return self[int(np.searchsorted(self.dates, np.datetime64(date, 'D'), side='right')):]
+
+    def to_records(self) -> List[Dict]:
+        """Observed days as {'date', 'value'} dicts"""
+        mask = self.observed
+        return [
+            {'date': date, 'value': value}
+            for date, value in zip(np.datetime_as_string(self.dates[mask]).tolist(), self.values[mask].tolist())
+        ]
+
+
+# Forecasters accept raw records or an already prepared series
+HistoricalData = Union[List[Dict], PreparedSeries]
+
+
+def fill_gaps(raw: np.ndarray, observed: np.ndarray, fill: str = 'linear') -> np.ndarray:
+    """
+    Fill the unobserved entries of a regular-calendar series
+
+    Args:
+        raw: Values on the calendar (anything where observed is False is replaced)
+        observed: Mask of real observations
+        fill: 'linear' or 'ffill'; leading gaps take the first observation
+
+    Returns:
+        Filled copy of raw (all NaN if nothing was observed)
+    """
+    if observed.all():
+        return raw.copy()
+    index = np.flatnonzero(observed)
+    if len(index) == 0:
+        return np.full(len(raw), np.nan)
+    if fill == 'linear':
+        return np.interp(np.arange(len(raw)), index, raw[index])
+
+    # Forward fill: position of the latest observation at or before each day
+    latest = np.maximum.accumulate(np.where(observed, np.arange(len(raw)), -1))
+    return raw[np.maximum(latest, index[0])]
@@ -0,0 +1,322 @@
+"""
+Prophet training farm for CogniTwin
+Long-lived worker processes with Prophet imported and the Stan backend warmed
+up, fitting batches of series across all cores
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from importlib.util import find_spec
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .forecast_result import ForecastResult
+from .preprocessing import HistoricalData, PreparedSeries
+
+logger = logging.getLogger(__name__)
+
+# What a fit sends back: the serialized model, a rendered forecast, or both
+OUTPUTS = ('model', 'forecast', 'both')
+
+# Days of synthetic history fitted once per worker to load the Stan model
+WARMUP_DAYS = 60
+
+
+class ProphetJob:
+    """One series to fit, with optional Prophet parameters and forecast horizon"""
+
+    def __init__(
+        self,
+        key: Hashable,
+        history: HistoricalData,
+        metric: str,
+        params: Optional[Dict[str, Any]] = None,
+        days: int = 30,
+        confidence_level: float = 0.95
+    ):
+        """
+        Args:
+            key: Caller's identifier for the series (e.g. (tenant_id, metric))
+            history: Records or a PreparedSeries
+            metric: Metric name
+            params: Prophet constructor arguments overriding DEFAULT_PARAMS
+            days: Forecast horizon (when a forecast is requested)
+            confidence_level: Recorded on the forecast
+        """
+        self.key = key
+        self.series = PreparedSeries.of(history)
+        self.metric = metric
+        self.params = params
+        self.days = days
+        self.confidence_level = confidence_level
+
+
+class ProphetFit:
+    """Outcome of one ProphetJob; error is set (and the rest None) when the fit failed"""
+
+    def __init__(
+        self,
+        key: Hashable,
+        model_json: Optional[str] = None,
+        training_result: Optional[Dict[str, Any]] = None,
+        forecast: Optional[ForecastResult] = None,
+        error: Optional[str] = None,
+        seconds: float = 0.0
+    ):
+        self.key = key
+        self.model_json = model_json
+        self.training_result = training_result
+        self.forecast = forecast
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def forecaster(self) -> Any:
+        """Rebuild the fitted ProphetForecaster (imports Prophet in this process)"""
+        if self.model_json is None:
+            raise ValueError(f"No model returned for {self.key}: {self.error or 'forecast-only fit'}")
+        from .prophet_forecaster import ProphetForecaster
+        return ProphetForecaster.from_json(self.model_json)
+
+
+def _warm_worker() -> None:
+    """
+    Process initializer: import Prophet and fit a tiny series once
+
+    Pays the Prophet import, Stan backend setup and first cmdstan launch
+    before the worker takes real jobs. cmdstanpy's per-fit INFO logging is
+    silenced.
+    """
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    from .prophet_forecaster import ProphetForecaster
+
+    dates = np.datetime64('2024-01-01') + np.arange(WARMUP_DAYS)
+    values = 100.0 + 10.0 * np.sin(np.arange(WARMUP_DAYS) * (2 * np.pi / 7))
+    try:
+        ProphetForecaster({'yearly_seasonality': False}).train(PreparedSeries.from_arrays(dates, values), 'warmup')
+    except Exception as e:
+        logger.warning(f"Prophet worker warm-up failed: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _fit_batch(jobs: List[Tuple], output: str) -> List[Tuple]:
+    """
+    Fit a batch of series inside a worker
+
+    Module-level so it can be pickled into the workers. A failing series is
+    reported in its own result and does not affect the rest of the batch.
+    """
+    from .prophet_forecaster import ProphetForecaster
+
+    results = []
+    for key, series, metric, params, days, confidence_level in jobs:
+        started = time.perf_counter()
+        try:
+            forecaster = ProphetForecaster.from_env(params)
+            training_result = forecaster.train(series, metric)
+            model_json = forecaster.to_json() if output in ('model', 'both') else None
+            forecast = forecaster.forecast(days, confidence_level) if output in ('forecast', 'both') else None
+            results.append((key, model_json, training_result, forecast, None, time.perf_counter() - started))
+        except Exception as e:
+            results.append((key, None, None, None, f"{type(e).__name__}: {e}", time.perf_counter() - started))
+    return results
+
+
+class ProphetFarm:
+    """
+    Pool of warm Prophet worker processes
+
+    Workers are spawned lazily (or by start()), each importing Prophet and
+    running a warm-up fit once. Jobs are sent in batches of batch_size so a
+    batch pays one round trip, and the batches spread over all workers. The
+    parent process never imports Prophet: it sends arrays and gets back JSON
+    models and columnar forecasts.
+
+    A batch that runs past its timeout, or whose worker dies (e.g. OOM
+    killed), fails its own jobs. The pool is then dropped, terminating hung
+    workers, and the next batch starts fresh workers.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = 8,
+        mp_context: str = 'spawn',
+        timeout: float = 600.0
+    ):
+        """
+        Args:
+            workers: Worker processes (default: one per CPU)
+            batch_size: Series per batch sent to a worker
+            mp_context: multiprocessing start method
+            timeout: Seconds a batch may run once a worker is free for it
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.mp_context = mp_context
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._counters = {
+            'batches': 0, 'fits': 0, 'failed_fits': 0, 'timed_out_batches': 0, 'broken_pools': 0, 'fit_seconds': 0.0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional['ProphetFarm']:
+        """Build a farm from FORECAST_PROPHET_* variables (None without Prophet or with FORECAST_PROPHET_WORKERS=0)"""
+        workers = int(os.getenv('FORECAST_PROPHET_WORKERS', os.cpu_count() or 1))
+        if workers < 1 or find_spec('prophet') is None:
+            return None
+        return cls(
+            workers=workers,
+            batch_size=int(os.getenv('FORECAST_PROPHET_BATCH', 8)),
+            mp_context=os.getenv('FORECAST_TRAIN_MP_CONTEXT', 'spawn'),
+            timeout=float(os.getenv('FORECAST_PROPHET_TIMEOUT', 600))
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.mp_context),
+                    initializer=_warm_worker
+                )
+            return self._pool
+
+    def start(self) -> None:
+        """Spawn and warm every worker now, rather than on the first batch"""
+        pool = self._get_pool()
+        pids = {future.result() for future in [pool.submit(_ping) for _ in range(self.workers)]}
+        logger.info(f"Prophet farm started with {len(pids)} warm workers")
+
+    def _discard(self, pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+        """Drop a broken or hung pool so the next batch spawns fresh workers"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        if terminate:
+            # A hung worker never picks up the shutdown request
+            for process in list((getattr(pool, '_processes', None) or {}).values()):
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, jobs: Sequence[ProphetJob], output: str) -> Tuple[ProcessPoolExecutor, List[Tuple[Future, List]]]:
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS}")
+        payload = [(job.key, job.series, job.metric, job.params, job.days, job.confidence_level) for job in jobs]
+        # Smaller batches when there are too few jobs to give every worker one
+        size = max(1, min(self.batch_size, -(-len(payload) // self.workers)))
+        batches = [payload[i:i + size] for i in range(0, len(payload), size)]
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                return pool, [(pool.submit(_fit_batch, batch, output), batch) for batch in batches]
+            except BrokenProcessPool:
+                # A worker died since the last batch: start over on a fresh pool once
+                self._discard(pool)
+                if attempt:
+                    raise
+
+    def _deadline(self, index: int) -> float:
+        """Seconds to wait for batch index: its timeout plus the rounds queued ahead of it"""
+        return self.timeout * (index // self.workers + 1)
+
+    def _failed(self, batch: List[Tuple], problem: str, error: Optional[BaseException] = None) -> Tuple[List[Tuple], str]:
+        """Failed results for every job of a batch, tagged 'timeout' or 'broken'"""
+        if problem == 'timeout':
+            message = f"TimeoutError: batch did not finish within {self.timeout:g} s"
+        else:
+            message = f"BrokenProcessPool: {error}"
+        return [(job[0], None, None, None, message, 0.0) for job in batch], problem
+
+    def _collect(self, pool: ProcessPoolExecutor, outcomes: List[Tuple[List[Tuple], Optional[str]]]) -> List[ProphetFit]:
+        problems = [problem for _, problem in outcomes if problem is not None]
+        fits = [ProphetFit(*result) for batch, _ in outcomes for result in batch]
+        with self._lock:
+            self._counters['batches'] += len(outcomes)
+            self._counters['fits'] += len(fits)
+            self._counters['failed_fits'] += sum(not fit.ok for fit in fits)
+            self._counters['fit_seconds'] += sum(fit.seconds for fit in fits)
+            self._counters['timed_out_batches'] += problems.count('timeout')
+            self._counters['broken_pools'] += 'broken' in problems
+        if problems:
+            logger.warning(f"Prophet farm batches failed ({', '.join(sorted(set(problems)))}), restarting workers")
+            self._discard(pool, terminate='timeout' in problems)
+        for fit in fits:
+            if not fit.ok:
+                logger.warning(f"Prophet fit failed for {fit.key}: {fit.error}")
+        return fits
+
+    def fit_many(self, jobs: Sequence[ProphetJob], output: str = 'model') -> List[ProphetFit]:
+        """
+        Fit many series across the workers and wait for all of them
+
+        Args:
+            jobs: Series to fit
+            output: 'model' (serialized model), 'forecast' or 'both'
+
+        Returns:
+            One ProphetFit per job, in job order (failed ones for batches that
+            timed out or lost their worker)
+        """
+        pool, submitted = self._submit(jobs, output)
+        started = time.monotonic()
+        outcomes = []
+        for index, (future, batch) in enumerate(submitted):
+            remaining = max(0.0, started + self._deadline(index) - time.monotonic())
+            try:
+                outcomes.append((future.result(timeout=remaining), None))
+            except FutureTimeout:
+                future.cancel()
+                outcomes.append(self._failed(batch, 'timeout'))
+            except BrokenProcessPool as e:
+                outcomes.append(self._failed(batch, 'broken', e))
+        return self._collect(pool, outcomes)
+
+    async def run(self, jobs: Sequence[ProphetJob], output: str = 'model') -> List[ProphetFit]:
+        """Async fit_many for use from the event loop"""
+        pool, submitted = self._submit(jobs, output)
+
+        async def wait(index: int, future: Future, batch: List[Tuple]) -> Tuple[List[Tuple], Optional[str]]:
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self._deadline(index)), None
+            except asyncio.TimeoutError:
+                return self._failed(batch, 'timeout')
+            except BrokenProcessPool as e:
+                return self._failed(batch, 'broken', e)
+
+        return self._collect(pool, list(await asyncio.gather(*(
+            wait(index, future, batch) for index, (future, batch) in enumerate(submitted)
+        ))))
+
+    def stats(self) -> Dict[str, Any]:
+        """Workers, batch size and fit counters"""
+        with self._lock:
+            fits = self._counters['fits']
+            return {
+                'workers': self.workers,
+                'batch_size': self.batch_size,
+                'started': self._pool is not None,
+                **{k: v for k, v in self._counters.items() if k != 'fit_seconds'},
+                'avg_fit_seconds': round(self._counters['fit_seconds'] / fits, 4) if fits else 0.0
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers (a later batch starts new ones)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
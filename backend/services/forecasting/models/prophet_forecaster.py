@@ -4,38 +4,97 @@ Runs revenue, customer, and other metric predictions
 """
 import pandas as pd
 import numpy as np
+import json
+import os
 from prophet import Prophet
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from prophet.serialize import model_to_json, model_from_json
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from .ensemble import EnsembleMember, WeightedEnsemble, lstm_member
+from .forecast_result import ForecastResult
+from .preprocessing import HistoricalData, PreparedSeries
+from .statistical_forecaster import Z_SCORES
+
 logger = logging.getLogger(__name__)
 
+# 'full' predicts over history + horizon like stock Prophet; 'fast' scores the
+# fit from its components and predicts only the horizon
+PREDICT_MODES = ('full', 'fast')
+
+# Fast-path forecast bounds: Prophet's posterior samples, or a closed form
+# from the in-sample residuals
+INTERVAL_METHODS = ('sampled', 'analytical')
+
+# Prophet constructor arguments used unless overridden per forecaster
+DEFAULT_PARAMS = {
+    'changepoint_prior_scale': 0.05,  # Flexibility of trend
+    'seasonality_prior_scale': 10.0,   # Flexibility of seasonality
+    'seasonality_mode': 'multiplicative',
+    'daily_seasonality': False,
+    'weekly_seasonality': True,
+    'yearly_seasonality': True,
+}
+
 class ProphetForecaster:
     """
     Prophet-based time series forecasting model
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        predict_mode: str = 'full',
+        intervals: str = 'sampled',
+        uncertainty_samples: int = 1000
+    ):
+        """
+        Args:
+            params: Prophet constructor arguments overriding DEFAULT_PARAMS
+            predict_mode: 'full' or 'fast' (see PREDICT_MODES)
+            intervals: Fast-path bounds, 'sampled' or 'analytical'
+            uncertainty_samples: Posterior draws for sampled bounds
+        """
+        if predict_mode not in PREDICT_MODES:
+            raise ValueError(f"predict_mode must be one of {PREDICT_MODES}")
+        if intervals not in INTERVAL_METHODS:
+            raise ValueError(f"intervals must be one of {INTERVAL_METHODS}")
         self.model = None
         self.metric_name = None
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.predict_mode = predict_mode
+        self.intervals = intervals
+        self.uncertainty_samples = uncertainty_samples
+        # Standard deviation of the in-sample residuals (fast path)
+        self.residual_std = None
+
+    @classmethod
+    def from_env(cls, params: Optional[Dict[str, Any]] = None) -> 'ProphetForecaster':
+        """A forecaster configured by FORECAST_PROPHET_PREDICT / _INTERVALS / _UNCERTAINTY_SAMPLES"""
+        return cls(
+            params,
+            predict_mode=os.getenv('FORECAST_PROPHET_PREDICT', 'full'),
+            intervals=os.getenv('FORECAST_PROPHET_INTERVALS', 'sampled'),
+            uncertainty_samples=int(os.getenv('FORECAST_PROPHET_UNCERTAINTY_SAMPLES', 1000))
+        )
 
-    def prepare_data(self, historical_data: List[Dict]) -> pd.DataFrame:
+    def prepare_data(self, historical_data: HistoricalData) -> pd.DataFrame:
         """
         Convert historical data to Prophet format (ds, y columns)
 
+        Prophet handles missing days itself, so only observed days are kept.
+
         Args:
-            historical_data: List of dicts with 'date' and 'value' keys
+            historical_data: List of dicts with 'date' and 'value' keys, or a PreparedSeries
 
         Returns:
             DataFrame with 'ds' (date) and 'y' (value) columns
         """
-        df = pd.DataFrame(historical_data)
-        df = df.rename(columns={'date': 'ds', 'value': 'y'})
-        df['ds'] = pd.to_datetime(df['ds'])
-        return df
+        series = PreparedSeries.of(historical_data)
+        observed = series.observed
+        return pd.DataFrame({'ds': pd.to_datetime(series.dates[observed]), 'y': series.values[observed]})
 
-    def train(self, historical_data: List[Dict], metric: str) -> Dict[str, Any]:
+    def train(self, historical_data: HistoricalData, metric: str) -> Dict[str, Any]:
         """
         Train Prophet model on historical data
 
@@ -51,14 +110,11 @@ class ProphetForecaster:
         self.metric_name = metric
         df = self.prepare_data(historical_data)
 
-        # Initialize Prophet with custom parameters
+        # Initialize Prophet with custom parameters; the fast path never
+        # samples unless it needs sampled bounds
+        sampled = self.predict_mode == 'full' or self.intervals == 'sampled'
         self.model = Prophet(
-            changepoint_prior_scale=0.05,  # Flexibility of trend
-            seasonality_prior_scale=10.0,   # Flexibility of seasonality
-            seasonality_mode='multiplicative',
-            daily_seasonality=False,
-            weekly_seasonality=True,
-            yearly_seasonality=True,
+            **{'uncertainty_samples': self.uncertainty_samples if sampled else 0, **self.params},
             stan_backend=None  # Fix for stan_backend AttributeError
         )
 
@@ -66,20 +122,30 @@ class ProphetForecaster:
         self.model.fit(df)
 
         # Calculate training metrics
-        forecast = self.model.predict(df)
-        mae = np.mean(np.abs(forecast['yhat'] - df['y']))
-        mape = np.mean(np.abs((df['y'] - forecast['yhat']) / df['y'])) * 100
+        if self.predict_mode == 'fast':
+            # Fitted values from the trend and seasonal components of the
+            # already prepared history, without predict()'s setup or sampling
+            history = self.model.history
+            actual = history['y'].to_numpy()
+            residuals = actual - self._point_forecast(history)
+            self.residual_std = float(np.std(residuals))
+        else:
+            actual = df['y'].to_numpy()
+            residuals = actual - self.model.predict(df)['yhat'].to_numpy()
+        mae = np.mean(np.abs(residuals))
+        mape = np.mean(np.abs(residuals / actual)) * 100
 
         return {
             'model_type': 'Prophet',
             'metric': metric,
+            'predict_mode': self.predict_mode,
             'training_samples': len(df),
             'mae': float(mae),
             'mape': float(mape),
             'accuracy': float(100 - mape)
         }
 
-    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> Dict[str, Any]:
+    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> ForecastResult:
         """
         Generate forecast for specified number of days
 
@@ -88,190 +154,176 @@ class ProphetForecaster:
             confidence_level: Confidence interval (0.80, 0.95, etc.)
 
         Returns:
-            Forecast data with predictions and confidence intervals
+            Columnar forecast with predictions and confidence intervals
         """
         if self.model is None:
             raise ValueError("Model must be trained before forecasting")
 
         logger.info(f"Generating {days}-day forecast for {self.metric_name}")
 
-        # Create future dataframe
-        future = self.model.make_future_dataframe(periods=days)
+        if self.predict_mode == 'fast':
+            return self._fast_forecast(days, confidence_level)
 
-        # Generate forecast
-        forecast = self.model.predict(future)
+        # History + horizon, as Prophet.predict(make_future_dataframe()) scores it
+        df = self.model.setup_dataframe(self.model.make_future_dataframe(periods=days))
+        forecast = self._point_forecast(df)
+        lower, upper = self._sampled_bounds(df, confidence_level)
 
         # Extract forecast period (last 'days' rows)
-        forecast_period = forecast.tail(days)
-
-        # Format output
-        predictions = []
-        for _, row in forecast_period.iterrows():
-            predictions.append({
-                'date': row['ds'].strftime('%Y-%m-%d'),
-                'forecast': round(float(row['yhat']), 2),
-                'lower_bound': round(float(row['yhat_lower']), 2),
-                'upper_bound': round(float(row['yhat_upper']), 2),
-                'confidence': confidence_level
-            })
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type='Prophet',
+            dates=df['ds'].values.astype('datetime64[D]')[-days:],
+            forecast=forecast[-days:],
+            lower_bound=lower[-days:],
+            upper_bound=upper[-days:],
+            confidence_level=confidence_level
+        )
 
-        return {
-            'metric': self.metric_name,
-            'horizon_days': days,
-            'predictions': predictions,
-            'trend': self._detect_trend(forecast_period),
-            'confidence_level': confidence_level
-        }
+    def _point_forecast(self, df: pd.DataFrame) -> np.ndarray:
+        """yhat for a setup_dataframe() frame, as Prophet.predict computes it"""
+        trend = self.model.predict_trend(df)
+        seasonal = self.model.predict_seasonal_components(df)
+        return np.asarray(trend * (1 + seasonal['multiplicative_terms']) + seasonal['additive_terms'])
+
+    def _sampled_bounds(self, df: pd.DataFrame, confidence_level: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posterior predictive bounds for a setup_dataframe() frame
+
+        Prophet.predict_uncertainty reads the level from model.interval_width;
+        the fitted model may be shared by concurrent forecasts at different
+        levels, so the quantiles are taken here instead.
+        """
+        samples = self.model.sample_posterior_predictive(df, vectorized=True)['yhat']
+        tail = 100 * (1.0 - confidence_level) / 2
+        return self.model.percentile(samples, tail, axis=1), self.model.percentile(samples, 100 - tail, axis=1)
+
+    def _fast_forecast(self, days: int, confidence_level: float) -> ForecastResult:
+        """
+        Predict only the horizon rows
 
-    def _detect_trend(self, forecast_df: pd.DataFrame) -> str:
-        """Detect overall trend direction"""
-        first_value = forecast_df.iloc[0]['yhat']
-        last_value = forecast_df.iloc[-1]['yhat']
-        change_pct = ((last_value - first_value) / first_value) * 100
+        Sampled bounds come from Prophet's posterior draws at confidence_level.
+        Analytical bounds are yhat ± z * residual_std * sqrt(1 + h / n) for
+        h days ahead of n training days, widening as the horizon grows.
+        """
+        last_date = np.datetime64(self.model.history['ds'].iloc[-1], 'D')
+        dates = last_date + 1 + np.arange(days)
+        df = self.model.setup_dataframe(pd.DataFrame({'ds': pd.to_datetime(dates)}))
+        forecast = self._point_forecast(df)
 
-        if change_pct > 5:
-            return 'increasing'
-        elif change_pct < -5:
-            return 'decreasing'
+        if self.intervals == 'sampled' and self.model.uncertainty_samples:
+            lower, upper = self._sampled_bounds(df, confidence_level)
         else:
-            return 'stable'
+            z = Z_SCORES.get(confidence_level, 1.96)
+            margin = z * (self.residual_std or 0.0) * np.sqrt(1 + np.arange(1, days + 1) / len(self.model.history))
+            lower, upper = forecast - margin, forecast + margin
+
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type='Prophet',
+            dates=dates,
+            forecast=forecast,
+            lower_bound=lower,
+            upper_bound=upper,
+            confidence_level=confidence_level
+        )
 
+    def save(self, directory: str) -> None:
+        """
+        Serialize the fitted Prophet model to prophet.json
 
-class EnsembleForecaster:
-    """
-    Combines multiple models (Prophet + LSTM) for better accuracy
-    """
+        Args:
+            directory: Existing directory to write into
+        """
+        with open(os.path.join(directory, 'prophet.json'), 'w') as f:
+            f.write(self.to_json())
 
-    def __init__(self, prophet_weight: float = 0.6, lstm_weight: float = 0.4):
-        self.prophet = ProphetForecaster()
-        self.prophet_weight = prophet_weight
-        self.lstm_weight = lstm_weight
-        self.lstm = None  # Lazy import to avoid circular dependency
-        self.historical_data = None
+    def to_json(self) -> str:
+        """Serialize the fitted model (and metric name) to a JSON string"""
+        if self.model is None:
+            raise ValueError("Model must be trained before saving")
+        return json.dumps({
+            'metric_name': self.metric_name,
+            'model': model_to_json(self.model),
+            'predict_mode': self.predict_mode,
+            'intervals': self.intervals,
+            'uncertainty_samples': self.uncertainty_samples,
+            'residual_std': self.residual_std
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'ProphetForecaster':
+        """Restore a fitted model serialized with to_json()"""
+        payload = json.loads(payload)
+        forecaster = cls(
+            predict_mode=payload.get('predict_mode', 'full'),
+            intervals=payload.get('intervals', 'sampled'),
+            uncertainty_samples=payload.get('uncertainty_samples', 1000)
+        )
+        forecaster.metric_name = payload['metric_name']
+        forecaster.model = model_from_json(payload['model'])
+        forecaster.residual_std = payload.get('residual_std')
+        return forecaster
 
-    def train(self, historical_data: List[Dict], metric: str, use_lstm: bool = True) -> Dict[str, Any]:
+    @classmethod
+    def load(cls, directory: str) -> 'ProphetForecaster':
         """
-        Train all models in ensemble
+        Restore a fitted model saved with save()
 
         Args:
-            historical_data: Historical time series data
-            metric: Name of the metric being forecasted
-            use_lstm: Whether to include LSTM model (requires PyTorch)
+            directory: Directory containing prophet.json
 
         Returns:
-            Training metrics for both models
+            Trained ProphetForecaster
         """
-        self.historical_data = historical_data
-
-        # Train Prophet model
-        prophet_metrics = self.prophet.train(historical_data, metric)
-
-        lstm_metrics = None
-        if use_lstm:
-            try:
-                # Lazy import LSTM to avoid dependency if not using it
-                from .lstm_forecaster import LSTMForecaster
-                self.lstm = LSTMForecaster(sequence_length=min(7, len(historical_data) // 2))
-                lstm_metrics = self.lstm.train(historical_data, metric, epochs=50)
-            except ImportError:
-                logger.warning("PyTorch not installed, skipping LSTM model. Using Prophet only.")
-                use_lstm = False
-            except Exception as e:
-                logger.error(f"LSTM training failed: {e}. Using Prophet only.")
-                use_lstm = False
+        with open(os.path.join(directory, 'prophet.json')) as f:
+            return cls.from_json(f.read())
 
-        return {
-            'model_type': 'Prophet + LSTM Ensemble' if use_lstm else 'Prophet',
-            'prophet_metrics': prophet_metrics,
-            'lstm_metrics': lstm_metrics,
-            'ensemble_weights': {
-                'prophet': self.prophet_weight if use_lstm else 1.0,
-                'lstm': self.lstm_weight if use_lstm else 0.0
-            }
-        }
 
-    def forecast(self, days: int = 30) -> Dict[str, Any]:
+def _new_prophet(historical_data: HistoricalData) -> ProphetForecaster:
+    return ProphetForecaster.from_env()
+
+
+class EnsembleForecaster(WeightedEnsemble):
+    """
+    Combines multiple models (Prophet + LSTM) for better accuracy
+    """
+
+    def __init__(
+        self,
+        prophet_weight: float = 0.6,
+        lstm_weight: float = 0.4,
+        weighting: str = 'fixed',
+        global_lstm_path: Optional[str] = None,
+        lstm_inference: str = 'eager'
+    ):
+        super().__init__([
+            EnsembleMember('prophet', 'Prophet', _new_prophet, ProphetForecaster.load,
+                           weight=prophet_weight, required=True),
+            lstm_member(lstm_weight, global_lstm_path, lstm_inference),
+        ], weighting=weighting)
+
+    @property
+    def prophet(self) -> Optional[ProphetForecaster]:
+        return self.models.get('prophet')
+
+    @property
+    def lstm(self) -> Any:
+        return self.models.get('lstm')
+
+    def train(self, historical_data: HistoricalData, metric: str, use_lstm: bool = True) -> Dict[str, Any]:
         """
-        Generate ensemble forecast (weighted average of Prophet and LSTM)
+        Train all models in ensemble
 
         Args:
-            days: Number of days to forecast
+            historical_data: Historical time series data
+            metric: Name of the metric being forecasted
+            use_lstm: Whether to include LSTM model (requires PyTorch)
 
         Returns:
-            Combined forecast from both models
+            Training metrics for both models
         """
-        # Get Prophet forecast
-        prophet_forecast = self.prophet.forecast(days)
-
-        # If no LSTM model, return Prophet forecast only
-        if self.lstm is None:
-            return prophet_forecast
-
-        try:
-            # Get LSTM forecast
-            lstm_forecast = self.lstm.forecast(days, historical_data=self.historical_data)
-
-            # Combine forecasts using weighted average
-            combined_predictions = []
-            for i in range(days):
-                p_pred = prophet_forecast['predictions'][i]
-                l_pred = lstm_forecast['predictions'][i]
-
-                # Weighted average
-                combined_value = (
-                    p_pred['forecast'] * self.prophet_weight +
-                    l_pred['forecast'] * self.lstm_weight
-                )
-
-                # Combine confidence intervals
-                combined_lower = (
-                    p_pred['lower_bound'] * self.prophet_weight +
-                    l_pred['lower_bound'] * self.lstm_weight
-                )
-
-                combined_upper = (
-                    p_pred['upper_bound'] * self.prophet_weight +
-                    l_pred['upper_bound'] * self.lstm_weight
-                )
-
-                combined_predictions.append({
-                    'date': p_pred['date'],
-                    'forecast': round(combined_value, 2),
-                    'lower_bound': round(combined_lower, 2),
-                    'upper_bound': round(combined_upper, 2),
-                    'prophet_forecast': p_pred['forecast'],
-                    'lstm_forecast': l_pred['forecast'],
-                    'confidence': 0.95
-                })
-
-            # Detect trend from combined forecast
-            first_value = combined_predictions[0]['forecast']
-            last_value = combined_predictions[-1]['forecast']
-            change_pct = ((last_value - first_value) / first_value) * 100
-
-            if change_pct > 5:
-                trend = 'increasing'
-            elif change_pct < -5:
-                trend = 'decreasing'
-            else:
-                trend = 'stable'
-
-            return {
-                'metric': self.prophet.metric_name,
-                'horizon_days': days,
-                'predictions': combined_predictions,
-                'trend': trend,
-                'confidence_level': 0.95,
-                'model_type': 'Ensemble (Prophet + LSTM)',
-                'weights': {
-                    'prophet': self.prophet_weight,
-                    'lstm': self.lstm_weight
-                }
-            }
-
-        except Exception as e:
-            logger.error(f"LSTM forecast failed: {e}. Falling back to Prophet only.")
-            return prophet_forecast
+        return super().train(historical_data, metric, include=None if use_lstm else ['prophet'])
 
 
 # Example usage and testing
@@ -297,7 +349,7 @@ if __name__ == "__main__":
 
     forecast_results = forecaster.forecast(days=30)
     print("\nForecast Results:")
-    print(f"Trend: {forecast_results['trend']}")
+    print(f"Trend: {forecast_results.trend}")
     print(f"First 5 predictions:")
-    for pred in forecast_results['predictions'][:5]:
+    for pred in forecast_results.to_records()[:5]:
         print(f"  {pred['date']}: ${pred['forecast']:,.2f} (±${pred['upper_bound'] - pred['forecast']:,.2f})")
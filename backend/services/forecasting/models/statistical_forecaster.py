@@ -2,14 +2,39 @@
 Simple statistical forecasting model for CogniTwin
 Uses trend analysis and seasonality decomposition
 """
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import json
+import os
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from .ensemble import EnsembleMember, WeightedEnsemble, lstm_member
+from .forecast_result import ForecastResult
+from .preprocessing import HistoricalData, PreparedSeries
+
 logger = logging.getLogger(__name__)
 
+# z-scores for supported confidence levels
+Z_SCORES = {0.80: 1.28, 0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
+# Column layout of the parameter matrix returned by StatisticalForecaster.fit_many
+PARAM_COLUMNS = (
+    'trend_slope', 'trend_intercept', 'mean_value', 'std_value', 'n_obs',
+    'season_0', 'season_1', 'season_2', 'season_3', 'season_4', 'season_5', 'season_6'
+)
+SLOPE, INTERCEPT, MEAN, STD, N_OBS = range(5)
+SEASON = slice(5, 12)
+
+
+def day_of_week(dates: np.ndarray) -> np.ndarray:
+    """
+    Day of week (Monday=0) for a datetime64[D] array
+
+    1970-01-01 was a Thursday, so shift epoch days by 3 before taking mod 7.
+    """
+    return (dates.astype('int64') + 3) % 7
+
+
 class StatisticalForecaster:
     """
     Statistical time series forecasting using trend + seasonality decomposition
@@ -24,23 +49,231 @@ class StatisticalForecaster:
         self.mean_value = 0
         self.std_value = 0
         self.last_date = None
+        self.n_obs = 0
+        # Running sums behind the fit, so update() can add points in O(new points)
+        self.sums = None
+        # Trailing training window: its length in days and its observations,
+        # so update() can take points that slide out of it back out of the sums
+        self.window = None
+
+    def prepare_data(self, historical_data: HistoricalData) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert historical data to arrays on a regular daily calendar
+
+        Args:
+            historical_data: List of dicts with 'date' and 'value' keys, or a PreparedSeries
+
+        Returns:
+            Tuple of (datetime64[D] dates, float64 values), NaN on days
+            without an observation (the fit skips them rather than using fills)
+        """
+        series = PreparedSeries.of(historical_data)
+        return series.dates, series.observed_values
 
-    def prepare_data(self, historical_data: List[Dict]) -> pd.DataFrame:
+    @staticmethod
+    def fit_many(values: np.ndarray, dates: np.ndarray) -> np.ndarray:
         """
-        Convert historical data to DataFrame with date index
+        Fit trend + day-of-week seasonality for many series in one vectorized pass
+
+        All linear trends and seasonal indices are solved in closed form with
+        a handful of matrix products; NaN marks a missing observation.
+
+        Args:
+            values: (series, days) array of observations on a shared calendar
+            dates: (days,) sorted datetime64[D] calendar shared by all series
+
+        Returns:
+            (series, len(PARAM_COLUMNS)) parameter matrix
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        dates = np.asarray(dates, dtype='datetime64[D]')
+
+        observed = ~np.isnan(values)
+        mask = observed.astype(np.float64)
+        y = np.where(observed, values, 0.0)
+
+        # Time index is days since the start of the calendar
+        t = (dates - dates[0]).astype(np.float64)
+
+        count = mask.sum(axis=1)
+        sum_y = y.sum(axis=1)
+        sum_t = mask @ t
+        sum_tt = mask @ (t * t)
+        sum_ty = y @ t
+
+        # Ordinary least squares for y = intercept + slope * t, per row
+        denom = count * sum_tt - sum_t * sum_t
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(denom != 0, (count * sum_ty - sum_t * sum_y) / denom, 0.0)
+            intercept = (sum_y - slope * sum_t) / count
+            mean = sum_y / count
+            deviations = np.where(observed, values - mean[:, None], 0.0)
+            std = np.sqrt((deviations * deviations).sum(axis=1) / (count - 1))
+
+            # Seasonal index: weekday mean over overall mean (1.0 where unobserved)
+            weekday = np.eye(7)[day_of_week(dates)]
+            weekday_count = mask @ weekday
+            weekday_mean = (y @ weekday) / weekday_count
+            season = np.where(weekday_count > 0, weekday_mean / mean[:, None], 1.0)
+
+        params = np.empty((values.shape[0], len(PARAM_COLUMNS)))
+        params[:, SLOPE] = slope
+        params[:, INTERCEPT] = intercept
+        params[:, MEAN] = mean
+        params[:, STD] = std
+        params[:, N_OBS] = t[-1] + 1
+        params[:, SEASON] = season
+        return params
+
+    @staticmethod
+    def accumulate(dates: np.ndarray, values: np.ndarray, start_date: np.datetime64) -> Dict[str, Any]:
+        """
+        Sufficient statistics of one series for the trend and seasonal fit
 
         Args:
-            historical_data: List of dicts with 'date' and 'value' keys
+            dates: datetime64[D] dates of the observations
+            values: Observations (NaN = missing)
+            start_date: Origin of the trend's time index
 
         Returns:
-            DataFrame with date index and values
+            Dict of running sums (add two of these to combine their data)
         """
-        df = pd.DataFrame(historical_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date').sort_index()
-        return df
+        observed = ~np.isnan(values)
+        dates, y = dates[observed], values[observed]
+        t = (dates - np.datetime64(start_date, 'D')).astype(np.float64)
+        weekday = day_of_week(dates)
+        return {
+            'count': float(len(y)),
+            'sum_t': float(t.sum()),
+            'sum_tt': float(t @ t),
+            'sum_y': float(y.sum()),
+            'sum_ty': float(t @ y),
+            'sum_yy': float(y @ y),
+            'weekday_count': np.bincount(weekday, minlength=7).astype(np.float64),
+            'weekday_sum': np.bincount(weekday, weights=y, minlength=7)
+        }
+
+    @staticmethod
+    def shift_origin(sums: Dict[str, Any], start_date: np.datetime64) -> Dict[str, Any]:
+        """
+        Re-express running sums with the time index counted from start_date
 
-    def train(self, historical_data: List[Dict], metric: str) -> Dict[str, Any]:
+        Args:
+            sums: Running sums (with 'start_date') from accumulate()
+            start_date: New origin of the trend's time index
+
+        Returns:
+            Sums as accumulate() would return them for start_date
+        """
+        d = float((np.datetime64(start_date, 'D') - sums['start_date']).astype(np.int64))
+        count, sum_t, sum_y = sums['count'], sums['sum_t'], sums['sum_y']
+        return {
+            **sums,
+            'start_date': np.datetime64(start_date, 'D'),
+            'sum_t': sum_t - d * count,
+            'sum_tt': sums['sum_tt'] - 2 * d * sum_t + d * d * count,
+            'sum_ty': sums['sum_ty'] - d * sum_y
+        }
+
+    @staticmethod
+    def solve_sums(sums: Dict[str, Any], n_obs: int) -> np.ndarray:
+        """
+        Parameter row (PARAM_COLUMNS) from accumulated sums, matching fit_many
+
+        Args:
+            sums: Running sums from accumulate()
+            n_obs: Days from the time origin through the last training date
+
+        Returns:
+            Parameter row
+        """
+        count, sum_t, sum_y = sums['count'], sums['sum_t'], sums['sum_y']
+        denom = count * sums['sum_tt'] - sum_t * sum_t
+        slope = (count * sums['sum_ty'] - sum_t * sum_y) / denom if denom != 0 else 0.0
+        mean = sum_y / count
+
+        params = np.empty(len(PARAM_COLUMNS))
+        params[SLOPE] = slope
+        params[INTERCEPT] = (sum_y - slope * sum_t) / count
+        params[MEAN] = mean
+        params[STD] = np.sqrt(max(sums['sum_yy'] - sum_y * mean, 0.0) / (count - 1)) if count > 1 else np.nan
+        params[N_OBS] = n_obs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weekday_mean = sums['weekday_sum'] / sums['weekday_count']
+            params[SEASON] = np.where(sums['weekday_count'] > 0, weekday_mean / mean, 1.0)
+        return params
+
+    @staticmethod
+    def forecast_many(
+        params: np.ndarray,
+        last_date: np.datetime64,
+        days: int = 30,
+        confidence_level: float = 0.95
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Forecast every series of a parameter matrix at once
+
+        Args:
+            params: (series, len(PARAM_COLUMNS)) matrix from fit_many
+            last_date: Last date of the shared training calendar
+            days: Number of days to forecast
+            confidence_level: Confidence interval (0.80, 0.95, etc.)
+
+        Returns:
+            Tuple of (dates (days,), forecast, lower_bound, upper_bound),
+            the last three shaped (series, days)
+        """
+        params = np.atleast_2d(params)
+        z = Z_SCORES.get(confidence_level, 1.96)
+        steps = np.arange(days)
+        dates = np.datetime64(last_date, 'D') + 1 + steps
+
+        # Trend continues from the first day after the training window
+        t = params[:, N_OBS, None] + steps
+        trend_values = params[:, INTERCEPT, None] + params[:, SLOPE, None] * t
+        forecast_values = trend_values * params[:, SEASON][:, day_of_week(dates)]
+
+        # Uncertainty increases with forecast horizon
+        uncertainty = params[:, STD, None] * z * (1 + (steps / days) * 0.3)
+        return dates, forecast_values, forecast_values - uncertainty, forecast_values + uncertainty
+
+    def to_params(self) -> np.ndarray:
+        """This model's parameters as one row of a fit_many matrix"""
+        row = np.empty(len(PARAM_COLUMNS))
+        row[SLOPE] = self.trend_slope
+        row[INTERCEPT] = self.trend_intercept
+        row[MEAN] = self.mean_value
+        row[STD] = self.std_value
+        row[N_OBS] = self.n_obs
+        row[SEASON] = [self.seasonality.get(dow, 1.0) for dow in range(7)]
+        return row
+
+    def set_params(self, params: np.ndarray, metric: str, last_date: np.datetime64) -> None:
+        """
+        Load one row of a fit_many matrix into this forecaster
+
+        Args:
+            params: Parameter row
+            metric: Name of the metric
+            last_date: Last date of the training calendar
+        """
+        self.metric_name = metric
+        self.trend_slope = float(params[SLOPE])
+        self.trend_intercept = float(params[INTERCEPT])
+        self.mean_value = float(params[MEAN])
+        self.std_value = float(params[STD])
+        self.n_obs = int(params[N_OBS])
+        self.seasonality = {dow: float(mult) for dow, mult in enumerate(params[SEASON])}
+        self.last_date = np.datetime64(last_date, 'D')
+
+    @classmethod
+    def from_params(cls, params: np.ndarray, metric: str, last_date: np.datetime64) -> 'StatisticalForecaster':
+        """Build a trained forecaster from one row of a fit_many matrix"""
+        forecaster = cls()
+        forecaster.set_params(params, metric, last_date)
+        return forecaster
+
+    def train(self, historical_data: HistoricalData, metric: str) -> Dict[str, Any]:
         """
         Train statistical model on historical data
 
@@ -53,137 +286,227 @@ class StatisticalForecaster:
         """
         logger.info(f"Training Statistical model for {metric}")
 
-        self.metric_name = metric
-        df = self.prepare_data(historical_data)
-
-        # Calculate basic statistics
-        self.mean_value = df['value'].mean()
-        self.std_value = df['value'].std()
-        self.last_date = df.index[-1]
-
-        # Fit linear trend
-        days_elapsed = np.arange(len(df))
-        self.trend_slope, self.trend_intercept = np.polyfit(days_elapsed, df['value'].values, 1)
-
-        # Calculate day-of-week seasonality
-        df['dayofweek'] = df.index.dayofweek
-        weekly_avg = df.groupby('dayofweek')['value'].mean()
-        overall_mean = df['value'].mean()
-        self.seasonality = {dow: (val / overall_mean) for dow, val in weekly_avg.items()}
+        dates, values = self.prepare_data(historical_data)
+        params = self.fit_many(values[None, :], dates)[0]
+        self.set_params(params, metric, dates[-1])
+        self.sums = {'start_date': dates[0], **self.accumulate(dates, values, dates[0])}
+        observed = ~np.isnan(values)
+        self.window = {'days': len(dates), 'dates': dates[observed], 'values': values[observed]}
 
         # Calculate training accuracy
-        predictions = []
-        for i, (idx, row) in enumerate(df.iterrows()):
-            day_trend = self.trend_intercept + (self.trend_slope * i)
-            dow = idx.dayofweek
-            seasonal_mult = self.seasonality.get(dow, 1.0)
-            pred = day_trend * seasonal_mult
-            predictions.append(pred)
-
-        predictions = np.array(predictions)
-        actual = df['value'].values
-
-        mae = np.mean(np.abs(predictions - actual))
-        mape = np.mean(np.abs((actual - predictions) / actual)) * 100
+        t = (dates - dates[0]).astype(np.float64)
+        predictions = (self.trend_intercept + self.trend_slope * t) * params[SEASON][day_of_week(dates)]
+        mae = np.nanmean(np.abs(predictions - values))
+        mape = np.nanmean(np.abs((values - predictions) / values)) * 100
         accuracy = max(0, 100 - mape)
 
         return {
             'model_type': 'Statistical (Trend + Seasonality)',
             'metric': metric,
-            'training_samples': len(df),
+            'training_samples': int(np.count_nonzero(~np.isnan(values))),
+            'filled_days': int(np.count_nonzero(np.isnan(values))),
             'trend_slope': float(self.trend_slope),
             'mae': float(mae),
             'mape': float(mape),
             'accuracy': float(accuracy)
         }
 
-    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> Dict[str, Any]:
+    def update(self, new_points: HistoricalData) -> Dict[str, Any]:
         """
-        Generate forecast for specified number of days
+        Incrementally add observations newer than the training data
+
+        Adds the new points to the running OLS and weekday sums, takes the
+        points that slid out of the trailing window back out, and re-solves
+        the parameters in O(changed points). The fit covers the same number
+        of days as train() did, so it matches a full fit of the latest window.
+
+        Args:
+            new_points: List of dicts with 'date' and 'value' keys
+
+        Returns:
+            Update summary
+        """
+        if self.sums is None or self.window is None:
+            raise ValueError("Model has no running sums (train it before updating)")
+
+        dates, values = self.prepare_data(new_points)
+        fresh = dates > self.last_date
+        dates, values = dates[fresh], values[fresh]
+        if len(dates):
+            start_date = self.sums['start_date']
+            observed = ~np.isnan(values)
+            window_dates = np.concatenate([self.window['dates'], dates[observed]])
+            window_values = np.concatenate([self.window['values'], values[observed]])
+
+            # Window of the same length ending at the newest point
+            new_start = dates[-1] - (self.window['days'] - 1)
+            leaving = window_dates < new_start
+            added = self.accumulate(dates, values, start_date)
+            removed = self.accumulate(window_dates[leaving], window_values[leaving], start_date)
+            for key in added:
+                self.sums[key] = self.sums[key] + added[key] - removed[key]
+            self.sums = self.shift_origin(self.sums, new_start)
+            self.window['dates'], self.window['values'] = window_dates[~leaving], window_values[~leaving]
+            if self.sums['count'] < 2:
+                raise ValueError("Fewer than 2 observations left in the training window")
+
+            self.set_params(self.solve_sums(self.sums, self.window['days']), self.metric_name, dates[-1])
+
+        new_samples = int(np.count_nonzero(~np.isnan(values)))
+        logger.info(f"Updated Statistical model for {self.metric_name} with {new_samples} new points")
+        return {
+            'model_type': 'Statistical (Trend + Seasonality)',
+            'metric': self.metric_name,
+            'new_samples': new_samples,
+            'training_samples': int(self.sums['count']),
+            'trend_slope': float(self.trend_slope)
+        }
+
+    def forecast_arrays(self, days: int = 30, confidence_level: float = 0.95) -> Tuple[np.ndarray, ...]:
+        """
+        Compute a forecast as arrays, without building per-day objects
 
         Args:
             days: Number of days to forecast
             confidence_level: Confidence interval (0.80, 0.95, etc.)
 
         Returns:
-            Forecast data with predictions and confidence intervals
+            Tuple of (datetime64[D] dates, forecast, lower_bound, upper_bound)
         """
         if self.last_date is None:
             raise ValueError("Model must be trained before forecasting")
 
+        dates, forecast_values, lower, upper = self.forecast_many(
+            self.to_params(), self.last_date, days, confidence_level
+        )
+        return dates, forecast_values[0], lower[0], upper[0]
+
+    def forecast(self, days: int = 30, confidence_level: float = 0.95) -> ForecastResult:
+        """
+        Generate forecast for specified number of days
+
+        Args:
+            days: Number of days to forecast
+            confidence_level: Confidence interval (0.80, 0.95, etc.)
+
+        Returns:
+            Columnar forecast with predictions and confidence intervals
+        """
         logger.info(f"Generating {days}-day forecast for {self.metric_name}")
 
-        # Calculate z-score for confidence level
-        z_scores = {0.80: 1.28, 0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
-        z = z_scores.get(confidence_level, 1.96)
-
-        predictions = []
-        current_date = self.last_date + timedelta(days=1)
-        base_day = len(pd.date_range(start=self.last_date - timedelta(days=90), end=self.last_date))
-
-        for i in range(days):
-            forecast_date = current_date + timedelta(days=i)
-            day_num = base_day + i
-
-            # Trend component
-            trend_value = self.trend_intercept + (self.trend_slope * day_num)
-
-            # Seasonality component
-            dow = forecast_date.dayofweek
-            seasonal_mult = self.seasonality.get(dow, 1.0)
-
-            # Combine trend and seasonality
-            forecast_value = trend_value * seasonal_mult
-
-            # Calculate confidence intervals
-            # Uncertainty increases with forecast horizon
-            uncertainty = self.std_value * z * (1 + (i / days) * 0.3)
-            lower_bound = forecast_value - uncertainty
-            upper_bound = forecast_value + uncertainty
-
-            predictions.append({
-                'date': forecast_date.strftime('%Y-%m-%d'),
-                'forecast': round(float(forecast_value), 2),
-                'lower_bound': round(float(lower_bound), 2),
-                'upper_bound': round(float(upper_bound), 2),
-                'confidence': confidence_level
-            })
-
-        # Detect trend
-        first_value = predictions[0]['forecast']
-        last_value = predictions[-1]['forecast']
-        change_pct = ((last_value - first_value) / first_value) * 100
-
-        if change_pct > 5:
-            trend = 'increasing'
-        elif change_pct < -5:
-            trend = 'decreasing'
-        else:
-            trend = 'stable'
+        dates, forecast_values, lower, upper = self.forecast_arrays(days, confidence_level)
+        return ForecastResult(
+            metric=self.metric_name,
+            model_type='Statistical',
+            dates=dates,
+            forecast=forecast_values,
+            lower_bound=lower,
+            upper_bound=upper,
+            confidence_level=confidence_level
+        )
+
+    def save(self, directory: str) -> None:
+        """
+        Save fitted parameters to statistical.json in a directory
 
-        return {
-            'metric': self.metric_name,
-            'model_type': 'Statistical',
-            'horizon_days': days,
-            'predictions': predictions,
-            'trend': trend,
-            'confidence_level': confidence_level
+        Args:
+            directory: Existing directory to write into
+        """
+        if self.last_date is None:
+            raise ValueError("Model must be trained before saving")
+
+        params = {
+            'metric_name': self.metric_name,
+            'trend_slope': float(self.trend_slope),
+            'trend_intercept': float(self.trend_intercept),
+            'seasonality': {str(dow): float(mult) for dow, mult in self.seasonality.items()},
+            'mean_value': float(self.mean_value),
+            'std_value': float(self.std_value),
+            'last_date': str(self.last_date),
+            'n_obs': int(self.n_obs),
+            'sums': None if self.sums is None else {
+                key: str(value) if key == 'start_date' else np.asarray(value).tolist()
+                for key, value in self.sums.items()
+            },
+            'window': None if self.window is None else {
+                'days': int(self.window['days']),
+                'dates': np.datetime_as_string(self.window['dates']).tolist(),
+                'values': self.window['values'].tolist()
+            }
         }
+        with open(os.path.join(directory, 'statistical.json'), 'w') as f:
+            json.dump(params, f)
+
+    @classmethod
+    def load(cls, directory: str) -> 'StatisticalForecaster':
+        """
+        Restore a trained model saved with save()
+
+        Args:
+            directory: Directory containing statistical.json
+
+        Returns:
+            Trained StatisticalForecaster
+        """
+        with open(os.path.join(directory, 'statistical.json')) as f:
+            params = json.load(f)
+
+        forecaster = cls()
+        forecaster.metric_name = params['metric_name']
+        forecaster.trend_slope = params['trend_slope']
+        forecaster.trend_intercept = params['trend_intercept']
+        forecaster.seasonality = {int(dow): mult for dow, mult in params['seasonality'].items()}
+        forecaster.mean_value = params['mean_value']
+        forecaster.std_value = params['std_value']
+        forecaster.last_date = np.datetime64(params['last_date'], 'D')
+        forecaster.n_obs = params['n_obs']
+        if params.get('sums'):
+            forecaster.sums = {
+                key: np.datetime64(value, 'D') if key == 'start_date' else np.asarray(value, dtype=np.float64)
+                for key, value in params['sums'].items()
+            }
+        if params.get('window'):
+            # Older saves have no window and are retrained instead of updated
+            forecaster.window = {
+                'days': params['window']['days'],
+                'dates': np.array(params['window']['dates'], dtype='datetime64[D]'),
+                'values': np.array(params['window']['values'], dtype=np.float64)
+            }
+        return forecaster
 
 
-class EnsembleForecaster:
+def _new_statistical(historical_data: HistoricalData) -> StatisticalForecaster:
+    return StatisticalForecaster()
+
+
+class EnsembleForecaster(WeightedEnsemble):
     """
     Combines Statistical + LSTM for better accuracy
     """
 
-    def __init__(self, statistical_weight: float = 0.6, lstm_weight: float = 0.4):
-        self.statistical = StatisticalForecaster()
-        self.statistical_weight = statistical_weight
-        self.lstm_weight = lstm_weight
-        self.lstm = None
-        self.historical_data = None
-
-    def train(self, historical_data: List[Dict], metric: str, use_lstm: bool = True) -> Dict[str, Any]:
+    def __init__(
+        self,
+        statistical_weight: float = 0.6,
+        lstm_weight: float = 0.4,
+        weighting: str = 'fixed',
+        global_lstm_path: Optional[str] = None,
+        lstm_inference: str = 'eager'
+    ):
+        super().__init__([
+            EnsembleMember('statistical', 'Statistical', _new_statistical, StatisticalForecaster.load,
+                           weight=statistical_weight, required=True),
+            lstm_member(lstm_weight, global_lstm_path, lstm_inference),
+        ], weighting=weighting)
+
+    @property
+    def statistical(self) -> Optional[StatisticalForecaster]:
+        return self.models.get('statistical')
+
+    @property
+    def lstm(self) -> Any:
+        return self.models.get('lstm')
+
+    def train(self, historical_data: HistoricalData, metric: str, use_lstm: bool = True) -> Dict[str, Any]:
         """
         Train all models in ensemble
 
@@ -195,114 +518,4 @@ class EnsembleForecaster:
         Returns:
             Training metrics for both models
         """
-        self.historical_data = historical_data
-
-        # Train Statistical model
-        statistical_metrics = self.statistical.train(historical_data, metric)
-
-        lstm_metrics = None
-        if use_lstm:
-            try:
-                # Lazy import LSTM to avoid dependency if not using it
-                from .lstm_forecaster import LSTMForecaster
-                self.lstm = LSTMForecaster(sequence_length=min(7, len(historical_data) // 2))
-                lstm_metrics = self.lstm.train(historical_data, metric, epochs=50)
-            except ImportError:
-                logger.warning("PyTorch not installed, skipping LSTM model. Using Statistical only.")
-                use_lstm = False
-            except Exception as e:
-                logger.error(f"LSTM training failed: {e}. Using Statistical only.")
-                use_lstm = False
-
-        return {
-            'model_type': 'Statistical + LSTM Ensemble' if use_lstm else 'Statistical',
-            'statistical_metrics': statistical_metrics,
-            'lstm_metrics': lstm_metrics,
-            'ensemble_weights': {
-                'statistical': self.statistical_weight if use_lstm else 1.0,
-                'lstm': self.lstm_weight if use_lstm else 0.0
-            }
-        }
-
-    def forecast(self, days: int = 30) -> Dict[str, Any]:
-        """
-        Generate ensemble forecast (weighted average of Statistical and LSTM)
-
-        Args:
-            days: Number of days to forecast
-
-        Returns:
-            Combined forecast from both models
-        """
-        # Get Statistical forecast
-        statistical_forecast = self.statistical.forecast(days)
-
-        # If no LSTM model, return Statistical forecast only
-        if self.lstm is None:
-            return statistical_forecast
-
-        try:
-            # Get LSTM forecast
-            lstm_forecast = self.lstm.forecast(days, historical_data=self.historical_data)
-
-            # Combine forecasts using weighted average
-            combined_predictions = []
-            for i in range(days):
-                s_pred = statistical_forecast['predictions'][i]
-                l_pred = lstm_forecast['predictions'][i]
-
-                # Weighted average
-                combined_value = (
-                    s_pred['forecast'] * self.statistical_weight +
-                    l_pred['forecast'] * self.lstm_weight
-                )
-
-                # Combine confidence intervals
-                combined_lower = (
-                    s_pred['lower_bound'] * self.statistical_weight +
-                    l_pred['lower_bound'] * self.lstm_weight
-                )
-
-                combined_upper = (
-                    s_pred['upper_bound'] * self.statistical_weight +
-                    l_pred['upper_bound'] * self.lstm_weight
-                )
-
-                combined_predictions.append({
-                    'date': s_pred['date'],
-                    'forecast': round(combined_value, 2),
-                    'lower_bound': round(combined_lower, 2),
-                    'upper_bound': round(combined_upper, 2),
-                    'statistical_forecast': s_pred['forecast'],
-                    'lstm_forecast': l_pred['forecast'],
-                    'confidence': 0.95
-                })
-
-            # Detect trend
-            first_value = combined_predictions[0]['forecast']
-            last_value = combined_predictions[-1]['forecast']
-            change_pct = ((last_value - first_value) / first_value) * 100
-
-            if change_pct > 5:
-                trend = 'increasing'
-            elif change_pct < -5:
-                trend = 'decreasing'
-            else:
-                trend = 'stable'
-
-            return {
-                'metric': self.statistical.metric_name,
-                'model_type': 'Ensemble (Statistical + LSTM)',
-                'horizon_days': days,
-                'predictions': combined_predictions,
-                'trend': trend,
-                'confidence_level': 0.95,
-                'weights': {
-                    'statistical': self.statistical_weight,
-                    'lstm': self.lstm_weight
-                }
-            }
-
-        except Exception as e:
-            logger.error(f"LSTM forecast failed: {e}. Falling back to Statistical only.")
-            return statistical_forecast
+        return super().train(historical_data, metric, include=None if use_lstm else ['statistical'])
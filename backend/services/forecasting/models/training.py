@@ -0,0 +1,52 @@
+"""
+Training jobs run by the forecasting service's TrainingExecutor
+Kept out of main.py so process pool workers import only the models, not the app
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from . import LSTM_AVAILABLE
+from .preprocessing import HistoricalData
+from .statistical_forecaster import EnsembleForecaster, StatisticalForecaster
+
+logger = logging.getLogger(__name__)
+
+
+def train_forecaster(
+    historical_data: HistoricalData,
+    metric: str,
+    use_ensemble: bool,
+    weighting: str = 'fixed',
+    global_lstm_path: Optional[str] = None,
+    lstm_inference: str = 'eager'
+) -> Tuple[Any, Dict[str, Any], str]:
+    """
+    Build and train a forecaster
+
+    Args:
+        historical_data: Historical time series data (records or a PreparedSeries)
+        metric: Name of the metric being forecasted
+        use_ensemble: Whether to use ensemble (Statistical + LSTM)
+        weighting: Ensemble weighting method ('fixed', 'inverse_mse', 'stacked')
+        global_lstm_path: Shared global LSTM weights, instead of a per-series LSTM
+        lstm_inference: Per-series LSTM forecasting backend ('eager' or 'script')
+
+    Returns:
+        Tuple of (trained forecaster, training metrics, model type)
+    """
+    if use_ensemble and LSTM_AVAILABLE:
+        forecaster = EnsembleForecaster(
+            statistical_weight=0.6,
+            lstm_weight=0.4,
+            weighting=weighting,
+            global_lstm_path=global_lstm_path,
+            lstm_inference=lstm_inference
+        )
+        training_result = forecaster.train(historical_data, metric, use_lstm=LSTM_AVAILABLE)
+        return forecaster, training_result, training_result['model_type']
+
+    if use_ensemble and not LSTM_AVAILABLE:
+        logger.warning("LSTM not available, using Statistical model only")
+    forecaster = StatisticalForecaster()
+    training_result = forecaster.train(historical_data, metric)
+    return forecaster, training_result, "Statistical"
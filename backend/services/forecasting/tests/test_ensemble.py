@@ -0,0 +1,157 @@
+"""
+WeightedEnsemble: weight solving, backtest scoring on observed days, save/load round trips
+"""
+import functools
+
+import numpy as np
+import pytest
+
+from models.ensemble import MIN_OBSERVED_BACKTEST_DAYS, EnsembleMember, WeightedEnsemble, lstm_member
+from models.forecast_result import ForecastResult
+from models.preprocessing import PreparedSeries
+from models.statistical_forecaster import EnsembleForecaster, StatisticalForecaster, _new_statistical
+
+START = np.datetime64('2026-01-01', 'D')
+
+
+def history(days: int = 120):
+    rng = np.random.default_rng(3)
+    t = np.arange(days)
+    values = (500 + 2 * t) * (1 + 0.15 * (t % 7 == 0)) + rng.normal(0, 10, days)
+    return [{'date': str(START + day), 'value': float(value)} for day, value in enumerate(values)]
+
+
+def statistical_member(name: str, weight: float) -> EnsembleMember:
+    return EnsembleMember(name, name.title(), _new_statistical, StatisticalForecaster.load, weight=weight)
+
+
+class FixedPath:
+    """Member that forecasts a given path, whatever it was trained on"""
+
+    def __init__(self, path: np.ndarray, historical_data):
+        self.path = path
+
+    def train(self, historical_data, metric: str):
+        self.last_date = PreparedSeries.of(historical_data).dates[-1]
+        return {}
+
+    def forecast(self, days: int, confidence_level: float = 0.95) -> ForecastResult:
+        path = self.path[:days]
+        return ForecastResult('revenue', 'Fixed', self.last_date + 1 + np.arange(days), path, path, path)
+
+
+def gapped_series(missing):
+    """80 alternating days (100/110) without the missing days, linearly filled"""
+    records = [
+        {'date': str(START + day), 'value': 100.0 + 10 * (day % 2)}
+        for day in range(80) if day not in missing
+    ]
+    return PreparedSeries.from_records(records, fill='linear')
+
+
+def test_solve_weights_inverse_mse():
+    actual = np.zeros(4)
+    predictions = np.array([[1.0, -1.0, 1.0, -1.0], [2.0, -2.0, 2.0, -2.0]])  # MSE 1 and 4
+
+    weights = WeightedEnsemble.solve_weights(predictions, actual, 'inverse_mse')
+    np.testing.assert_allclose(weights, [0.8, 0.2])
+
+
+def test_solve_weights_stacked():
+    rng = np.random.default_rng(0)
+    predictions = rng.normal(100, 10, (2, 30))
+    actual = 0.3 * predictions[0] + 0.7 * predictions[1]
+
+    weights = WeightedEnsemble.solve_weights(predictions, actual, 'stacked')
+    np.testing.assert_allclose(weights, [0.3, 0.7], atol=1e-9)
+
+
+def test_solve_weights_stacked_clips_negative_members():
+    rng = np.random.default_rng(1)
+    predictions = rng.normal(100, 10, (2, 30))
+    actual = 1.2 * predictions[0] - 0.2 * predictions[1]
+
+    weights = WeightedEnsemble.solve_weights(predictions, actual, 'stacked')
+    assert weights[1] == 0.0
+    assert weights.sum() == pytest.approx(1.0)
+
+
+def test_weighted_ensemble_round_trip(tmp_path):
+    ensemble = WeightedEnsemble(
+        [statistical_member('first', 0.5), statistical_member('second', 0.5)],
+        weighting='inverse_mse', backtest_days=10
+    )
+    ensemble.train(history(), 'revenue')
+    ensemble.weights['second'] = 0.9  # distinguishable from the member defaults
+    ensemble.save(str(tmp_path))
+
+    restored = WeightedEnsemble.load(str(tmp_path))
+    assert type(restored) is WeightedEnsemble
+    assert restored.weighting == 'inverse_mse'
+    assert restored.backtest_days == 10
+    assert restored.weights == ensemble.weights
+    assert [m.name for m in restored.members] == ['first', 'second']
+    np.testing.assert_allclose(restored.forecast(14).forecast, ensemble.forecast(14).forecast)
+
+
+def test_subclass_round_trip_keeps_member_arguments(tmp_path):
+    ensemble = EnsembleForecaster(statistical_weight=0.7, lstm_weight=0.3, lstm_inference='script')
+    ensemble.train(history(), 'revenue', use_lstm=False)
+    ensemble.save(str(tmp_path))
+
+    restored = EnsembleForecaster.load(str(tmp_path))
+    assert type(restored) is EnsembleForecaster
+    assert list(restored.models) == ['statistical']
+    assert restored.weights == {'statistical': 0.7, 'lstm': 0.3}
+    assert restored.members[1].factory.args == ('script',)
+    np.testing.assert_allclose(restored.forecast(14).forecast, ensemble.forecast(14).forecast)
+
+
+def test_member_spec_round_trip():
+    member = lstm_member(0.4, global_weights_path='/models/global.pt')
+    restored = EnsembleMember.from_spec(member.to_spec())
+
+    assert restored.factory.func is member.factory.func
+    assert restored.factory.args == ('/models/global.pt',)
+    assert restored.loader is member.loader
+    assert (restored.name, restored.weight, restored.required) == ('lstm', 0.4, False)
+
+
+def test_member_spec_rejects_lambdas():
+    member = EnsembleMember('bad', 'Bad', lambda history: None, StatisticalForecaster.load)
+    with pytest.raises(ValueError):
+        member.to_spec()
+
+
+def test_backtest_scores_observed_holdout_days_only():
+    # Holdout is the last 14 days (66-79); 70-72 are gap-filled
+    series = gapped_series(missing=(70, 71, 72))
+    holdout_values, observed = series.values[-14:], series.observed[-14:]
+    assert not observed[4:7].any()
+
+    # 'truth' is exact on observed days and far off on filled ones; 'fill'
+    # tracks the gap fill exactly but is 5 off on every observed day
+    truth = np.where(observed, holdout_values, holdout_values + 50)
+    fill = np.where(observed, holdout_values + 5, holdout_values)
+    ensemble = WeightedEnsemble([
+        EnsembleMember('truth', 'Truth', functools.partial(FixedPath, truth), None),
+        EnsembleMember('fill', 'Fill', functools.partial(FixedPath, fill), None),
+    ], weighting='inverse_mse', backtest_days=14)
+
+    ensemble.train(series, 'revenue')
+    weights = ensemble.normalized_weights()
+    assert weights['truth'] > 0.99
+
+
+def test_backtest_keeps_weights_with_too_few_observed_days():
+    series = gapped_series(missing=range(68, 76))
+    assert np.count_nonzero(series.observed[-14:]) < MIN_OBSERVED_BACKTEST_DAYS
+
+    path = series.values[-14:]
+    ensemble = WeightedEnsemble([
+        EnsembleMember('a', 'A', functools.partial(FixedPath, path), None, weight=0.25),
+        EnsembleMember('b', 'B', functools.partial(FixedPath, path + 100), None, weight=0.75),
+    ], weighting='inverse_mse', backtest_days=14)
+
+    ensemble.train(series, 'revenue')
+    assert ensemble.weights == {'a': 0.25, 'b': 0.75}
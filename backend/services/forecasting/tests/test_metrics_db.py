@@ -0,0 +1,155 @@
+"""
+MetricsDatabase and ForecastTable against a real PostgreSQL
+
+Covers what a stub pool cannot: the binary COPY layout decode_frame parses,
+the watermark and tenant queries, and the forecasts upsert against the real
+schema and primary key. Skipped unless FORECAST_TEST_DATABASE_URL is set
+(see conftest.py).
+"""
+import asyncio
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+
+from models.forecast_result import ForecastResult
+from utils.forecast_table import ForecastTable
+from utils.metrics_db import FRAME_QUERY, MetricsDatabase, decode_frame, tenant_uuid
+
+START = date(2026, 1, 1)
+
+
+async def add_tenant(db: MetricsDatabase, rows, status: str = 'active') -> str:
+    """Insert a tenant and its daily_metrics rows of (day offset, revenue, orders, new, returning, aov)"""
+    async with (await db.pool()).acquire() as conn:
+        tenant_id = await conn.fetchval(
+            "INSERT INTO tenants (name, slug, status) VALUES ($1, $1, $2) RETURNING id::text",
+            f"tenant-{uuid.uuid4().hex[:8]}", status
+        )
+        await conn.executemany(
+            """
+            INSERT INTO daily_metrics
+                (tenant_id, date, revenue, order_count, new_customers, returning_customers, average_order_value)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            """,
+            [(tenant_uuid(tenant_id), START + timedelta(days=day), *values) for day, *values in rows]
+        )
+    return tenant_id
+
+
+def run(database_url: str, body) -> None:
+    """Run body(db) on a fresh pool"""
+    async def main():
+        db = MetricsDatabase(database_url)
+        try:
+            await body(db)
+        finally:
+            await db.close()
+    asyncio.run(main())
+
+
+# Days 3 and 6 missing, revenue NULL on day 5
+ROWS = [
+    (day, None if day == 5 else 1000.5 + day, 10 + day, 2, day, 99.25)
+    for day in range(10) if day not in (3, 6)
+]
+
+
+def test_fetch_tenant_frame_decodes_binary_copy(database_url):
+    async def body(db):
+        tenant_id = await add_tenant(db, ROWS)
+        metrics = ['revenue', 'orders', 'customers', 'average_order_value']
+        frame = await db.fetch_tenant_frame(tenant_id, metrics, START)
+
+        days = [day for day, *_ in ROWS]
+        assert frame.dates.tolist() == [START + timedelta(days=day) for day in days]
+        revenue = frame.columns['revenue']
+        assert np.isnan(revenue[days.index(5)])
+        np.testing.assert_array_equal(
+            np.delete(revenue, days.index(5)), [1000.5 + day for day in days if day != 5]
+        )
+        np.testing.assert_array_equal(frame.columns['orders'], [10 + day for day in days])
+        np.testing.assert_array_equal(frame.columns['customers'], [2 + day for day in days])
+        np.testing.assert_array_equal(frame.columns['average_order_value'], np.full(len(days), 99.25))
+
+        # since is inclusive
+        later = await db.fetch_tenant_frame(tenant_id, ['orders'], START + timedelta(days=4))
+        assert later.dates[0] == np.datetime64(START + timedelta(days=4))
+    run(database_url, body)
+
+
+def test_decode_frame_empty_copy(database_url):
+    async def body(db):
+        chunks = []
+
+        async def collect(chunk: bytes) -> None:
+            chunks.append(chunk)
+
+        async with (await db.pool()).acquire() as conn:
+            await conn.copy_from_query(
+                FRAME_QUERY.format(columns="revenue::float8, order_count::float8"), uuid.uuid4(), START,
+                output=collect, format='binary'
+            )
+        dates, values = decode_frame(b''.join(chunks), 2)
+        assert len(dates) == 0
+        assert values.shape == (2, 0)
+    run(database_url, body)
+
+
+def test_watermark_and_active_tenants(database_url):
+    async def body(db):
+        active = await add_tenant(db, ROWS)
+        suspended = await add_tenant(db, ROWS[:2], status='suspended')
+
+        assert await db.fetch_watermark(active) == (START + timedelta(days=9)).isoformat()
+        assert await db.fetch_watermark(suspended) == (START + timedelta(days=1)).isoformat()
+        assert await db.fetch_watermark(str(uuid.uuid4())) is None
+
+        tenants = await db.fetch_active_tenants()
+        assert active in tenants
+        assert suspended not in tenants
+    run(database_url, body)
+
+
+def forecast(values: np.ndarray, confidence_level: float) -> ForecastResult:
+    data_version = np.datetime64(START, 'D')
+    return ForecastResult(
+        'revenue', 'Statistical', data_version + 1 + np.arange(len(values)),
+        values, values - 10, values + 10, confidence_level
+    )
+
+
+def test_forecast_table_upsert(database_url):
+    async def body(db):
+        tenant_id = await add_tenant(db, ROWS[:1])
+        table = ForecastTable(db)
+        data_version = START.isoformat()
+        base = np.round(np.linspace(100, 130, 30), 2)
+
+        # Families and confidence levels are stored side by side
+        table.enqueue(tenant_id, 'ensemble', data_version, forecast(base, 0.95))
+        table.enqueue(tenant_id, 'statistical', data_version, forecast(base + 1, 0.95))
+        table.enqueue(tenant_id, 'ensemble', data_version, forecast(base + 2, 0.8))
+        assert await table.flush() == 90
+
+        # A newer forecast replaces only its own rows
+        table.enqueue(tenant_id, 'ensemble', data_version, forecast(base + 5, 0.95))
+        assert await table.flush() == 30
+
+        async with (await db.pool()).acquire() as conn:
+            count = await conn.fetchval("SELECT COUNT(*) FROM forecasts WHERE tenant_id = $1", tenant_uuid(tenant_id))
+        assert count == 90
+
+        ensemble = await table.fetch(tenant_id, 'revenue', 'ensemble', data_version, 30, 0.95)
+        statistical = await table.fetch(tenant_id, 'revenue', 'statistical', data_version, 7, 0.95)
+        lower_confidence = await table.fetch(tenant_id, 'revenue', 'ensemble', data_version, 30, 0.8)
+        np.testing.assert_allclose(ensemble.forecast, base + 5)
+        np.testing.assert_allclose(ensemble.upper_bound, base + 15)
+        np.testing.assert_allclose(statistical.forecast, (base + 1)[:7])
+        np.testing.assert_allclose(lower_confidence.forecast, base + 2)
+
+        # Misses: other data version, longer horizon, family never written
+        assert await table.fetch(tenant_id, 'revenue', 'ensemble', '2026-01-02', 30, 0.95) is None
+        assert await table.fetch(tenant_id, 'revenue', 'ensemble', data_version, 31, 0.95) is None
+        assert await table.fetch(tenant_id, 'revenue', 'prophet', data_version, 30, 0.95) is None
+    run(database_url, body)
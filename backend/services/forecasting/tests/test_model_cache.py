@@ -0,0 +1,118 @@
+"""
+ModelCache: LRU order, entry and byte budgets, TTL expiry, invalidation
+"""
+import numpy as np
+import pytest
+
+from utils import model_cache
+from utils.model_cache import ModelCache, estimate_size
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(model_cache.time, 'monotonic', clock)
+    return clock
+
+
+def test_evicts_least_recently_used_at_entry_limit():
+    cache = ModelCache(max_entries=2, max_bytes=1000, ttl_seconds=0)
+    cache.put(('t', 'a'), 'A', size=1)
+    cache.put(('t', 'b'), 'B', size=1)
+    assert cache.get(('t', 'a')) == 'A'  # b is now the oldest
+
+    cache.put(('t', 'c'), 'C', size=1)
+    assert ('t', 'b') not in cache
+    assert cache.get(('t', 'a')) == 'A'
+    assert cache.get(('t', 'c')) == 'C'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_evicts_until_bytes_fit():
+    cache = ModelCache(max_entries=10, max_bytes=100, ttl_seconds=0)
+    cache.put(('t', 'a'), 'A', size=40)
+    cache.put(('t', 'b'), 'B', size=40)
+    cache.put(('t', 'c'), 'C', size=70)
+
+    assert ('t', 'a') not in cache
+    assert ('t', 'b') not in cache
+    assert cache.stats()['bytes'] == 70
+    assert cache.stats()['evictions'] == 2
+
+
+def test_rejects_value_larger_than_budget():
+    cache = ModelCache(max_entries=10, max_bytes=100, ttl_seconds=0)
+    cache.put(('t', 'a'), 'A', size=40)
+
+    assert cache.put(('t', 'b'), 'B', size=101) is False
+    assert cache.get(('t', 'a')) == 'A'
+    assert cache.stats()['rejected'] == 1
+
+
+def test_replacing_a_key_releases_its_bytes():
+    cache = ModelCache(max_entries=10, max_bytes=100, ttl_seconds=0)
+    cache.put(('t', 'a'), 'A', size=60)
+    cache.put(('t', 'a'), 'A2', size=60)
+
+    assert len(cache) == 1
+    assert cache.stats()['bytes'] == 60
+    assert cache.get(('t', 'a')) == 'A2'
+
+
+def test_ttl_expiry(clock):
+    cache = ModelCache(ttl_seconds=60)
+    cache.put(('t', 'a'), 'A', size=1)
+
+    clock.now += 59
+    assert cache.get(('t', 'a')) == 'A'
+    assert cache.latest(('t',)) == (('t', 'a'), 'A')
+
+    clock.now += 2
+    assert cache.latest(('t',)) is None
+    assert cache.get(('t', 'a')) is None
+    assert ('t', 'a') not in cache
+    assert cache.stats()['expirations'] == 1
+
+
+def test_latest_returns_most_recently_used_match():
+    cache = ModelCache(ttl_seconds=0)
+    cache.put(('t', 'revenue', 'statistical', '2026-01-01'), 'old', size=1)
+    cache.put(('t', 'revenue', 'statistical', '2026-01-02'), 'new', size=1)
+    cache.put(('t', 'orders', 'statistical', '2026-01-02'), 'other', size=1)
+
+    key, value = cache.latest(('t', 'revenue', 'statistical'))
+    assert value == 'new'
+    assert cache.stats()['hits'] == 0
+
+
+def test_invalidate_by_tenant_metric_and_prefix():
+    cache = ModelCache(ttl_seconds=0)
+    for tenant in ('t1', 't2'):
+        for metric in ('revenue', 'orders'):
+            cache.put((tenant, metric, 'v1'), 'model', size=1)
+    cache.put(('t1', 'revenue', 'v2'), 'model', size=1)
+
+    assert cache.invalidate_prefix(('t1', 'revenue'), keep=('t1', 'revenue', 'v2')) == 1
+    assert cache.invalidate(metric='orders') == 2
+    assert cache.invalidate(tenant_id='t1') == 1
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+
+
+def test_estimate_size_counts_arrays_once():
+    values = np.zeros(1000)
+    single = estimate_size({'values': values})
+    shared = estimate_size({'values': values, 'alias': values})
+
+    assert single >= values.nbytes
+    assert shared - single < values.nbytes
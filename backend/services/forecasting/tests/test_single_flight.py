@@ -0,0 +1,92 @@
+"""
+SingleFlight: deduplication of concurrent calls, error propagation, release
+"""
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 'model'
+
+        waiters = [asyncio.ensure_future(flights.do('key', work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flights.in_flight('key')
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == ['model'] * 5
+        assert calls == 1
+        assert flights.stats() == {'in_flight': 0, 'executed': 1, 'shared': 4}
+    asyncio.run(main())
+
+
+def test_distinct_keys_run_separately():
+    async def main():
+        flights = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flights.do('a', lambda: work(1)), flights.do('b', lambda: work(2)))
+        assert results == [1, 2]
+        assert flights.stats()['executed'] == 2
+    asyncio.run(main())
+
+
+def test_error_reaches_every_waiter_and_releases_key():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise ValueError("training failed")
+
+        results = await asyncio.gather(
+            *(flights.do('key', failing) for _ in range(3)), return_exceptions=True
+        )
+        assert calls == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not flights.in_flight('key')
+
+        # The next call after a failure runs the work again
+        async def ok():
+            return 'retried'
+        assert await flights.do('key', ok) == 'retried'
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    async def main():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 'model'
+
+        first = asyncio.ensure_future(flights.do('key', work))
+        second = asyncio.ensure_future(flights.do('key', work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        assert await second == 'model'
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+StatisticalForecaster.update keeps the trailing window a full train() uses
+"""
+import numpy as np
+import pytest
+
+from models.statistical_forecaster import StatisticalForecaster
+
+START = np.datetime64('2026-01-01', 'D')
+WINDOW = 90
+
+
+def history(first: int, last: int, missing=(12, 47, 101)):
+    """Days first..last (inclusive) of a trending weekly series, without the missing days"""
+    rng = np.random.default_rng(7)
+    days = np.arange(200)
+    values = (1000 + 4 * days) * (1 + 0.2 * (days % 7 == 5)) + rng.normal(0, 25, len(days))
+    return [
+        {'date': str(START + day), 'value': float(values[day])}
+        for day in range(first, last + 1) if day not in missing
+    ]
+
+
+def assert_same_fit(updated: StatisticalForecaster, trained: StatisticalForecaster):
+    assert updated.last_date == trained.last_date
+    assert updated.n_obs == trained.n_obs
+    np.testing.assert_allclose(updated.to_params(), trained.to_params(), rtol=1e-9)
+    np.testing.assert_allclose(updated.forecast(30).forecast, trained.forecast(30).forecast, rtol=1e-9)
+
+
+def test_update_matches_train_on_the_same_window():
+    updated = StatisticalForecaster()
+    updated.train(history(0, WINDOW - 1), 'revenue')
+    updated.update(history(WINDOW, WINDOW + 29))
+
+    trained = StatisticalForecaster()
+    trained.train(history(30, WINDOW + 29), 'revenue')
+    assert_same_fit(updated, trained)
+
+
+def test_repeated_updates_do_not_widen_the_window():
+    updated = StatisticalForecaster()
+    updated.train(history(0, WINDOW - 1), 'revenue')
+    for first in range(WINDOW, WINDOW + 100, 10):
+        updated.update(history(first, first + 9))
+
+    trained = StatisticalForecaster()
+    trained.train(history(100, WINDOW + 99), 'revenue')
+    assert_same_fit(updated, trained)
+    assert updated.sums['count'] == len(history(100, WINDOW + 99))
+
+
+def test_update_survives_save_and_load(tmp_path):
+    model = StatisticalForecaster()
+    model.train(history(0, WINDOW - 1), 'revenue')
+    model.save(str(tmp_path))
+    restored = StatisticalForecaster.load(str(tmp_path))
+    restored.update(history(WINDOW, WINDOW + 29))
+
+    trained = StatisticalForecaster()
+    trained.train(history(30, WINDOW + 29), 'revenue')
+    assert_same_fit(restored, trained)
+
+
+def test_update_without_window_is_refused():
+    model = StatisticalForecaster()
+    model.train(history(0, WINDOW - 1), 'revenue')
+    model.window = None
+
+    with pytest.raises(ValueError):
+        model.update(history(WINDOW, WINDOW + 9))
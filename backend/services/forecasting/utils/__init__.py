@@ -4,11 +4,27 @@ CogniTwin Forecasting Utilities Package
 from .data_fetcher import (
     generate_historical_data,
     fetch_historical_data_from_db,
-    validate_historical_data
+    fetch_data_watermark,
+    validate_historical_data,
+    series_to_records,
+    fetch_tenant_frame
 )
+from .metrics_db import MetricsDatabase
+from .tenant_frame import TenantFrame, FrameScope
+from .validation import ValidationReport, validate_series, validate_many, validate_records
 
 __all__ = [
     'generate_historical_data',
     'fetch_historical_data_from_db',
-    'validate_historical_data'
+    'fetch_data_watermark',
+    'validate_historical_data',
+    'series_to_records',
+    'fetch_tenant_frame',
+    'MetricsDatabase',
+    'TenantFrame',
+    'FrameScope',
+    'ValidationReport',
+    'validate_series',
+    'validate_many',
+    'validate_records'
 ]
@@ -1,12 +1,19 @@
 """
 Data fetcher utility for historical metrics
-In production, this would connect to PostgreSQL/TimescaleDB
-For now, generates realistic mock historical data
+Reads the daily_metrics table through MetricsDatabase when DATABASE_URL is
+set (one query per tenant for all requested metrics), otherwise generates
+realistic mock historical data
 """
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional, Tuple
 import random
 
+import numpy as np
+
+from .metrics_db import METRIC_COLUMNS, MetricsDatabase
+from .tenant_frame import FrameScope, TenantFrame
+from .validation import ValidationReport, validate_records
+
 
 def generate_historical_data(metric: str, days_back: int = 90) -> List[Dict]:
     """
@@ -99,56 +106,129 @@ def generate_historical_data(metric: str, days_back: int = 90) -> List[Dict]:
     return historical_data
 
 
-def fetch_historical_data_from_db(tenant_id: str, metric: str, days_back: int = 90) -> List[Dict]:
+def series_to_records(dates: np.ndarray, values: np.ndarray) -> List[Dict]:
+    """
+    Convert date/value arrays to the list of {'date', 'value'} dicts that
+    the models' train() also accepts (for callers still passing records)
+
+    Args:
+        dates: datetime64[D] dates
+        values: float64 values
+
+    Returns:
+        List of dicts with 'date' (YYYY-MM-DD) and 'value' keys
+    """
+    return [
+        {'date': date, 'value': value}
+        for date, value in zip(np.datetime_as_string(dates, unit='D').tolist(), values.tolist())
+    ]
+
+
+async def fetch_tenant_frame(
+    tenant_id: str,
+    metrics: List[str],
+    since: date,
+    db: Optional[MetricsDatabase] = None
+) -> TenantFrame:
+    """
+    Fetch several metrics of a tenant in one round-trip, as a columnar frame
+
+    Without a database (DATABASE_URL unset), mock series ending yesterday
+    are generated on a shared calendar instead.
+
+    Args:
+        tenant_id: Tenant identifier
+        metrics: Metric names
+        since: First date to fetch (inclusive)
+        db: Metrics database pool, or None for mock data
+
+    Returns:
+        Columnar frame with one float64 column per metric
+    """
+    if db is not None:
+        return await db.fetch_tenant_frame(tenant_id, metrics, since)
+
+    days_back = max(0, (date.today() - since).days)
+    dates = np.arange(
+        np.datetime64(since, 'D'), np.datetime64(since, 'D') + days_back, dtype='datetime64[D]'
+    )
+    columns = {
+        metric: np.array([point['value'] for point in generate_historical_data(metric, days_back)], dtype=np.float64)
+        for metric in metrics
+    }
+    return TenantFrame(tenant_id, since, dates, columns)
+
+
+async def fetch_historical_data_from_db(
+    tenant_id: str,
+    metric: str,
+    days_back: int = 90,
+    db: Optional[MetricsDatabase] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Fetch historical data from database (PostgreSQL/TimescaleDB)
 
-    In production, this would execute SQL like:
-    SELECT date, value
-    FROM metrics
-    WHERE tenant_id = %s AND metric_name = %s AND date >= NOW() - INTERVAL '%s days'
-    ORDER BY date ASC
+    Inside a FrameScope the tenant's frame is shared with other metrics
+    fetched in the same request; metrics declared with FrameScope.want()
+    are loaded in the same query. Without a database (DATABASE_URL unset),
+    mock data is generated instead.
 
     Args:
         tenant_id: Tenant identifier
         metric: Metric name
         days_back: Number of days of history
+        db: Metrics database pool, or None for mock data
 
     Returns:
-        List of dicts with 'date' and 'value' keys
+        Tuple of (datetime64[D] dates, float64 values), without missing days
     """
-    # TODO: Implement actual database connection
-    # For now, return generated data
-    return generate_historical_data(metric, days_back)
+    since = date.today() - timedelta(days=days_back)
+    scope = FrameScope.current()
+    if scope is None:
+        frame = await fetch_tenant_frame(tenant_id, [metric], since, db)
+        return frame.series(metric)
+
+    async def load(metrics: List[str], load_since: date) -> TenantFrame:
+        # Declared metrics the database cannot serve fail on their own fetch, not this one
+        if db is not None:
+            metrics = [m for m in metrics if m == metric or m in METRIC_COLUMNS]
+        return await fetch_tenant_frame(tenant_id, metrics, load_since, db)
+
+    frame = await scope.frame(tenant_id, [metric], since, load)
+    return frame.series(metric, since)
 
 
-def validate_historical_data(data: List[Dict]) -> bool:
+async def fetch_data_watermark(tenant_id: str, metric: str, db: Optional[MetricsDatabase] = None) -> str:
     """
-    Validate historical data format
+    Return the latest date with data for a tenant's metric
+
+    Used as the data version in model cache keys: a trained model stays valid
+    until new data lands. All metrics of a tenant share daily_metrics rows,
+    so the watermark is per tenant.
 
     Args:
-        data: List of historical data points
+        tenant_id: Tenant identifier
+        metric: Metric name
+        db: Metrics database pool, or None for mock data
 
     Returns:
-        True if valid, False otherwise
+        ISO date (YYYY-MM-DD) of the newest data point ('' if there is none)
     """
-    if not data or len(data) < 7:  # Need at least a week of data
-        return False
-
-    required_keys = {'date', 'value'}
+    if db is None:
+        # Generated data always ends yesterday
+        return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    return await db.fetch_watermark(tenant_id) or ''
 
-    for item in data:
-        if not all(key in item for key in required_keys):
-            return False
 
-        # Validate date format
-        try:
-            datetime.strptime(item['date'], '%Y-%m-%d')
-        except ValueError:
-            return False
+def validate_historical_data(data: List[Dict], metric: Optional[str] = None) -> ValidationReport:
+    """
+    Validate historical data format
 
-        # Validate value is numeric
-        if not isinstance(item['value'], (int, float)):
-            return False
+    Args:
+        data: List of historical data points
+        metric: Metric name (enables the non-positive check for MAPE-sensitive metrics)
 
-    return True
+    Returns:
+        ValidationReport, truthy if the data can be used for training
+    """
+    return validate_records(data, metric)
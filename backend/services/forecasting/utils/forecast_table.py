@@ -0,0 +1,264 @@
+"""
+Write-back of generated forecasts to the forecasts table
+Forecasts are buffered across requests and tenants, bulk-loaded with binary
+COPY into a staging table and upserted in one statement per batch
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import date
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.forecast_result import ForecastResult
+from .metrics_db import MetricsDatabase, tenant_uuid
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = (
+    'tenant_id', 'series_type', 'forecast_date', 'horizon_days', 'predicted_value',
+    'lower_bound', 'upper_bound', 'confidence', 'model_family', 'model_type', 'model_version', 'metadata'
+)
+
+# Per-connection staging table; rows are cleared when each batch commits
+CREATE_STAGING = """
+    CREATE TEMP TABLE IF NOT EXISTS forecast_staging (
+        tenant_id UUID,
+        series_type VARCHAR(50),
+        forecast_date DATE,
+        horizon_days INT,
+        predicted_value FLOAT8,
+        lower_bound FLOAT8,
+        upper_bound FLOAT8,
+        confidence FLOAT8,
+        model_family VARCHAR(20),
+        model_type VARCHAR(50),
+        model_version VARCHAR(50),
+        metadata TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+UPSERT_FROM_STAGING = """
+    INSERT INTO forecasts (
+        tenant_id, series_type, forecast_date, horizon_days, predicted_value,
+        lower_bound, upper_bound, confidence, model_family, model_type, model_version, metadata, generated_at
+    )
+    SELECT
+        tenant_id, series_type, forecast_date, horizon_days, predicted_value,
+        lower_bound, upper_bound, confidence, model_family, model_type, model_version, metadata::jsonb,
+        CURRENT_TIMESTAMP
+    FROM forecast_staging
+    ON CONFLICT (tenant_id, series_type, model_family, confidence, forecast_date) DO UPDATE SET
+        horizon_days = EXCLUDED.horizon_days,
+        predicted_value = EXCLUDED.predicted_value,
+        lower_bound = EXCLUDED.lower_bound,
+        upper_bound = EXCLUDED.upper_bound,
+        model_type = EXCLUDED.model_type,
+        model_version = EXCLUDED.model_version,
+        metadata = EXCLUDED.metadata,
+        generated_at = EXCLUDED.generated_at
+"""
+
+STORED_FORECAST_QUERY = """
+    SELECT forecast_date, predicted_value::float8, lower_bound::float8, upper_bound::float8, model_type
+    FROM forecasts
+    WHERE tenant_id = $1 AND series_type = $2 AND model_family = $6
+      AND confidence = ROUND($4::float8::numeric, 4) AND forecast_date > $3
+      AND metadata->>'data_version' = $5
+    ORDER BY forecast_date
+    LIMIT $7
+"""
+
+
+class ForecastTable:
+    """
+    Persists rendered forecasts and serves unchanged ones back
+
+    enqueue() is synchronous and cheap. A background task flushes the buffer
+    every flush_interval seconds, or as soon as batch_rows rows are pending.
+    Rows are keyed by tenant, metric, model family, confidence level and
+    date, so families and confidence levels never overwrite each other. A
+    newer forecast with the same key replaces a pending one, so each batch
+    upserts every row at most once. Writes are best effort: a failed batch
+    is logged and dropped.
+    """
+
+    def __init__(self, db: MetricsDatabase, batch_rows: int = 10000, flush_interval: float = 1.0):
+        """
+        Args:
+            db: Metrics database whose pool is shared
+            batch_rows: Pending rows that trigger an immediate flush
+            flush_interval: Seconds between background flushes
+        """
+        self.db = db
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[uuid.UUID, str, str, float], Tuple[str, ForecastResult]] = {}
+        self._pending_rows = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._counters = {'batches': 0, 'rows_written': 0, 'failed_batches': 0, 'served': 0, 'misses': 0}
+
+    @classmethod
+    def from_env(cls, db: Optional[MetricsDatabase]) -> Optional['ForecastTable']:
+        """Build a writer on db, or None without a database (or FORECAST_WRITEBACK=0)"""
+        if db is None or os.getenv('FORECAST_WRITEBACK', '1') == '0':
+            return None
+        return cls(
+            db,
+            batch_rows=int(os.getenv('FORECAST_WRITEBACK_BATCH_ROWS', 10000)),
+            flush_interval=float(os.getenv('FORECAST_WRITEBACK_INTERVAL', 1.0))
+        )
+
+    def enqueue(self, tenant_id: str, model_family: str, data_version: str, result: ForecastResult) -> None:
+        """
+        Queue a rendered forecast for write-back
+
+        Args:
+            tenant_id: Tenant UUID
+            model_family: Family of the generating model ('statistical', 'ensemble', 'prophet')
+            data_version: Data watermark the model was trained on
+            result: Rendered forecast
+        """
+        # Confidence as stored (NUMERIC(5, 4)), so keys match table rows
+        key = (tenant_uuid(tenant_id), result.metric, model_family, round(float(result.confidence_level), 4))
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            self._pending_rows -= len(previous[1])
+        self._pending[key] = (data_version, result)
+        self._pending_rows += len(result)
+        if self._pending_rows >= self.batch_rows:
+            self._wakeup.set()
+
+    def _records(self) -> List[Tuple]:
+        """Drain the buffer into staging rows"""
+        pending, self._pending, self._pending_rows = self._pending, {}, 0
+        records = []
+        for (tenant, metric, family, confidence), (data_version, result) in pending.items():
+            n = len(result)
+            metadata = json.dumps({'data_version': data_version})
+            records.extend(zip(
+                repeat(tenant, n),
+                repeat(metric, n),
+                result.dates.astype(object).tolist(),
+                range(1, n + 1),
+                result.forecast.tolist(),
+                result.lower_bound.tolist(),
+                result.upper_bound.tolist(),
+                repeat(confidence, n),
+                repeat(family, n),
+                repeat(result.model_type[:50], n),
+                repeat(data_version, n),
+                repeat(metadata, n)
+            ))
+        return records
+
+    async def flush(self) -> int:
+        """
+        Write all pending forecasts in one COPY + upsert
+
+        Returns:
+            Number of rows written
+        """
+        if not self._pending:
+            return 0
+
+        records = self._records()
+        try:
+            async with (await self.db.pool()).acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(CREATE_STAGING)
+                    await conn.copy_records_to_table('forecast_staging', records=records, columns=STAGING_COLUMNS)
+                    await conn.execute(UPSERT_FROM_STAGING)
+        except Exception as e:
+            self._counters['failed_batches'] += 1
+            logger.warning(f"Forecast write-back of {len(records)} rows failed: {e}")
+            return 0
+
+        self._counters['batches'] += 1
+        self._counters['rows_written'] += len(records)
+        logger.info(f"Wrote back {len(records)} forecast rows")
+        return len(records)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task on the running loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background task and flush what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def fetch(
+        self,
+        tenant_id: str,
+        metric: str,
+        model_family: str,
+        data_version: str,
+        days: int,
+        confidence_level: float
+    ) -> Optional[ForecastResult]:
+        """
+        A stored forecast generated from the same data, model family and confidence
+
+        Args:
+            tenant_id: Tenant UUID
+            metric: Metric name
+            model_family: Model family the forecast must come from
+            data_version: Data watermark (ISO date) the forecast must be based on
+            days: Horizon needed; shorter stored forecasts are a miss
+            confidence_level: Confidence level needed
+
+        Returns:
+            Stored forecast (without member components), or None on a miss
+        """
+        if not data_version or days < 1:
+            return None
+
+        async with (await self.db.pool()).acquire() as conn:
+            rows = await conn.fetch(
+                STORED_FORECAST_QUERY, tenant_uuid(tenant_id), metric, date.fromisoformat(data_version),
+                confidence_level, data_version, model_family, days
+            )
+
+        dates = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        expected_start = np.datetime64(data_version, 'D') + 1
+        if len(rows) < days or dates[0] != expected_start or dates[-1] != expected_start + days - 1:
+            self._counters['misses'] += 1
+            return None
+
+        self._counters['served'] += 1
+        values = np.array([tuple(row[1:4]) for row in rows], dtype=np.float64)
+        return ForecastResult(
+            metric=metric,
+            model_type=rows[0][4],
+            dates=dates,
+            forecast=values[:, 0],
+            lower_bound=values[:, 1],
+            upper_bound=values[:, 2],
+            confidence_level=confidence_level
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending rows, batches written and stored forecasts served"""
+        return {'pending_forecasts': len(self._pending), 'pending_rows': self._pending_rows, **self._counters}
@@ -0,0 +1,55 @@
+"""
+Streaming JSON encoding for CogniTwin forecast responses
+Serializes columnar forecasts chunk by chunk, as NDJSON or as one JSON
+document, using orjson when it is installed
+"""
+import json
+from typing import Any, Dict, Iterator
+
+from models.forecast_result import ForecastResult
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response formats for ?stream=
+STREAM_FORMATS = ('ndjson', 'json')
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'json': 'application/json'}
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON bytes (orjson, or the standard library without it)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def stream_ndjson(header: Dict[str, Any], result: ForecastResult, chunk_days: int = 256) -> Iterator[bytes]:
+    """
+    Header object on the first line, then one ForecastPoint per line
+
+    Points carry the ForecastPoint fields (no ensemble components). Each
+    yielded block holds up to chunk_days lines.
+    """
+    yield dumps(header) + b'\n'
+    for records in result.iter_records(chunk_days, components=False):
+        yield b'\n'.join(dumps(record) for record in records) + b'\n'
+
+
+def stream_json(header: Dict[str, Any], result: ForecastResult, chunk_days: int = 256) -> Iterator[bytes]:
+    """
+    The header fields plus 'data': [points], as one JSON object
+
+    Produces the same document as the non-streaming response, written
+    chunk_days points at a time.
+    """
+    opening = dumps(header)
+    yield opening[:-1] + (b',"data":[' if len(opening) > 2 else b'"data":[')
+    separator = b''
+    for records in result.iter_records(chunk_days, components=False):
+        # Encode the chunk as an array and drop its brackets
+        yield separator + dumps(records)[1:-1]
+        separator = b','
+    yield b']}'
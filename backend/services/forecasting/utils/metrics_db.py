@@ -0,0 +1,214 @@
+"""
+Historical metrics from PostgreSQL/TimescaleDB (daily_metrics table)
+
+All requested metrics of a tenant are read in one binary COPY and decoded
+straight into NumPy columns: one fixed-width record per day, no per-row
+Python objects. asyncpg is imported on
+first use, so the service starts without it when DATABASE_URL is unset.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .tenant_frame import TenantFrame
+
+logger = logging.getLogger(__name__)
+
+# Forecastable metric -> SQL expression over daily_metrics columns
+METRIC_COLUMNS = {
+    'revenue': 'revenue',
+    'orders': 'order_count',
+    'order_count': 'order_count',
+    'customers': 'new_customers + returning_customers',
+    'new_customers': 'new_customers',
+    'returning_customers': 'returning_customers',
+    'average_order_value': 'average_order_value',
+    'units_sold': 'units_sold',
+    'refund_amount': 'refund_amount',
+}
+
+# Binary COPY framing: 11-byte signature, int32 flags, int32 extension length
+COPY_HEADER_SIZE = 19
+COPY_TRAILER = b'\xff\xff'
+POSTGRES_EPOCH = np.datetime64('2000-01-01', 'D')
+
+# Missing values are sent as NaN, so every row has the same fixed width
+FRAME_QUERY = """
+    SELECT date, {columns}
+    FROM daily_metrics
+    WHERE tenant_id = $1 AND date >= $2
+    ORDER BY date
+"""
+
+WATERMARK_QUERY = "SELECT MAX(date) FROM daily_metrics WHERE tenant_id = $1"
+
+ACTIVE_TENANTS_QUERY = "SELECT id::text FROM tenants WHERE status = 'active' ORDER BY id"
+
+
+def tenant_uuid(tenant_id: str) -> uuid.UUID:
+    """Parse a tenant id, raising ValueError for ids that are not UUIDs"""
+    try:
+        return uuid.UUID(str(tenant_id))
+    except ValueError:
+        raise ValueError(f"Invalid tenant id: {tenant_id!r}") from None
+
+
+def frame_row_dtype(n_columns: int) -> np.dtype:
+    """
+    One binary COPY row of (date, float8 x n_columns)
+
+    An int16 field count, then each field as an int32 length and its
+    big-endian value.
+    """
+    fields = [('fields', '>i2'), ('date_size', '>i4'), ('date', '>i4')]
+    for i in range(n_columns):
+        fields += [(f'size_{i}', '>i4'), (f'value_{i}', '>f8')]
+    return np.dtype(fields)
+
+
+def decode_frame(buffer: bytes, n_columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a binary COPY of (date, float8 x n_columns) rows into arrays
+
+    Args:
+        buffer: Complete COPY ... TO STDOUT (FORMAT binary) output
+        n_columns: Number of float8 columns after the date
+
+    Returns:
+        Tuple of (datetime64[D] dates, (n_columns, days) float64 values)
+    """
+    body = memoryview(buffer)[COPY_HEADER_SIZE:]
+    if bytes(body[-2:]) == COPY_TRAILER:
+        body = body[:-2]
+    rows = np.frombuffer(body, dtype=frame_row_dtype(n_columns))
+    if len(rows) and np.any(rows['fields'] != n_columns + 1):
+        raise ValueError("Unexpected row layout in binary COPY output")
+
+    dates = POSTGRES_EPOCH + rows['date'].astype('timedelta64[D]')
+    values = np.empty((n_columns, len(rows)), dtype=np.float64)
+    for i in range(n_columns):
+        values[i] = rows[f'value_{i}']
+    return dates, values
+
+
+class MetricsDatabase:
+    """
+    Connection pool over the daily_metrics table
+
+    The pool is created lazily on the running event loop. Its size is a share
+    of FORECAST_DB_MAX_CONNECTIONS across the server's worker processes
+    (WEB_CONCURRENCY), so scaling workers does not exhaust Postgres connections.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 5, command_timeout: float = 30.0):
+        """
+        Args:
+            dsn: PostgreSQL connection string
+            min_size: Connections opened up front
+            max_size: Maximum connections in this process
+            command_timeout: Per-query timeout in seconds
+        """
+        self.dsn = dsn
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['MetricsDatabase']:
+        """Build a pool from DATABASE_URL, or None when unset (mock data is used)"""
+        dsn = os.getenv('DATABASE_URL')
+        if not dsn:
+            return None
+        workers = max(1, int(os.getenv('WEB_CONCURRENCY', 1)))
+        max_connections = int(os.getenv('FORECAST_DB_MAX_CONNECTIONS', 20))
+        return cls(
+            dsn,
+            min_size=int(os.getenv('FORECAST_DB_POOL_MIN', 1)),
+            max_size=max(1, max_connections // workers),
+            command_timeout=float(os.getenv('FORECAST_DB_TIMEOUT', 30))
+        )
+
+    async def pool(self):
+        """The asyncpg pool, created on first use"""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    import asyncpg
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        command_timeout=self.command_timeout
+                    )
+                    logger.info(f"Opened metrics database pool ({self.min_size}-{self.max_size} connections)")
+        return self._pool
+
+    async def fetch_tenant_frame(self, tenant_id: str, metrics: List[str], since: date) -> TenantFrame:
+        """
+        Fetch several metrics of a tenant in one round-trip
+
+        Args:
+            tenant_id: Tenant UUID
+            metrics: Metric names (see METRIC_COLUMNS)
+            since: First date to fetch (inclusive)
+
+        Returns:
+            Columnar frame, NaN where a metric is NULL
+        """
+        unknown = [metric for metric in metrics if metric not in METRIC_COLUMNS]
+        if unknown:
+            raise ValueError(f"Metrics not stored in daily_metrics: {unknown}")
+
+        chunks = []
+
+        async def collect(chunk: bytes) -> None:
+            chunks.append(chunk)
+
+        columns = ', '.join(f"COALESCE(({METRIC_COLUMNS[metric]})::float8, 'NaN')" for metric in metrics)
+        async with (await self.pool()).acquire() as conn:
+            # asyncpg prepares the query to bind the arguments, then streams the COPY
+            await conn.copy_from_query(
+                FRAME_QUERY.format(columns=columns), tenant_uuid(tenant_id), since,
+                output=collect, format='binary'
+            )
+        dates, values = decode_frame(b''.join(chunks), len(metrics))
+        return TenantFrame(tenant_id, since, dates, dict(zip(metrics, values)))
+
+    async def fetch_watermark(self, tenant_id: str) -> Optional[str]:
+        """
+        Latest date with data for a tenant (all metrics share daily_metrics rows)
+
+        Args:
+            tenant_id: Tenant UUID
+
+        Returns:
+            ISO date (YYYY-MM-DD), or None if the tenant has no data
+        """
+        async with (await self.pool()).acquire() as conn:
+            # fetchval reuses the connection's prepared statement cache (prepare() would re-parse every call)
+            latest = await conn.fetchval(WATERMARK_QUERY, tenant_uuid(tenant_id))
+        return latest.isoformat() if latest is not None else None
+
+    async def fetch_active_tenants(self) -> List[str]:
+        """
+        Ids of all active tenants, in a stable order
+
+        Returns:
+            Tenant UUIDs as strings
+        """
+        async with (await self.pool()).acquire() as conn:
+            rows = await conn.fetch(ACTIVE_TENANTS_QUERY)
+        return [row[0] for row in rows]
+
+    async def close(self) -> None:
+        """Close the pool, if it was opened"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
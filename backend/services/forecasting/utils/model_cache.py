@@ -0,0 +1,255 @@
+"""
+Bounded in-memory cache for trained forecasters
+LRU + TTL eviction under an entry-count and estimated-memory budget
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory held by a trained forecaster, in bytes
+
+    Walks object attributes and containers, counting torch parameters/buffers
+    and numpy/pandas storage at their real size. Torch is detected by duck
+    typing so this module never imports it.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    # torch.nn.Module: parameters and buffers dominate
+    if hasattr(obj, 'parameters') and hasattr(obj, 'buffers') and hasattr(obj, 'state_dict'):
+        size = 0
+        for tensor in list(obj.parameters()) + list(obj.buffers()):
+            if id(tensor) not in _seen:
+                _seen.add(id(tensor))
+                size += tensor.numel() * tensor.element_size()
+        return size + sys.getsizeof(obj)
+
+    # torch.Tensor
+    if hasattr(obj, 'numel') and hasattr(obj, 'element_size'):
+        return obj.numel() * obj.element_size()
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(obj) if obj.base is None else sys.getsizeof(obj)
+
+    # pandas DataFrame / Series
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'index'):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _seen)
+    return size
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache with TTL and a memory budget
+
+    Keys are tuples whose first two elements are (tenant_id, metric) so that
+    entries can be invalidated per tenant or per metric.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 3600.0
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (value, size_bytes, stored_at)
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int, float]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'rejected': 0
+        }
+
+    @classmethod
+    def from_env(cls, prefix: str = 'FORECAST_CACHE') -> 'ModelCache':
+        """Build a cache from {prefix}_MAX_ENTRIES / _MAX_MB / _TTL environment variables"""
+        return cls(
+            max_entries=int(os.getenv(f'{prefix}_MAX_ENTRIES', 1000)),
+            max_bytes=int(float(os.getenv(f'{prefix}_MAX_MB', 512)) * 1024 * 1024),
+            ttl_seconds=float(os.getenv(f'{prefix}_TTL', 3600))
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value and mark it recently used, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+
+            value, _, stored_at = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def latest(self, prefix: Tuple) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Most recently used live entry whose key starts with prefix
+
+        Does not count as a hit or refresh recency; used to find a model
+        trained on older data (e.g. an earlier data version) to warm-start from.
+
+        Returns:
+            Tuple of (key, value), or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in reversed(self._entries):
+                if key[:len(prefix)] != prefix:
+                    continue
+                value, _, stored_at = self._entries[key]
+                if not self.ttl_seconds or now - stored_at <= self.ttl_seconds:
+                    return key, value
+        return None
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Insert or replace an entry, evicting least recently used entries to fit
+
+        Args:
+            key: Cache key, (tenant_id, metric, ...)
+            value: Object to cache
+            size: Size in bytes (estimated when omitted)
+
+        Returns:
+            True if cached, False if the value alone exceeds the memory budget
+        """
+        if size is None:
+            size = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if size > self.max_bytes:
+                self._counters['rejected'] += 1
+                logger.warning(f"Not caching {key}: {size} bytes exceeds budget of {self.max_bytes}")
+                return False
+
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._counters['evictions'] += 1
+
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            return True
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return an entry (None if absent)"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value = self._entries[key][0]
+            self._remove(key)
+            self._counters['invalidations'] += 1
+            return value
+
+    def invalidate(self, tenant_id: Optional[str] = None, metric: Optional[str] = None) -> int:
+        """
+        Drop all entries for a tenant, a metric, or a tenant's metric
+
+        With neither argument, clears the whole cache.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if (tenant_id is None or key[0] == tenant_id)
+                and (metric is None or key[1] == metric)
+            ]
+            for key in doomed:
+                self._remove(key)
+            self._counters['invalidations'] += len(doomed)
+            return len(doomed)
+
+    def invalidate_prefix(self, prefix: Tuple, keep: Optional[Hashable] = None) -> int:
+        """
+        Drop every entry whose key starts with prefix, except keep
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            doomed = [key for key in self._entries if key[:len(prefix)] == prefix and key != keep]
+            for key in doomed:
+                self._remove(key)
+            self._counters['invalidations'] += len(doomed)
+            return len(doomed)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hit_rate': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+                **self._counters
+            }
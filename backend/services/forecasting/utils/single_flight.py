@@ -0,0 +1,58 @@
+"""
+Single-flight deduplication for concurrent async work
+The first caller for a key runs the work; concurrent callers share its result
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution
+
+    The work runs in its own task, so a caller that disconnects does not
+    cancel it for everyone else waiting on the same key. Once the work
+    finishes the key is released and the next call starts fresh.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._counters = {'executed': 0, 'shared': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or await the call already in flight for key
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of the (shared) call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+            self._counters['executed'] += 1
+        else:
+            logger.info(f"Joining in-flight call for {key}")
+            self._counters['shared'] += 1
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is currently running"""
+        return key in self._calls
+
+    def stats(self) -> Dict[str, int]:
+        """Number of calls running, executed and served from a shared call"""
+        return {'in_flight': len(self._calls), **self._counters}
@@ -0,0 +1,134 @@
+"""
+Columnar daily metrics of one tenant, and a per-request cache of them
+A dashboard forecasting several metrics reads each tenant's rows once
+"""
+import asyncio
+import contextvars
+from datetime import date
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class TenantFrame:
+    """
+    Daily metrics of one tenant on a shared date axis
+
+    Each metric is a float64 column aligned with dates; NaN marks days where
+    the metric is missing (NULL).
+    """
+
+    def __init__(self, tenant_id: str, since: date, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            tenant_id: Tenant identifier
+            since: First date requested (data may start later)
+            dates: datetime64[D] dates, sorted
+            columns: Metric name -> float64 values aligned with dates
+        """
+        self.tenant_id = tenant_id
+        self.since = since
+        self.dates = dates
+        self.columns = columns
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self.columns)
+
+    def covers(self, metrics: Iterable[str], since: date) -> bool:
+        """Whether this frame holds every metric from since onwards"""
+        return self.since <= since and all(metric in self.columns for metric in metrics)
+
+    def series(self, metric: str, since: Optional[date] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One metric as (dates, values), without missing days
+
+        Args:
+            metric: Metric name
+            since: Drop dates before this one (default: keep all)
+
+        Returns:
+            Tuple of (datetime64[D] dates, float64 values)
+        """
+        values = self.columns[metric]
+        mask = ~np.isnan(values)
+        if since is not None:
+            mask &= self.dates >= np.datetime64(since, 'D')
+        return self.dates[mask], values[mask]
+
+
+_current_scope: contextvars.ContextVar[Optional['FrameScope']] = contextvars.ContextVar('frame_scope', default=None)
+
+
+class FrameScope:
+    """
+    Per-request cache of tenant frames
+
+    Activate one per request (`with FrameScope():`); fetches inside it, and in
+    tasks spawned from it, go through FrameScope.current(). Metrics declared
+    with want() are loaded together on the first fetch for that tenant, so
+    concurrent forecasts of several metrics share one query.
+    """
+
+    def __init__(self):
+        self._frames: Dict[str, List[TenantFrame]] = {}
+        self._wanted: Dict[str, Set[str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._token = None
+        self.loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def current() -> Optional['FrameScope']:
+        """The scope active in this context, if any"""
+        return _current_scope.get()
+
+    def __enter__(self) -> 'FrameScope':
+        self._token = _current_scope.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current_scope.reset(self._token)
+        self._token = None
+
+    def want(self, tenant_id: str, metrics: Iterable[str]) -> None:
+        """Declare metrics that this request will fetch for a tenant"""
+        self._wanted.setdefault(tenant_id, set()).update(metrics)
+
+    def _cached(self, tenant_id: str, metrics: List[str], since: date) -> Optional[TenantFrame]:
+        for frame in self._frames.get(tenant_id, []):
+            if frame.covers(metrics, since):
+                return frame
+        return None
+
+    async def frame(
+        self,
+        tenant_id: str,
+        metrics: List[str],
+        since: date,
+        load: Callable[[List[str], date], Awaitable[TenantFrame]]
+    ) -> TenantFrame:
+        """
+        A frame covering metrics from since, loading it on a miss
+
+        Args:
+            tenant_id: Tenant identifier
+            metrics: Metrics needed now
+            since: First date needed
+            load: Coroutine function (metrics, since) -> TenantFrame
+
+        Returns:
+            Cached or freshly loaded frame
+        """
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            frame = self._cached(tenant_id, metrics, since)
+            if frame is not None:
+                self.hits += 1
+                return frame
+
+            wanted = sorted(set(metrics) | self._wanted.get(tenant_id, set()))
+            frame = await load(wanted, since)
+            self._frames.setdefault(tenant_id, []).append(frame)
+            self.loads += 1
+            return frame
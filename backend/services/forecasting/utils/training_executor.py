@@ -0,0 +1,245 @@
+"""
+Training executor for the forecasting service
+Runs model training off the asyncio event loop in bounded worker pools
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the training queue is full and a job is rejected"""
+
+
+class TrainingTimeout(Exception):
+    """Raised when a training job does not finish within its timeout"""
+
+
+def _pin_torch_threads(num_threads: Optional[int]) -> None:
+    """Limit torch intra-op threads in this process, if torch has been imported"""
+    torch = sys.modules.get('torch')
+    # Another thread may be importing torch right now: skip a half-initialized module
+    get_num_threads = getattr(torch, 'get_num_threads', None)
+    if num_threads and get_num_threads is not None and get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def _timed_call(
+    fn: Callable,
+    args: Tuple,
+    kwargs: Dict,
+    torch_threads: Optional[int] = None
+) -> Tuple[float, float, Any]:
+    """
+    Run a job inside a worker and report when it started and finished
+
+    Module-level so it can be pickled into process pool workers.
+    Wall-clock time is used because start/finish are compared across processes.
+    Torch threads are pinned before the job and again after it, in case the
+    job imported torch for the first time.
+    """
+    _pin_torch_threads(torch_threads)
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    finished_at = time.time()
+    _pin_torch_threads(torch_threads)
+    return started_at, finished_at, result
+
+
+class _PoolStats:
+    """Counters for a single worker pool"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        done = self.completed
+        return {
+            'max_workers': self.max_workers,
+            'in_flight': self.in_flight,
+            'queue_depth': max(0, self.in_flight - self.max_workers),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'rejected': self.rejected,
+            'avg_wait_seconds': round(self.total_wait_seconds / done, 4) if done else 0.0,
+            'max_wait_seconds': round(self.max_wait_seconds, 4),
+            'avg_run_seconds': round(self.total_run_seconds / done, 4) if done else 0.0
+        }
+
+
+class TrainingExecutor:
+    """
+    Dispatches CPU-bound training jobs from async handlers into worker pools
+
+    - 'thread' pool: numpy / torch work (releases the GIL in native code)
+    - 'process' pool: GIL-bound fits, i.e. per-series LSTM training loops and
+      Prophet's cmdstan orchestration (jobs and results must pickle)
+
+    Each pool admits at most max_workers + max_queue jobs; further submissions
+    are rejected with ExecutorSaturated instead of piling up behind the loop.
+
+    Torch's intra-op thread pool is process-wide, so concurrent jobs in the
+    thread pool would each use every core. Jobs pin torch to
+    cpu_count // workers threads per pool (or torch_threads when given).
+    """
+
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: int = 2,
+        max_queue: int = 32,
+        default_timeout: float = 120.0,
+        mp_context: str = 'spawn',
+        torch_threads: Optional[int] = None
+    ):
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self.mp_context = mp_context
+        self._workers = {self.THREAD: thread_workers, self.PROCESS: process_workers}
+        cpu_count = os.cpu_count() or 1
+        self._torch_threads = {
+            name: torch_threads or max(1, cpu_count // max(1, n)) for name, n in self._workers.items()
+        }
+        self._pools: Dict[str, Executor] = {}
+        self._stats = {name: _PoolStats(n) for name, n in self._workers.items()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'TrainingExecutor':
+        """Build an executor from FORECAST_TRAIN_* environment variables"""
+        cpu_count = os.cpu_count() or 2
+        return cls(
+            thread_workers=int(os.getenv('FORECAST_TRAIN_THREADS', min(4, cpu_count))),
+            process_workers=int(os.getenv('FORECAST_TRAIN_PROCESSES', max(1, cpu_count // 2))),
+            max_queue=int(os.getenv('FORECAST_TRAIN_QUEUE', 32)),
+            default_timeout=float(os.getenv('FORECAST_TRAIN_TIMEOUT', 120)),
+            mp_context=os.getenv('FORECAST_TRAIN_MP_CONTEXT', 'spawn'),
+            torch_threads=int(os.getenv('FORECAST_TORCH_THREADS', 0)) or None
+        )
+
+    def _get_pool(self, pool: str) -> Executor:
+        """Create worker pools lazily so importing the service spawns nothing"""
+        with self._lock:
+            if pool not in self._pools:
+                if pool == self.THREAD:
+                    self._pools[pool] = ThreadPoolExecutor(
+                        max_workers=self._workers[pool],
+                        thread_name_prefix='forecast-train'
+                    )
+                elif pool == self.PROCESS:
+                    self._pools[pool] = ProcessPoolExecutor(
+                        max_workers=self._workers[pool],
+                        mp_context=multiprocessing.get_context(self.mp_context)
+                    )
+                else:
+                    raise ValueError(f"Unknown pool '{pool}', expected 'thread' or 'process'")
+            return self._pools[pool]
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        pool: str = THREAD,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in a worker pool and await its result
+
+        Args:
+            fn: Callable to run (must be picklable for the process pool)
+            pool: 'thread' or 'process'
+            timeout: Seconds to wait before giving up (default: default_timeout)
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            ExecutorSaturated: The pool's queue is full
+            TrainingTimeout: The job did not finish in time
+        """
+        executor = self._get_pool(pool)
+        stats = self._stats[pool]
+        timeout = self.default_timeout if timeout is None else timeout
+
+        with self._lock:
+            if stats.in_flight >= stats.max_workers + self.max_queue:
+                stats.rejected += 1
+                raise ExecutorSaturated(
+                    f"Training queue full ({stats.in_flight} jobs in {pool} pool)"
+                )
+            stats.in_flight += 1
+            stats.submitted += 1
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        future = loop.run_in_executor(
+            executor, functools.partial(_timed_call, fn, args, kwargs, self._torch_threads[pool])
+        )
+        future.add_done_callback(functools.partial(self._record, stats, submitted_at))
+
+        try:
+            # shield() keeps the worker result attached to the accounting callback
+            # even when the caller stops waiting; pool jobs cannot be interrupted.
+            _, _, result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                stats.timed_out += 1
+            raise TrainingTimeout(f"Training did not finish within {timeout:g}s")
+        return result
+
+    def _record(self, stats: _PoolStats, submitted_at: float, future: asyncio.Future) -> None:
+        """Update pool counters once a job has left the pool"""
+        with self._lock:
+            stats.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                stats.failed += 1
+                return
+            started_at, finished_at, _ = future.result()
+            wait = max(0.0, started_at - submitted_at)
+            stats.completed += 1
+            stats.total_wait_seconds += wait
+            stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+            stats.total_run_seconds += finished_at - started_at
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and outcome counters per pool"""
+        with self._lock:
+            return {
+                'max_queue': self.max_queue,
+                'default_timeout_seconds': self.default_timeout,
+                'pools': {
+                    name: {**s.as_dict(), 'torch_threads': self._torch_threads[name]}
+                    for name, s in self._stats.items()
+                }
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down any pools that were started"""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
@@ -0,0 +1,166 @@
+"""
+Vectorized validation of historical time series
+Works on columnar input (datetime64[D] dates, float values) with a handful of
+array operations per check, for one series or many sharing a calendar
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+MIN_POINTS = 7  # Need at least a week of data
+
+# Metrics whose MAPE divides by actuals that should never be zero or negative
+MAPE_SENSITIVE_METRICS = frozenset({
+    'revenue', 'customers', 'orders', 'order_count', 'mrr', 'arr', 'ltv', 'cac',
+    'average_order_value', 'units_sold', 'new_customers', 'returning_customers',
+})
+
+
+class ValidationReport:
+    """
+    Outcome of validating one series
+
+    Errors make the series unusable for training; warnings (calendar gaps,
+    non-positive values of MAPE-sensitive metrics) do not. Truthy when valid,
+    so `if not report:` reads like the old boolean check.
+    """
+
+    def __init__(self, errors: List[str], warnings: List[str], stats: Dict[str, Any]):
+        self.errors = errors
+        self.warnings = warnings
+        self.stats = stats
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'valid': self.valid, 'errors': self.errors, 'warnings': self.warnings, **self.stats}
+
+
+def _calendar_checks(dates: np.ndarray) -> Dict[str, Any]:
+    """Duplicate, out-of-order and missing days of a date axis"""
+    steps = np.diff(dates).astype(np.int64)
+    gaps = steps[steps > 1] - 1
+    return {
+        'start': str(dates[0]) if len(dates) else None,
+        'end': str(dates[-1]) if len(dates) else None,
+        'duplicate_dates': int(np.count_nonzero(steps == 0)),
+        'out_of_order_dates': int(np.count_nonzero(steps < 0)),
+        'missing_days': int(gaps.sum()),
+        'largest_gap_days': int(gaps.max()) if len(gaps) else 0,
+    }
+
+
+def validate_many(
+    dates: np.ndarray,
+    values: np.ndarray,
+    metrics: Optional[Sequence[Optional[str]]] = None,
+    min_points: int = MIN_POINTS
+) -> List[ValidationReport]:
+    """
+    Validate many series that share one date axis
+
+    Args:
+        dates: (days,) datetime64[D] dates
+        values: (series, days) float values
+        metrics: Metric name per series (enables the non-positive check)
+        min_points: Minimum number of points per series
+
+    Returns:
+        One ValidationReport per series
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n_series, n_points = values.shape
+    metrics = metrics if metrics is not None else [None] * n_series
+
+    calendar = _calendar_checks(dates)
+    calendar_errors = []
+    if len(dates) != n_points:
+        calendar_errors.append(f"{len(dates)} dates for {n_points} values")
+    if n_points < min_points:
+        calendar_errors.append(f"Need at least {min_points} points, got {n_points}")
+    if calendar['duplicate_dates']:
+        calendar_errors.append(f"{calendar['duplicate_dates']} duplicate dates")
+    if calendar['out_of_order_dates']:
+        calendar_errors.append(f"Dates not sorted ({calendar['out_of_order_dates']} out of order)")
+    calendar_warnings = []
+    if calendar['missing_days']:
+        calendar_warnings.append(
+            f"{calendar['missing_days']} missing days (largest gap {calendar['largest_gap_days']} days)"
+        )
+
+    finite = np.isfinite(values)
+    non_finite = n_points - np.count_nonzero(finite, axis=1)
+    non_positive = np.count_nonzero(finite & (values <= 0), axis=1)
+
+    reports = []
+    for i in range(n_series):
+        errors = list(calendar_errors)
+        warnings = list(calendar_warnings)
+        if non_finite[i]:
+            errors.append(f"{non_finite[i]} NaN or infinite values")
+        checks_positive = metrics[i] in MAPE_SENSITIVE_METRICS
+        if checks_positive and non_positive[i]:
+            warnings.append(f"{non_positive[i]} zero or negative values (MAPE undefined)")
+        stats = {
+            'points': n_points,
+            **calendar,
+            'non_finite_values': int(non_finite[i]),
+            'non_positive_values': int(non_positive[i]) if checks_positive else None,
+        }
+        reports.append(ValidationReport(errors, warnings, stats))
+    return reports
+
+
+def validate_series(
+    dates: np.ndarray,
+    values: np.ndarray,
+    metric: Optional[str] = None,
+    min_points: int = MIN_POINTS
+) -> ValidationReport:
+    """
+    Validate one series
+
+    Args:
+        dates: datetime64[D] dates
+        values: Float values aligned with dates
+        metric: Metric name (enables the non-positive check)
+        min_points: Minimum number of points
+
+    Returns:
+        ValidationReport
+    """
+    return validate_many(dates, np.asarray(values, dtype=np.float64)[np.newaxis], [metric], min_points)[0]
+
+
+def validate_records(data: List[Dict], metric: Optional[str] = None, min_points: int = MIN_POINTS) -> ValidationReport:
+    """
+    Validate a list of {'date': 'YYYY-MM-DD', 'value': number} dicts
+
+    Converts to arrays once, then runs validate_series. Malformed rows (missing
+    keys, unparseable dates, non-numeric values) are reported as errors.
+
+    Args:
+        data: Historical data points
+        metric: Metric name (enables the non-positive check)
+        min_points: Minimum number of points
+
+    Returns:
+        ValidationReport
+    """
+    try:
+        dates = np.array([point['date'] for point in data], dtype='datetime64[D]')
+        values = np.array([point['value'] for point in data])
+    except KeyError as e:
+        return ValidationReport([f"Missing key {e} in data points"], [], {'points': len(data)})
+    except ValueError as e:
+        return ValidationReport([f"Invalid date: {e}"], [], {'points': len(data)})
+
+    if len(values) and values.dtype.kind not in 'iuf':
+        return ValidationReport(["Non-numeric values"], [], {'points': len(data)})
+    return validate_series(dates, values.astype(np.float64), metric, min_points)
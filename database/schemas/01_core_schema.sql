@@ -235,7 +235,7 @@ CREATE INDEX idx_daily_metrics_date ON daily_metrics(date DESC);
 -- ============================================
 
 CREATE TABLE forecasts (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL UNIQUE DEFAULT uuid_generate_v4(),
     tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
     series_type VARCHAR(50) NOT NULL, -- revenue, demand, churn, etc.
     forecast_date DATE NOT NULL,
@@ -243,12 +243,15 @@ CREATE TABLE forecasts (
     predicted_value NUMERIC(12, 2),
     lower_bound NUMERIC(12, 2),
     upper_bound NUMERIC(12, 2),
-    confidence NUMERIC(5, 4), -- 0.95 for 95%
+    confidence NUMERIC(5, 4) NOT NULL, -- 0.95 for 95%
+    model_family VARCHAR(20) NOT NULL, -- statistical, ensemble, prophet
     model_type VARCHAR(50), -- prophet, lstm, etc.
     model_version VARCHAR(50),
-    metadata JSONB DEFAULT '{}',
+    metadata JSONB DEFAULT '{}', -- data_version of the generating model
     generated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (tenant_id, series_type, forecast_date)
+    -- Upsert key for forecast write-back: each model family and confidence
+    -- level keeps its own rows, so they never overwrite each other
+    PRIMARY KEY (tenant_id, series_type, model_family, confidence, forecast_date)
 );
 
 CREATE INDEX idx_forecasts_tenant_series ON forecasts(tenant_id, series_type);